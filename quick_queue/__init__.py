@@ -1,2 +1,4 @@
-from quick_queue.quick_queue import QQueue, QJoinableQueue
-__all__ = ["QQueue", "QJoinableQueue"]
+from quick_queue.quick_queue import QQueue, QJoinableQueue, EndOfStream
+from quick_queue.partitioned import QPartitionedQueue
+from quick_queue.broadcast import QBroadcastQueue
+__all__ = ["QQueue", "QJoinableQueue", "QPartitionedQueue", "QBroadcastQueue", "EndOfStream"]
@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import asyncio
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import EndOfStream, _END_OF_STREAM, _END_OF_STREAM_BROADCAST
+
+"""
+Front end of QQueue and QJoinableQueue for asyncio.
+
+Gets do not block the event loop: the reader of the pipe of queue is watched with loop.add_reader (one registration for
+all coroutines waiting in the same queue) and buckets are got without block when it is readable. Puts do not block the
+event loop: when the queue is full (maxsize or maxbytes), the coroutine waits with a short increasing sleep (there is not
+a file descriptor to wait for a free slot) and tries again.
+"""
+
+# Min and max seconds that a put waits when queue is full before trying again
+_PUT_POLL_MIN = 0.001
+_PUT_POLL_MAX = 0.05
+
+# Seconds that a get waits when the pipe is readable but other process is reading it
+_GET_POLL = 0.001
+
+
+class AsyncQQueue(object):
+
+    def __init__(self, qq):
+        """
+        Front end of a QQueue (or QJoinableQueue) for asyncio: await put, get, get_many... and async for, without block
+        the event loop. It uses the bucket list and the sensor of the queue in this process, then do not mix it with
+        calls to put of the queue in other threads of this process.
+
+        Create it in the process where it is used (the queue can be sent to other processes, this front end can not) and
+        use it in one event loop (a selector event loop: loop.add_reader is not implemented by ProactorEventLoop of
+        Windows).
+
+        :param qq: QQueue or QJoinableQueue
+        :raise ValueError: if transport of queue is not 'pipe', if lanes or prefetch are defined
+        """
+        if qq.ring is not None or qq.lanes is not None:
+            raise ValueError("AsyncQQueue requires transport='pipe' without lanes")
+        if qq.prefetch:
+            raise ValueError("AsyncQQueue can not be used with prefetch")
+        self.qq = qq
+        self.loop = None
+        self.waiters = list()
+
+    async def put(self, value):
+        """
+        This put in queue a data wrapped in a list (see QQueue.put), waiting without block the event loop if queue is
+        full.
+
+        :param value: individual value to enqueue
+        :return:
+        """
+        try:
+            self.qq.put(value, False)
+        except queue.Full:
+            # The value is in the bucket list, that was not put
+            await self.put_remain()
+            if self.qq.enable_sensor:
+                self.qq._sensor_size_list()
+
+    async def put_many(self, sequence):
+        """
+        This put in queue all data from a sequence (see QQueue.put), waiting without block the event loop if queue is
+        full.
+
+        :param sequence: sequence of values to enqueue (individually)
+        :return:
+        """
+        for value in sequence:
+            await self.put(value)
+
+    async def put_bucket(self, bucket):
+        """
+        This put in queue a list of data, waiting without block the event loop if queue is full.
+
+        :param bucket: list of individual data
+        :return:
+        """
+        await self._retry_full(self.qq.put_bucket, bucket, False)
+
+    async def put_remain(self):
+        """
+        This enqueue rest values that remain in the bucket list, waiting without block the event loop if queue is full.
+
+        :return:
+        """
+        await self._retry_full(self.qq.put_remain, False)
+
+    async def put_end(self):
+        """
+        This put in queue the rest values that remain and the end-of-stream (see QQueue.put_end), waiting without block
+        the event loop if queue is full (and until the buckets spilled to disk are put, if spill_dir is defined).
+
+        :return:
+        """
+        await self.put_remain()
+        if self.qq.spill is not None:
+            # The end-of-stream is put after the buckets spilled
+            await asyncio.get_running_loop().run_in_executor(None, self.qq.spill.wait_empty)
+        if self.qq.consumers:
+            for _ in range(self.qq.consumers):
+                await self._retry_full(self.qq._put_end_of_stream, _END_OF_STREAM, False)
+        else:
+            await self._retry_full(self.qq._put_end_of_stream, _END_OF_STREAM_BROADCAST, False)
+
+    async def _retry_full(self, put, *args):
+        """
+        Helper function to call a put without block until queue is not full.
+
+        :param put: function that raises queue.Full if queue is full
+        :param args: args of function
+        :return: result of function
+        """
+        delay = _PUT_POLL_MIN
+        while True:
+            try:
+                return put(*args)
+            except queue.Full:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _PUT_POLL_MAX)
+
+    async def get_bucket(self, timeout=None):
+        """
+        This get from queue a list of data, waiting without block the event loop until the pipe of queue is readable.
+
+        :param timeout: max seconds to wait (raise queue.Empty). None to wait until a bucket is got. By default: None
+        :raise EndOfStream: if this process has got the end-of-stream
+        :return: list of data
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self.qq.get_bucket(False)
+            except EndOfStream:
+                raise
+            except queue.Empty:
+                pass
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise queue.Empty
+            if self.qq._reader.poll():
+                # Other process is reading the pipe (it has the lock of readers)
+                await asyncio.sleep(_GET_POLL)
+            else:
+                await self._wait_readable(remaining)
+
+    async def _wait_readable(self, timeout):
+        """
+        Helper function to wait until the pipe of queue is readable (or timeout).
+
+        :param timeout: max seconds to wait. None to wait until it is readable
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop:
+            raise RuntimeError("AsyncQQueue is used in other event loop")
+
+        waiter = loop.create_future()
+        if not self.waiters:
+            loop.add_reader(self.qq._reader.fileno(), self._on_readable)
+        self.waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+                if not self.waiters:
+                    loop.remove_reader(self.qq._reader.fileno())
+
+    def _on_readable(self):
+        """
+        Callback of event loop when the pipe of queue is readable: it wakes up all coroutines waiting in this queue.
+        :return:
+        """
+        self.loop.remove_reader(self.qq._reader.fileno())
+        waiters = self.waiters
+        self.waiters = list()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def get(self, timeout=None):
+        """
+        This get from queue a data unwrapped from the list (see QQueue.get).
+
+        :param timeout: max seconds to wait (raise queue.Empty). None to wait until a data is got. By default: None
+        :raise EndOfStream: if this process has got the end-of-stream
+        :return: data
+        """
+        qq = self.qq
+        while True:
+            try:
+                value = qq.bucket_getting[qq.index_bucket_getting]
+                qq.index_bucket_getting += 1
+                return value
+            except (IndexError, AttributeError):
+                qq.bucket_getting = await self.get_bucket(timeout)
+                qq.index_bucket_getting = 0
+
+    async def get_many(self, max_items, timeout=None):
+        """
+        This get from queue up to max_items data unwrapped from the lists (see QQueue.get_many).
+
+        :param max_items: max number of data to get
+        :param timeout: max seconds to wait to complete max_items data. None to wait until complete. By default: None
+        :raise ValueError: if max_items < 1
+        :return: list with up to max_items data
+        """
+        if max_items < 1:
+            raise ValueError("max_items={} but range permitted: max_items >= 1".format(max_items))
+
+        qq = self.qq
+        deadline = None if timeout is None else time.monotonic() + timeout
+        items = list()
+        while True:
+            try:
+                index = qq.index_bucket_getting
+                chunk = qq.bucket_getting[index:index + max_items - len(items)]
+            except AttributeError:
+                qq.bucket_getting = list()
+                qq.index_bucket_getting = 0
+                continue
+
+            qq.index_bucket_getting = index + len(chunk)
+            if items:
+                items.extend(chunk)
+            else:
+                items = chunk
+
+            if len(items) >= max_items:
+                return items
+
+            try:
+                if deadline is None:
+                    qq.bucket_getting = await self.get_bucket()
+                else:
+                    qq.bucket_getting = await self.get_bucket(max(deadline - time.monotonic(), 0))
+                qq.index_bucket_getting = 0
+            except queue.Empty:
+                if items:
+                    return items
+                raise
+
+    def __aiter__(self):
+        """
+        This iterate the data got from queue until the end-of-stream (see QQueue.put_end).
+
+        :return: asynchronous iterator of data
+        """
+        return self._iter_values()
+
+    async def _iter_values(self):
+        while True:
+            try:
+                value = await self.get()
+            except EndOfStream:
+                return
+            yield value
+
+    async def iter_buckets(self):
+        """
+        This iterate the buckets got from queue until the end-of-stream (see QQueue.put_end).
+
+        :return: asynchronous iterator of lists of data
+        """
+        qq = self.qq
+        if qq.bucket_getting and qq.index_bucket_getting < len(qq.bucket_getting):
+            bucket = qq.bucket_getting[qq.index_bucket_getting:]
+            qq.bucket_getting = list()
+            qq.index_bucket_getting = 0
+            yield bucket
+        while True:
+            try:
+                bucket = await self.get_bucket()
+            except EndOfStream:
+                return
+            yield bucket
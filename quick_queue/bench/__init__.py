@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+"""
+Benchmark of QQueue, QJoinableQueue and multiprocessing queues with JSON results (execute python -m quick_queue.bench).
+"""
+from quick_queue.bench.compare import compare
+from quick_queue.bench.runner import Scenario, run, run_scenario, scaling_scenarios, scenarios
+
+__all__ = ["Scenario", "compare", "run", "run_scenario", "scaling_scenarios", "scenarios"]
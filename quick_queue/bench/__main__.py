@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import argparse
+import json
+import multiprocessing
+import sys
+
+from quick_queue.bench.compare import compare, format_row
+from quick_queue.bench.runner import (PAYLOADS, QUEUES, QUICK_QUEUES, SCALING_CONSUMERS, SIZINGS, run,
+                                     scaling_scenarios, scenarios)
+
+"""
+Benchmark of QQueue, QJoinableQueue and multiprocessing queues.
+
+Run a matrix of queues, sizings (sensor or fixed size bucket list), payloads, producers x consumers and start methods
+and save the results (items per second, p50 and p99 latency and peak RSS) in a JSON file:
+    python -m quick_queue.bench run [--elements N] [--payloads int,1KB] [--workers 1x1,2x2] [--output bench.json]
+
+Add --metrics off,on to run quick queues without and with metrics (to measure the overhead of metrics) and --lanes 1,4
+to run quick queues with one lane and with 4 lanes.
+
+Measure the scaling of QQueue from 1 to 32 consumers with one lane and with lanes (same JSON format):
+    python -m quick_queue.bench scaling [--lanes 4] [--consumers 1,2,4,8,16,32] [--producers 4] [--output scaling.json]
+
+Compare two JSON files and exit with code 1 if there are regressions beyond threshold:
+    python -m quick_queue.bench compare baseline.json current.json [--threshold 0.1] [--latency-threshold 0.5]
+"""
+
+
+def _list(text):
+    return [v for v in text.split(",") if v]
+
+
+def _workers_list(text):
+    return [tuple(int(n) for n in v.split("x")) for v in text.split(",") if v]
+
+
+def _check_names(parser, option, names, permitted):
+    for name in names:
+        if name not in permitted:
+            parser.error("{} {} but names permitted: {}".format(option, name, ", ".join(permitted)))
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def _save(bench, output):
+    with open(output, "w") as f:
+        json.dump(bench, f, indent=2)
+    print("")
+    print("[BENCH] {} scenarios saved in: {}".format(len(bench["results"]), output))
+
+
+def _run(parser, args):
+    _check_names(parser, "queue", args.queues, QUEUES)
+    _check_names(parser, "sizing", args.sizings, SIZINGS)
+    _check_names(parser, "payload", args.payloads, PAYLOADS)
+    _check_names(parser, "start method", args.start_methods, multiprocessing.get_all_start_methods())
+
+    for value in args.metrics:
+        if value not in ("off", "on"):
+            parser.error("metrics {} but values permitted: off, on".format(value))
+
+    if any(lanes < 1 for lanes in args.lanes):
+        parser.error("lanes {} but range permitted: lanes >= 1".format(args.lanes))
+
+    matrix = [scenario._replace(lanes=lanes)
+              for scenario in scenarios(args.queues, args.sizings, args.payloads, args.workers, args.start_methods,
+                                        [value == "on" for value in args.metrics])
+              for lanes in (args.lanes if scenario.queue in QUICK_QUEUES else [1])]
+    bench = run(matrix, args.elements, args.repeat, args.maxsize, args.fixed_size, args.latency_every)
+    _save(bench, args.output)
+    return 0
+
+
+def _scaling(parser, args):
+    _check_names(parser, "payload", [args.payload], PAYLOADS)
+    if args.lanes < 1:
+        parser.error("lanes {} but range permitted: lanes >= 1".format(args.lanes))
+
+    matrix = scaling_scenarios(args.lanes, args.consumers, args.producers, args.payload)
+    bench = run(matrix, args.elements, args.repeat, args.maxsize, args.fixed_size, args.latency_every)
+
+    # Speedup of each number of consumers against one consumer (with the same lanes)
+    print("")
+    for result in bench["results"]:
+        first = next(r for r in bench["results"] if r["lanes"] == result["lanes"])
+        print("[SCALING] lanes: {:>3} | consumers: {:>3} | items/s: {:>10.0f} | x{:.2f}".format(
+            result["lanes"], result["consumers"], result["items_per_second"],
+            result["items_per_second"] / first["items_per_second"]))
+    _save(bench, args.output)
+    return 0
+
+
+def _compare(parser, args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows, unmatched = compare(baseline, current, args.threshold, args.latency_threshold)
+    for row in rows:
+        print(format_row(row))
+    for name in unmatched:
+        print("[UNMATCHED] {}".format(name))
+
+    regressions = [row for row in rows if row["regressions"]]
+    print("")
+    print("[COMPARE] {} scenarios compared | {} regressions".format(len(rows), len(regressions)))
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quick_queue.bench",
+                                     description="Benchmark of QQueue, QJoinableQueue and multiprocessing queues")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser("run", help="run the benchmark and save results in a JSON file")
+    run_parser.add_argument("--elements", type=int, default=200000,
+                            help="elements put in each scenario (default: %(default)s)")
+    run_parser.add_argument("--repeat", type=int, default=1,
+                            help="repetitions of each scenario, the result is the median (default: %(default)s)")
+    run_parser.add_argument("--queues", type=_list, default=QUEUES,
+                            help="queues separated by commas (default: {})".format(",".join(QUEUES)))
+    run_parser.add_argument("--sizings", type=_list, default=SIZINGS,
+                            help="sizings of QQueue separated by commas (default: {})".format(",".join(SIZINGS)))
+    run_parser.add_argument("--payloads", type=_list, default=["int", "1KB"],
+                            help="payloads separated by commas: {} (default: int,1KB)".format(",".join(PAYLOADS)))
+    run_parser.add_argument("--workers", type=_workers_list, default=[(1, 1), (2, 2)],
+                            help="producers x consumers separated by commas (default: 1x1,2x2)")
+    run_parser.add_argument("--start-methods", type=_list, default=[multiprocessing.get_start_method()],
+                            help="start methods separated by commas: {} (default: %(default)s)".format(
+                                ",".join(multiprocessing.get_all_start_methods())))
+    run_parser.add_argument("--metrics", type=_list, default=["off"],
+                            help="quick queues without (off) and/or with (on) metrics separated by commas, "
+                                 "off,on measures the overhead of metrics (default: off)")
+    run_parser.add_argument("--lanes", type=_int_list, default=[1],
+                            help="lanes of quick queues separated by commas (default: 1)")
+    run_parser.add_argument("--maxsize", type=int, default=1000,
+                            help="maxsize of QQueue and QJoinableQueue (default: %(default)s)")
+    run_parser.add_argument("--fixed-size", type=int, default=1000,
+                            help="size bucket list of sizing 'fixed' (default: %(default)s)")
+    run_parser.add_argument("--latency-every", type=int, default=100,
+                            help="measure the latency of one of each N elements (default: %(default)s)")
+    run_parser.add_argument("--output", default="bench.json",
+                            help="JSON file of results (default: %(default)s)")
+
+    scaling_parser = subparsers.add_parser("scaling", help="measure the scaling of QQueue with consumers and lanes")
+    scaling_parser.add_argument("--lanes", type=int, default=4,
+                                help="lanes to compare with one lane (default: %(default)s)")
+    scaling_parser.add_argument("--consumers", type=_int_list, default=SCALING_CONSUMERS,
+                                help="numbers of consumers separated by commas (default: {})".format(
+                                    ",".join(str(n) for n in SCALING_CONSUMERS)))
+    scaling_parser.add_argument("--producers", type=int, default=4,
+                                help="producers (default: %(default)s)")
+    scaling_parser.add_argument("--payload", default="int",
+                                help="payload: {} (default: %(default)s)".format(",".join(PAYLOADS)))
+    scaling_parser.add_argument("--elements", type=int, default=1000000,
+                                help="elements put in each scenario (default: %(default)s)")
+    scaling_parser.add_argument("--repeat", type=int, default=1,
+                                help="repetitions of each scenario, the result is the median (default: %(default)s)")
+    scaling_parser.add_argument("--maxsize", type=int, default=1000,
+                                help="maxsize of QQueue (default: %(default)s)")
+    scaling_parser.add_argument("--fixed-size", type=int, default=1000,
+                                help="size bucket list of QQueue (default: %(default)s)")
+    scaling_parser.add_argument("--latency-every", type=int, default=100,
+                                help="measure the latency of one of each N elements (default: %(default)s)")
+    scaling_parser.add_argument("--output", default="scaling.json",
+                                help="JSON file of results (default: %(default)s)")
+
+    compare_parser = subparsers.add_parser("compare", help="compare two JSON files and flag regressions")
+    compare_parser.add_argument("baseline", help="JSON file of baseline")
+    compare_parser.add_argument("current", help="JSON file of current results")
+    compare_parser.add_argument("--threshold", type=float, default=0.1,
+                                help="max relative loss of items/s (default: %(default)s)")
+    compare_parser.add_argument("--latency-threshold", type=float, default=0.5,
+                                help="max relative increase of p99 latency, negative to disable "
+                                     "(default: %(default)s)")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return _run(parser, args)
+    if args.command == "scaling":
+        return _scaling(parser, args)
+    if args.latency_threshold is not None and args.latency_threshold < 0:
+        args.latency_threshold = None
+    return _compare(parser, args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+
+
+def compare(baseline, current, threshold=0.1, latency_threshold=0.5):
+    """
+    This compare two benchmarks (scenarios with the same name) and flag regressions: throughput (items per second)
+    lower than baseline by more than threshold or p99 latency higher than baseline by more than latency_threshold.
+
+    :param baseline: dict of benchmark (returned by run or loaded from JSON)
+    :param current: dict of benchmark (returned by run or loaded from JSON)
+    :param threshold: max relative loss of throughput. By default: 0.1 (10%)
+    :param latency_threshold: max relative increase of p99 latency. If None is not checked. By default: 0.5 (50%)
+    :return: list of dicts (name, baseline and current items per second and p99 latency, changes and regression) and
+             list of names of scenarios that are only in one of benchmarks
+    """
+    base_results = dict((r["name"], r) for r in baseline["results"])
+    current_results = dict((r["name"], r) for r in current["results"])
+
+    rows = []
+    for name, cur in current_results.items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+
+        throughput_change = _change(base["items_per_second"], cur["items_per_second"])
+        latency_change = _change(base["latency_p99_ms"], cur["latency_p99_ms"])
+
+        regressions = []
+        if throughput_change is not None and throughput_change < -threshold:
+            regressions.append("throughput")
+        if latency_threshold is not None and latency_change is not None and latency_change > latency_threshold:
+            regressions.append("latency")
+
+        rows.append({"name": name,
+                     "baseline_items_per_second": base["items_per_second"],
+                     "current_items_per_second": cur["items_per_second"],
+                     "throughput_change": throughput_change,
+                     "baseline_latency_p99_ms": base["latency_p99_ms"],
+                     "current_latency_p99_ms": cur["latency_p99_ms"],
+                     "latency_change": latency_change,
+                     "regressions": regressions})
+
+    unmatched = sorted(set(base_results) ^ set(current_results))
+    return rows, unmatched
+
+
+def _change(base, current):
+    if not base or current is None:
+        return None
+    return current / float(base) - 1.0
+
+
+def format_row(row):
+    """
+    This return a line of text with a row of comparison.
+
+    :param row: dict returned by compare
+    :return: text
+    """
+    def pct(value):
+        return "-" if value is None else "{:+.1%}".format(value)
+
+    return "[{}] {:<42} | items/s: {:>10.0f} -> {:>10.0f} ({:>7}) | p99 latency change: {:>7}".format(
+        "REGRESSION" if row["regressions"] else "OK",
+        row["name"],
+        row["baseline_items_per_second"],
+        row["current_items_per_second"],
+        pct(row["throughput_change"]),
+        pct(row["latency_change"]))
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import collections
+import datetime
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows
+    resource = None
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+
+BENCH_VERSION = 1
+
+QUEUES = ["qqueue", "queue", "qjoinablequeue", "joinablequeue"]
+QUICK_QUEUES = ("qqueue", "qjoinablequeue")
+JOINABLE_QUEUES = ("qjoinablequeue", "joinablequeue")
+SIZINGS = ["sensor", "fixed"]
+
+PAYLOADS = {"int": lambda num: num,
+            "100B": lambda num: "{:>100}".format(num),
+            "1KB": lambda num: bytes(1024),
+            "10KB": lambda num: bytes(10 * 1024)}
+
+Scenario = collections.namedtuple("Scenario", ["queue", "sizing", "payload", "producers", "consumers",
+                                               "start_method", "metrics", "lanes"], defaults=(False, 1))
+
+# Consumers of scaling benchmark (see scaling_scenarios)
+SCALING_CONSUMERS = [1, 2, 4, 8, 16, 32]
+
+
+def scenario_name(scenario):
+    """
+    This return the name of a scenario (key to compare results).
+
+    :param scenario: Scenario
+    :return: name
+    """
+    name = "{}/{}/{}/{}x{}/{}".format(scenario.queue, scenario.sizing, scenario.payload, scenario.producers,
+                                      scenario.consumers, scenario.start_method)
+    if scenario.lanes > 1:
+        name += "/lanes{}".format(scenario.lanes)
+    return name + "/metrics" if scenario.metrics else name
+
+
+def scenarios(queues=None, sizings=None, payloads=None, workers=None, start_methods=None, metrics=None):
+    """
+    This return the matrix of scenarios (the sizing of multiprocessing queues is always '-' and they have not
+    metrics).
+
+    :param queues: names of queues in QUEUES. If None are all. By default: None
+    :param sizings: names of sizings in SIZINGS. If None are all. By default: None
+    :param payloads: names of payloads in PAYLOADS. If None are 'int' and '1KB'. By default: None
+    :param workers: list of tuples (producers, consumers). If None are (1, 1) and (2, 2). By default: None
+    :param start_methods: start methods of processes. If None is the default start method. By default: None
+    :param metrics: list of booleans to run quick queues without and/or with metrics (to measure their overhead).
+                    If None is only without metrics. By default: None
+    :return: list of Scenario
+    """
+    queues = QUEUES if queues is None else queues
+    sizings = SIZINGS if sizings is None else sizings
+    payloads = ["int", "1KB"] if payloads is None else payloads
+    workers = [(1, 1), (2, 2)] if workers is None else workers
+    start_methods = [multiprocessing.get_start_method()] if start_methods is None else start_methods
+    metrics = [False] if metrics is None else metrics
+
+    matrix = []
+    for start_method in start_methods:
+        for queue_name in queues:
+            quick = queue_name in QUICK_QUEUES
+            for sizing in (sizings if quick else ["-"]):
+                for with_metrics in (metrics if quick else [False]):
+                    for payload in payloads:
+                        for producers, consumers in workers:
+                            matrix.append(Scenario(queue_name, sizing, payload, producers, consumers, start_method,
+                                                   with_metrics))
+    return matrix
+
+
+def scaling_scenarios(lanes=4, consumers=None, producers=4, payload="int", start_method=None):
+    """
+    This return the scenarios to measure the scaling of QQueue (fixed size bucket list) with the number of consumers,
+    with one lane and with lanes (see lanes of QQueue).
+
+    :param lanes: number of lanes to compare with one lane. By default: 4
+    :param consumers: list of numbers of consumers. If None is SCALING_CONSUMERS (1 to 32). By default: None
+    :param producers: number of producers. By default: 4
+    :param payload: name of payload in PAYLOADS. By default: 'int'
+    :param start_method: start method of processes. If None is the default start method. By default: None
+    :return: list of Scenario
+    """
+    consumers = SCALING_CONSUMERS if consumers is None else consumers
+    start_method = multiprocessing.get_start_method() if start_method is None else start_method
+    return [Scenario("qqueue", "fixed", payload, producers, num_consumers, start_method, False, num_lanes)
+            for num_lanes in sorted({1, lanes})
+            for num_consumers in consumers]
+
+
+def _peak_rss():
+    """
+    This return the peak of resident memory of this process.
+
+    :return: bytes or None if it is not available
+    """
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def _producer(q, quick, payload, count_elements, start_event, out):
+    make = PAYLOADS[payload]
+    start_event.wait()
+    for num in range(count_elements):
+        q.put((time.time(), make(num)))
+    if quick:
+        q.put_remain()
+    out.put(("producer", _peak_rss()))
+
+
+def _consumer(q, joinable, latency_every, out):
+    count = 0
+    latencies = []
+    finish = None
+    while True:
+        item = q.get()
+        if item is None:
+            if joinable:
+                q.task_done()
+            break
+        finish = time.time()
+        if count % latency_every == 0:
+            latencies.append(finish - item[0])
+        count += 1
+        if joinable:
+            q.task_done()
+    out.put(("consumer", count, finish, latencies, _peak_rss()))
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(int(len(values) * q), len(values) - 1)]
+
+
+def run_scenario(scenario, count_elements=200000, maxsize=1000, fixed_size=1000, latency_every=100):
+    """
+    This run one scenario: producers put count_elements data (tuples with the time of put and the payload) and
+    consumers get them until a None.
+
+    :param scenario: Scenario
+    :param count_elements: data put by all producers. By default: 200000
+    :param maxsize: maxsize of QQueue and QJoinableQueue (in buckets). multiprocessing queues are not bounded, like in
+                    tests/performance_*.py. By default: 1000
+    :param fixed_size: size bucket list of sizing 'fixed'. By default: 1000
+    :param latency_every: consumers measure the latency of one of each latency_every data. By default: 100
+    :return: dict with the result
+    """
+    ctx = multiprocessing.get_context(scenario.start_method)
+    quick = scenario.queue in QUICK_QUEUES
+    joinable = scenario.queue in JOINABLE_QUEUES
+    size_bucket_list = fixed_size if scenario.sizing == "fixed" else None
+    lanes = scenario.lanes if scenario.lanes > 1 else None
+
+    if scenario.queue == "qqueue":
+        q = QQueue(maxsize, size_bucket_list=size_bucket_list, metrics=scenario.metrics, lanes=lanes, ctx=ctx)
+    elif scenario.queue == "qjoinablequeue":
+        q = QJoinableQueue(maxsize, size_bucket_list=size_bucket_list, metrics=scenario.metrics, lanes=lanes,
+                           ctx=ctx)
+    elif scenario.queue == "queue":
+        q = ctx.Queue()
+    elif scenario.queue == "joinablequeue":
+        q = ctx.JoinableQueue()
+    else:
+        raise ValueError("queue={} but names permitted: {}".format(scenario.queue, ", ".join(QUEUES)))
+
+    out = ctx.Queue()
+    start_event = ctx.Event()
+    per_producer = count_elements // scenario.producers
+    consumers = [ctx.Process(target=_consumer, args=(q, joinable, latency_every, out))
+                 for _ in range(scenario.consumers)]
+    producers = [ctx.Process(target=_producer, args=(q, quick, scenario.payload, per_producer, start_event, out))
+                 for _ in range(scenario.producers)]
+    for p in consumers + producers:
+        p.start()
+
+    start = time.time()
+    start_event.set()
+
+    reports = [out.get() for _ in producers]
+    for p in producers:
+        p.join()
+    if joinable:
+        q.join()
+    for _ in consumers:
+        if quick:
+            q.put_bucket([None])
+        else:
+            q.put(None)
+    reports.extend(out.get() for _ in consumers)
+    for p in consumers:
+        p.join()
+    q.close()
+
+    got = sum(r[1] for r in reports if r[0] == "consumer")
+    finish = max(r[2] for r in reports if r[0] == "consumer" and r[2] is not None)
+    latencies = [latency for r in reports if r[0] == "consumer" for latency in r[3]]
+    peaks = [r[-1] for r in reports if r[-1] is not None]
+
+    p50 = _percentile(latencies, 0.50)
+    p99 = _percentile(latencies, 0.99)
+    return {"name": scenario_name(scenario),
+            "queue": scenario.queue,
+            "sizing": scenario.sizing,
+            "payload": scenario.payload,
+            "producers": scenario.producers,
+            "consumers": scenario.consumers,
+            "start_method": scenario.start_method,
+            "metrics": scenario.metrics,
+            "lanes": scenario.lanes,
+            "elements": got,
+            "seconds": finish - start,
+            "items_per_second": got / (finish - start),
+            "latency_p50_ms": None if p50 is None else p50 * 1000,
+            "latency_p99_ms": None if p99 is None else p99 * 1000,
+            "peak_rss_mb": max(peaks) / (1024.0 * 1024.0) if peaks else None}
+
+
+def _median_result(results):
+    """
+    Helper function to join the results of repetitions of a scenario (median of each measure).
+
+    :param results: list of dicts with the result of each repetition
+    :return: dict with the result
+    """
+    result = dict(results[0])
+    for key in ("seconds", "items_per_second", "latency_p50_ms", "latency_p99_ms", "peak_rss_mb"):
+        values = [r[key] for r in results if r[key] is not None]
+        result[key] = statistics.median(values) if values else None
+    result["repeat"] = len(results)
+    return result
+
+
+def run(matrix, count_elements=200000, repeat=1, maxsize=1000, fixed_size=1000, latency_every=100, verbose=True):
+    """
+    This run a matrix of scenarios.
+
+    :param matrix: list of Scenario (see scenarios())
+    :param count_elements: data put by all producers in each scenario. By default: 200000
+    :param repeat: repetitions of each scenario (the result is the median). By default: 1
+    :param maxsize: maxsize of QQueue and QJoinableQueue. By default: 1000
+    :param fixed_size: size bucket list of sizing 'fixed'. By default: 1000
+    :param latency_every: consumers measure the latency of one of each latency_every data. By default: 100
+    :param verbose: print each result in console. By default: True
+    :return: dict with the environment and results (it could be saved as JSON)
+    """
+    results = []
+    for scenario in matrix:
+        result = _median_result([run_scenario(scenario, count_elements, maxsize, fixed_size, latency_every)
+                                 for _ in range(repeat)])
+        results.append(result)
+        if verbose:
+            print(format_result(result))
+            sys.stdout.flush()
+
+    return {"version": BENCH_VERSION,
+            "created": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "count_elements": count_elements,
+            "repeat": repeat,
+            "maxsize": maxsize,
+            "fixed_size": fixed_size,
+            "results": results}
+
+
+def _format_number(value, fmt):
+    return "-" if value is None else fmt.format(value)
+
+
+def format_result(result):
+    """
+    This return a line of text with a result.
+
+    :param result: dict with the result of a scenario
+    :return: text
+    """
+    return "[BENCH] {:<50} | items/s: {:>10} | p50: {:>9} ms | p99: {:>9} ms | peak RSS: {:>7} MB".format(
+        result["name"],
+        _format_number(result["items_per_second"], "{:.0f}"),
+        _format_number(result["latency_p50_ms"], "{:.3f}"),
+        _format_number(result["latency_p99_ms"], "{:.3f}"),
+        _format_number(result["peak_rss_mb"], "{:.1f}"))
@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import multiprocessing.queues
+import multiprocessing.util
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QuickQueue
+
+"""
+Broadcast queue: every bucket list is delivered to all subscribers.
+
+The producer fills bucket lists (with the sensor, linger_ms...) and serializes each bucket list once; then the same
+bytes are sent by one channel (pipe) for each subscriber. Each channel has a bounded backlog of maxsize bucket lists and
+when the backlog of a subscriber is full the producer waits for it (slow_policy 'block') or drops the bucket list for
+that subscriber (slow_policy 'drop').
+"""
+
+SLOW_POLICIES = ("block", "drop")
+
+
+def QBroadcastQueue(*args, **kwargs):
+    """
+    This method return one instance of QuickBroadcastQueue.
+
+    Example of use (about doctest: Process not work in doctest, you can try one example similar in
+    test/test_broadcast_queue.py):
+    >>> def _subscriber(qbq):
+    ...     for value in qbq.subscribe():
+    ...         print(value)
+    >>> qbq = QBroadcastQueue(2)
+    >>> processes = [multiprocessing.Process(target=_subscriber, args=(qbq,)) for _ in range(2)]
+    >>> for p in processes:
+    ...     p.start()
+    >>> qbq.put("A")
+    >>> qbq.put("B")
+    >>> qbq.end()
+    >>> for p in processes:
+    ...     p.join()
+
+    :param subscribers: number of subscribers (each one gets all bucket lists)
+    :param args: args of QQueue (maxsize is the max backlog of bucket lists of each subscriber)
+    :param slow_policy: 'block' (the producer waits for the slowest subscriber; put can not be called with block=False
+                        or timeout, because a bucket list could be sent to some subscribers only) or 'drop' (bucket
+                        lists that do not fit in the backlog of a subscriber are dropped for that subscriber, see
+                        dropped()). By default: 'block'
+    :param slow_timeout: (only if slow_policy is 'drop') max seconds that the producer waits for slow subscribers
+                         before drop the bucket list (for all of them in each put, not for each one). If None, it does
+                         not wait. By default: None
+    :param kwargs: kwargs of QQueue (serializer is 'pickle' if it is None; maxbytes, oob_threshold, lanes and spill_dir
+                   can not be defined and transport is 'pipe')
+    :raise ValueError: if subscribers < 1, if slow_policy or slow_timeout are not valid or if kwargs are not valid for a
+                       broadcast queue
+    :return: QuickBroadcastQueue
+    """
+    return QuickBroadcastQueue(*args, **kwargs)
+
+
+class QuickBroadcastQueue(QuickQueue):
+
+    def __init__(self, subscribers, *args, slow_policy="block", slow_timeout=None, **kwargs):
+        """
+        Queue that delivers every bucket list to all subscribers (see QBroadcastQueue).
+
+        :param subscribers: number of subscribers (each one gets all bucket lists)
+        :param args: args of QQueue (maxsize is the max backlog of bucket lists of each subscriber)
+        :param slow_policy: 'block' or 'drop'. By default: 'block'
+        :param slow_timeout: (only if slow_policy is 'drop') max seconds that the producer waits for slow subscribers
+                             before drop the bucket list (for all of them in each put, not for each one). If None, it
+                             does not wait. By default: None
+        :param kwargs: kwargs of QQueue
+        :raise ValueError: if subscribers < 1, if slow_policy or slow_timeout are not valid or if kwargs are not valid
+                           for a broadcast queue
+        """
+        if subscribers < 1:
+            raise ValueError("subscribers={} but range permitted: subscribers >= 1".format(subscribers))
+        if slow_policy not in SLOW_POLICIES:
+            raise ValueError("slow_policy={} but values permitted: {}".format(slow_policy, ", ".join(SLOW_POLICIES)))
+        if slow_timeout is not None and (slow_policy != "drop" or slow_timeout <= 0):
+            raise ValueError("slow_timeout={} but it is only permitted with slow_policy='drop' and "
+                             "slow_timeout > 0".format(slow_timeout))
+        for name in ("maxbytes", "oob_threshold", "lanes", "spill_dir"):
+            if kwargs.get(name):
+                raise ValueError("{} can not be defined in a broadcast queue".format(name))
+        if kwargs.get("transport", "pipe") != "pipe":
+            raise ValueError("transport={} but broadcast queue requires transport='pipe'".format(kwargs["transport"]))
+        if kwargs.get("consumers") not in (None, 1):
+            raise ValueError("consumers={} but each subscriber is one consumer".format(kwargs["consumers"]))
+
+        # Each bucket list is serialized once (then the same bytes are sent to all subscribers)
+        if kwargs.get("serializer") is None:
+            kwargs["serializer"] = "pickle"
+        # One end-of-stream marker for each subscriber (see end and put_end)
+        kwargs["consumers"] = 1
+        ctx = kwargs.get("ctx")
+        kwargs["ctx"] = ctx = multiprocessing.get_context() if ctx is None else ctx
+        # The pipe, locks and semaphore of multiprocessing.queues.Queue are created here but bucket lists are only sent
+        # by the channels: QuickQueue is pickled, closed and checked as closed with them (it costs one idle pipe)
+        super().__init__(*args, **kwargs)
+
+        maxsize = self.init_args['maxsize']
+        self.slow_policy = slow_policy
+        self.slow_timeout = slow_timeout
+        self.channels = [multiprocessing.queues.Queue(maxsize if maxsize and maxsize > 0 else 0, ctx=ctx)
+                         for _ in range(subscribers)]
+        self.dropped_buckets = ctx.Array('q', subscribers)
+        self.subscribers_counter = ctx.Value('i', 0)
+        self.subscription = None
+        multiprocessing.util.register_after_fork(self, QuickBroadcastQueue._after_fork_subscription)
+
+    def __getstate__(self):
+        return super().__getstate__() + ({'slow_policy': self.slow_policy,
+                                          'slow_timeout': self.slow_timeout,
+                                          'channels': self.channels,
+                                          'dropped_buckets': self.dropped_buckets,
+                                          'subscribers_counter': self.subscribers_counter},)
+
+    def __setstate__(self, state):
+        super().__setstate__(state[:-1])
+        self.__dict__.update(state[-1])
+        self.subscription = None
+        multiprocessing.util.register_after_fork(self, QuickBroadcastQueue._after_fork_subscription)
+
+    def _after_fork_subscription(self):
+        """
+        Helper function to begin a process without subscription (the subscription of parent is not inherited).
+        :return:
+        """
+        self.subscription = None
+
+    def subscribe(self, index=None):
+        """
+        This subscribe this process to the queue: get, get_bucket, get_many and iteration return the bucket lists of
+        this subscriber until the end-of-stream (see end).
+
+        :param index: index of subscriber. If None, subscribers are assigned by turns to the processes that call it
+                      (call it once in each subscriber). By default: None
+        :raise ValueError: if index is out of range or if all subscribers were assigned
+        :return: this queue
+        """
+        subscribers = len(self.channels)
+        if index is None:
+            with self.subscribers_counter.get_lock():
+                index = self.subscribers_counter.value
+                if index >= subscribers:
+                    raise ValueError("all subscribers ({}) were assigned".format(subscribers))
+                self.subscribers_counter.value += 1
+        elif not 0 <= index < subscribers:
+            raise ValueError("index={} but range permitted: 0 <= index < {}".format(index, subscribers))
+        self.subscription = index
+        self.end_of_stream = False
+        self.bucket_getting = list()
+        self.index_bucket_getting = 0
+        return self
+
+    def dropped(self, index=None):
+        """
+        This return the number of bucket lists dropped for a subscriber (only with slow_policy 'drop').
+
+        :param index: index of subscriber. If None is the subscriber of this process. By default: None
+        :return: number of bucket lists dropped
+        """
+        return self.dropped_buckets[self.subscription if index is None else index]
+
+    def _put_obj(self, obj, block=True, timeout=None, lane=None):
+        """
+        Helper function to send one object (usually a bucket list serialized) to all subscribers.
+
+        :param obj: object to put
+        :param block: it must be true with slow_policy 'block' (not used with slow_policy 'drop')
+        :param timeout: it must be None with slow_policy 'block' (not used with slow_policy 'drop')
+        :param lane: not used
+        :raise ValueError: if block is false or timeout is defined with slow_policy 'block' (the Full exception could be
+                           raised when the object was sent to some subscribers only)
+        :return:
+        """
+        if self._closed:
+            raise ValueError(f"Queue {self!r} is closed")
+        if self.slow_policy == "block":
+            if not block or timeout is not None:
+                raise ValueError("block=False or timeout can not be used with slow_policy='block' (use "
+                                 "slow_policy='drop' and slow_timeout)")
+            for channel in self.channels:
+                channel.put(obj)
+            return
+
+        # One deadline for all subscribers (a put waits at most slow_timeout, although several subscribers are slow)
+        deadline = None if self.slow_timeout is None else time.monotonic() + self.slow_timeout
+        for index, channel in enumerate(self.channels):
+            try:
+                if deadline is None:
+                    channel.put(obj, False)
+                else:
+                    channel.put(obj, True, max(deadline - time.monotonic(), 0))
+            except queue.Full:
+                with self.dropped_buckets.get_lock():
+                    self.dropped_buckets[index] += 1
+
+    def _put_end_of_stream(self, marker, block=True, timeout=None, lane=None):
+        """
+        Helper function to put a marker of end-of-stream for all subscribers (it is never dropped).
+
+        :param marker: _END_OF_STREAM
+        :param block: block if necessary until a free slot is available
+        :param timeout: max seconds to wait (raise the Full exception)
+        :param lane: not used
+        :return:
+        """
+        obj = marker if self.latency_sample is None else (None, marker)
+        for channel in self.channels:
+            channel.put(obj, block, timeout)
+
+    def _get_obj(self, *args, **kwargs):
+        """
+        Helper function to get one object from the channel of the subscriber of this process.
+
+        :param args: args to get queue method
+        :param kwargs: kwargs to get queue method
+        :raise ValueError: if this process is not subscribed
+        :return: object got (usually a bucket list serialized)
+        """
+        if self.subscription is None:
+            raise ValueError("This process is not subscribed (call subscribe() before get)")
+        return self.channels[self.subscription].get(*args, **kwargs)
+
+    def async_view(self):
+        raise ValueError("async_view can not be used with a broadcast queue")
+
+    def close(self):
+        # The prefetch thread (it gets from the channel of this process) is stopped before closing the channels
+        super().close()
+        for channel in self.channels:
+            channel.close()
+
+    def _put_back_prefetch(self):
+        """
+        Helper function to forget the bucket lists prefetched by the subscriber of this process (they are only for it,
+        then they are not put back in the channels of other subscribers).
+        :return:
+        """
+        self.prefetch_buffer = None
+        self.prefetch_pending = None
+
+    def stats(self):
+        """
+        This return a snapshot of the metrics of this process (see QQueue.stats) with the bucket lists dropped for
+        each subscriber.
+
+        :return: dict
+        """
+        stats = super().stats()
+        stats["dropped"] = list(self.dropped_buckets)
+        return stats
+
+    def qsize(self):
+        """
+        This return the number of bucket lists in the backlog of the slowest subscriber (the sensor sizes the bucket
+        list with it).
+
+        :return: number of buckets
+        """
+        return max(channel.qsize() for channel in self.channels)
+
+    def empty(self):
+        """
+        This return if the backlog of the subscriber of this process is empty (of all subscribers if this process is
+        not subscribed).
+
+        :return: True if it is empty
+        """
+        if self.prefetch_buffer is not None and not self.prefetch_buffer.empty():
+            return False
+        if self.subscription is not None:
+            return self.channels[self.subscription].empty()
+        return all(channel.empty() for channel in self.channels)
+
+    def full(self):
+        """
+        This return if the backlog of any subscriber is full.
+
+        :return: True if it is full
+        """
+        return any(channel.full() for channel in self.channels)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+"""
+Calibration of size bucket list for this machine.
+
+Execute this module to run a matrix of payloads, numbers of producers and consumers and sizes of bucket list against
+QQueue; results are saved in a cache file and QQueue(size_bucket_list="auto") loads the best size bucket list from it:
+    python -m quick_queue.calibrate [--elements N] [--sizes 10,100,1000,10000] [--output path]
+
+The cache file is the path in environment variable QUICK_QUEUE_CALIBRATION or, by default,
+~/.cache/quick_queue/calibration.json (or $XDG_CACHE_HOME/quick_queue/calibration.json).
+"""
+
+CALIBRATION_VERSION = 1
+
+PAYLOADS = {"int": lambda num: num,
+            "str": lambda num: "element {:>90}".format(num),
+            "dict": lambda num: {"id": num, "name": "element {}".format(num), "values": [num, num * 2.0]},
+            "bytes": lambda num: bytes(1024)}
+
+DEFAULT_PAYLOADS = ["int", "str", "dict"]
+DEFAULT_WORKERS = [(1, 1), (2, 2)]
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_ELEMENTS = 200000
+
+
+def calibration_path():
+    """
+    This return the path of cache file of calibration.
+
+    :return: path
+    """
+    path = os.environ.get("QUICK_QUEUE_CALIBRATION")
+    if path:
+        return path
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache, "quick_queue", "calibration.json")
+
+
+def load_calibration(path=None):
+    """
+    This return the calibration saved in cache file.
+
+    :param path: path of cache file. If None is calibration_path(). By default: None
+    :return: dict of calibration or None if there is not a valid calibration
+    """
+    path = calibration_path() if path is None else path
+    try:
+        with open(path) as f:
+            calibration = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(calibration, dict) or calibration.get("version") != CALIBRATION_VERSION:
+        return None
+    return calibration
+
+
+def calibrated_size_bucket_list(path=None):
+    """
+    This return the size bucket list calibrated in this machine.
+
+    :param path: path of cache file. If None is calibration_path(). By default: None
+    :return: size bucket list or None if there is not a valid calibration
+    """
+    calibration = load_calibration(path)
+    if calibration is None:
+        return None
+    size_bucket_list = calibration.get("size_bucket_list")
+    return size_bucket_list if isinstance(size_bucket_list, int) and size_bucket_list > 0 else None
+
+
+def _producer(qq, payload, count_elements, barrier):
+    make = PAYLOADS[payload]
+    # All producers begin to put at the same time that the measure (after the start of processes)
+    barrier.wait()
+    for num in range(count_elements):
+        qq.put(make(num))
+    qq.put_remain()
+
+
+def _consumer(qq):
+    while qq.get_bucket() is not None:
+        pass
+
+
+def measure(payload, producers, consumers, size_bucket_list, count_elements=DEFAULT_ELEMENTS, maxsize=1000):
+    """
+    This measure the throughput of QQueue with a fixed size bucket list (the time to start the processes is not
+    measured: the time starts when all producers are running).
+
+    :param payload: name of payload in PAYLOADS
+    :param producers: number of producer processes
+    :param consumers: number of consumer processes
+    :param size_bucket_list: size bucket list
+    :param count_elements: elements put by all producers. By default: 200000
+    :param maxsize: maxsize of queue. By default: 1000
+    :return: elements per second
+    """
+    from quick_queue.quick_queue import QQueue
+
+    qq = QQueue(maxsize, size_bucket_list=size_bucket_list)
+    per_producer = count_elements // producers
+    barrier = multiprocessing.Barrier(producers + 1)
+    consumer_processes = [multiprocessing.Process(target=_consumer, args=(qq,)) for _ in range(consumers)]
+    producer_processes = [multiprocessing.Process(target=_producer, args=(qq, payload, per_producer, barrier))
+                          for _ in range(producers)]
+    for p in consumer_processes:
+        p.start()
+    for p in producer_processes:
+        p.start()
+
+    barrier.wait()
+    start = time.monotonic()
+    for p in producer_processes:
+        p.join()
+    for _ in consumer_processes:
+        qq.put_bucket(None)
+    for p in consumer_processes:
+        p.join()
+    finish = time.monotonic()
+
+    qq.close()
+    return per_producer * producers / (finish - start)
+
+
+def calibrate(payloads=None, workers=None, sizes=None, count_elements=DEFAULT_ELEMENTS, verbose=True):
+    """
+    This run the matrix of calibration and return the results.
+
+    The size bucket list calibrated is the size with the best mean of relative throughput (throughput divided by the
+    best throughput of the same payload and workers) in all the matrix.
+
+    :param payloads: names of payloads in PAYLOADS. If None is DEFAULT_PAYLOADS. By default: None
+    :param workers: list of tuples (producers, consumers). If None is DEFAULT_WORKERS. By default: None
+    :param sizes: sizes of bucket list. If None is DEFAULT_SIZES. By default: None
+    :param count_elements: elements put in each measure. By default: 200000
+    :param verbose: print each measure in console. By default: True
+    :return: dict of calibration
+    """
+    payloads = DEFAULT_PAYLOADS if payloads is None else payloads
+    workers = DEFAULT_WORKERS if workers is None else workers
+    sizes = DEFAULT_SIZES if sizes is None else sizes
+
+    results = []
+    relative = dict((size, []) for size in sizes)
+    best_by_payload = dict()
+    for payload in payloads:
+        for producers, consumers in workers:
+            scenario = []
+            for size in sizes:
+                throughput = measure(payload, producers, consumers, size, count_elements)
+                scenario.append((size, throughput))
+                results.append({"payload": payload,
+                                "producers": producers,
+                                "consumers": consumers,
+                                "size_bucket_list": size,
+                                "elements_per_second": throughput})
+                if verbose:
+                    print("[CALIBRATE] payload: {:>5} | producers: {} | consumers: {} | size_bucket_list: {:>6} | "
+                          "elements/s: {:.0f}".format(payload, producers, consumers, size, throughput))
+
+            best = max(throughput for __, throughput in scenario)
+            for size, throughput in scenario:
+                relative[size].append(throughput / best)
+            best_by_payload.setdefault(payload, []).extend(scenario)
+
+    size_bucket_list = max(sizes, key=lambda size: sum(relative[size]) / len(relative[size]))
+    return {"version": CALIBRATION_VERSION,
+            "created": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "start_method": multiprocessing.get_start_method(),
+            "count_elements": count_elements,
+            "size_bucket_list": size_bucket_list,
+            "size_bucket_list_by_payload": dict((payload, max(scenario, key=lambda r: r[1])[0])
+                                                for payload, scenario in best_by_payload.items()),
+            "results": results}
+
+
+def save_calibration(calibration, path=None):
+    """
+    This save the calibration in cache file.
+
+    :param calibration: dict of calibration
+    :param path: path of cache file. If None is calibration_path(). By default: None
+    :return: path of cache file
+    """
+    path = calibration_path() if path is None else path
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = "{}.{}.tmp".format(path, os.getpid())
+    with open(tmp_path, "w") as f:
+        json.dump(calibration, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _int_list(text):
+    return [int(v) for v in text.split(",") if v]
+
+
+def _workers_list(text):
+    return [tuple(int(n) for n in v.split("x")) for v in text.split(",") if v]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m quick_queue.calibrate",
+                                     description="Calibrate the size bucket list of QQueue for this machine")
+    parser.add_argument("--elements", type=int, default=DEFAULT_ELEMENTS,
+                        help="elements put in each measure (default: %(default)s)")
+    parser.add_argument("--sizes", type=_int_list, default=DEFAULT_SIZES,
+                        help="sizes of bucket list separated by commas (default: 10,100,1000,10000)")
+    parser.add_argument("--payloads", type=lambda text: text.split(","), default=DEFAULT_PAYLOADS,
+                        help="payloads separated by commas: {} (default: {})".format(",".join(PAYLOADS),
+                                                                                   ",".join(DEFAULT_PAYLOADS)))
+    parser.add_argument("--workers", type=_workers_list, default=DEFAULT_WORKERS,
+                        help="producers x consumers separated by commas (default: 1x1,2x2)")
+    parser.add_argument("--output", default=None,
+                        help="cache file (default: {})".format(calibration_path()))
+    args = parser.parse_args(argv)
+
+    for payload in args.payloads:
+        if payload not in PAYLOADS:
+            parser.error("payload {} but names permitted: {}".format(payload, ", ".join(PAYLOADS)))
+
+    calibration = calibrate(args.payloads, args.workers, args.sizes, args.elements)
+    path = save_calibration(calibration, args.output)
+    print("")
+    print("[CALIBRATED] size_bucket_list: {} | by payload: {} | saved in: {}".format(
+        calibration["size_bucket_list"], calibration["size_bucket_list_by_payload"], path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import multiprocessing.connection
+import multiprocessing.queues
+import multiprocessing.util
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+# Max seconds that a consumer waits for the lock of readers of a lane that is readable (other consumer is reading it)
+_LOCKED_POLL = 0.01
+
+
+class Lanes(object):
+
+    def __init__(self, lanes, maxsize=0, ctx=None):
+        """
+        Several multiprocessing.queues.Queue (lanes, each one with its own pipe and lock of readers) to transport the
+        buckets of one logical queue, then consumers do not serialize on one lock of readers and one pipe.
+
+        Each producer process puts its buckets in lanes by turns (beginning in its home lane; if a lane is full it tries
+        the next ones before block). Each consumer process gets from its home lane and steals from the other lanes when
+        its home lane is empty; when all lanes are empty it waits for any of them. Home lanes are assigned to processes
+        by turns with a shared counter.
+
+        The order of buckets is only preserved in each lane (not among lanes).
+
+        :param lanes: number of lanes
+        :param maxsize: max number of buckets in all lanes (divided among lanes). If maxsize<=0 then lanes are infinite.
+                        By default: 0
+        :param ctx: multiprocessing context
+        """
+        ctx = multiprocessing.get_context() if ctx is None else ctx
+        self.maxsize = maxsize if maxsize and maxsize > 0 else 0
+        lane_maxsize = -(-self.maxsize // lanes) if self.maxsize else 0
+        self.queues = [multiprocessing.queues.Queue(lane_maxsize, ctx=ctx) for _ in range(lanes)]
+        self.counter = ctx.Value('i', 0)
+        self._init_process()
+        multiprocessing.util.register_after_fork(self, Lanes._init_process)
+
+    def __getstate__(self):
+        return self.maxsize, self.queues, self.counter
+
+    def __setstate__(self, state):
+        self.maxsize, self.queues, self.counter = state
+        self._init_process()
+        multiprocessing.util.register_after_fork(self, Lanes._init_process)
+
+    def _init_process(self):
+        """
+        Helper function to begin the state of this process: home lane (assigned in the first put or get), next lane to
+        put, lanes finished for this process (end-of-stream) and lane of the last bucket got.
+        :return:
+        """
+        self.home = None
+        self.cursor = None
+        self.ended = set()
+        self.last = None
+
+    def home_lane(self):
+        """
+        This return the home lane of this process (it is assigned by turns the first time).
+
+        :return: index of lane
+        """
+        if self.home is None:
+            with self.counter.get_lock():
+                self.home = self.counter.value % len(self.queues)
+                self.counter.value += 1
+        return self.home
+
+    def put(self, obj, block=True, timeout=None, lane=None):
+        """
+        This put an object in the next lane of this process that is not full.
+
+        :param obj: object to put
+        :param block: block if necessary until a free slot is available (in the next lane)
+        :param timeout: max seconds to wait (raise the Full exception)
+        :param lane: index of lane to put the object in that lane. If None is the next lane. By default: None
+        :return:
+        """
+        if lane is not None:
+            self.queues[lane].put(obj, block, timeout)
+            return
+
+        n = len(self.queues)
+        if self.cursor is None:
+            self.cursor = self.home_lane()
+        start = self.cursor
+        self.cursor = (start + 1) % n
+        for i in range(n):
+            try:
+                self.queues[(start + i) % n].put(obj, False)
+                return
+            except queue.Full:
+                pass
+        if not block:
+            raise queue.Full
+        self.queues[start].put(obj, True, timeout)
+
+    def get(self, block=True, timeout=None):
+        """
+        This get an object from the home lane of this process or (if it is empty) from other lane.
+
+        When all lanes are empty it waits until any of them is readable; if a readable lane is being read by other
+        consumer (it has the lock of readers of that lane), it waits for that lock a short time (instead of spin).
+
+        :param block: block if necessary until an object is available
+        :param timeout: max seconds to wait (raise the Empty exception)
+        :return: object got (the index of its lane is in last)
+        """
+        n = len(self.queues)
+        home = self.home_lane()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            readers = dict()
+            for i in range(n):
+                index = (home + i) % n
+                if index in self.ended:
+                    continue
+                try:
+                    obj = self.queues[index].get(False)
+                    self.last = index
+                    return obj
+                except queue.Empty:
+                    readers[self.queues[index]._reader] = index
+
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not block or not readers or (remaining is not None and remaining <= 0):
+                raise queue.Empty
+            ready = multiprocessing.connection.wait(list(readers), remaining)
+            if ready:
+                # The first readable lane (in order from home lane) is locked by other consumer or it has data now
+                index = min((readers[reader] for reader in ready), key=lambda lane: (lane - home) % n)
+                remaining = None if deadline is None else deadline - time.monotonic()
+                try:
+                    obj = self.queues[index].get(True, _LOCKED_POLL if remaining is None
+                                                 else max(min(_LOCKED_POLL, remaining), 0))
+                    self.last = index
+                    return obj
+                except queue.Empty:
+                    pass
+
+    def end_lane(self, lane):
+        """
+        This mark a lane as finished for this process (it gets the end-of-stream of that lane).
+
+        :param lane: index of lane
+        :return: True if all lanes are finished for this process
+        """
+        self.ended.add(lane)
+        return len(self.ended) >= len(self.queues)
+
+    def qsize(self):
+        return sum(q.qsize() for q in self.queues)
+
+    def empty(self):
+        return all(q.empty() for q in self.queues)
+
+    def full(self):
+        return all(q.full() for q in self.queues)
+
+    def close(self):
+        for q in self.queues:
+            q.close()
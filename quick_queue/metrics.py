@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import bisect
+import os
+import threading
+
+"""
+Runtime metrics of QQueue in each process (counters and histograms) and an exporter of them in Prometheus text format
+to a local file (for example, for the textfile collector of node_exporter).
+"""
+
+# Bounds (upper inclusive) of histograms
+ITEMS_BOUNDS = (1, 10, 100, 1000, 10000, 100000)
+SECONDS_BOUNDS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+# name: (type, help) of each metric in Prometheus (histograms are in "histograms" of snapshot)
+METRICS = {"items_put": ("counter", "Data put in queue by this process."),
+           "buckets_put": ("counter", "Buckets put in queue by this process."),
+           "bytes_serialized": ("counter", "Bytes of buckets serialized by this process (only with serializer)."),
+           "items_got": ("counter", "Data got from queue by this process."),
+           "buckets_got": ("counter", "Buckets got from queue by this process."),
+           "bytes_deserialized": ("counter", "Bytes of buckets deserialized by this process (only with serializer)."),
+           "sensor_runs": ("counter", "Times that the sensor of this process has run."),
+           "sensor_changes": ("counter", "Times that the sensor of this process has changed the size bucket list."),
+           "size_bucket_list": ("gauge", "Current size bucket list of this process."),
+           "qsize": ("gauge", "Buckets in queue."),
+           "bytes_in_queue": ("gauge", "Estimated bytes of buckets in queue (only with maxbytes)."),
+           "bucket_items": ("histogram", "Data in each bucket put by this process."),
+           "put_blocked_seconds": ("histogram", "Seconds blocked in put_bucket (without serialization)."),
+           "get_blocked_seconds": ("histogram", "Seconds blocked in get_bucket (without deserialization).")}
+
+
+class Histogram(object):
+
+    def __init__(self, bounds):
+        """
+        Histogram of values with fixed bounds.
+
+        :param bounds: sorted upper bounds (inclusive) of histogram buckets (there is an extra bucket for greater values)
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        This add a value to histogram.
+
+        :param value: value observed
+        :return:
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        """
+        This return a snapshot of histogram with cumulative counts (like Prometheus).
+
+        :return: dict with buckets (list of tuples (upper bound, cumulative count), the last bound is "+Inf"), sum and
+                 count
+        """
+        buckets = list()
+        cumulative = 0
+        for bound, count in zip(self.bounds + ("+Inf",), self.counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
+
+
+class LatencyHistogram(object):
+
+    def __init__(self, unit=0.000001, precision_bits=7):
+        """
+        HDR-style histogram of latencies: values are counted in buckets with a fixed relative precision (each power of 2
+        is divided in 2 ** (precision_bits - 1) buckets), then it records from microseconds to hours with little memory
+        and its percentiles have a relative error lower than 1 / 2 ** (precision_bits - 1). Histograms of several
+        processes can be joined with merge (they are picklable).
+
+        :param unit: seconds of the minimum value distinguished. By default: 1 microsecond
+        :param precision_bits: bits of precision of each bucket. By default: 7 (relative error < 1.6%)
+        """
+        self.unit = unit
+        self.precision_bits = precision_bits
+        self.counts = dict()
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        """
+        This add a latency to histogram (a negative latency, for example by an adjustment of clock, is 0).
+
+        :param seconds: latency in seconds
+        :return:
+        """
+        seconds = max(seconds, 0.0)
+        value = int(seconds / self.unit)
+        shift = max(value.bit_length() - self.precision_bits, 0)
+        key = (shift, value >> shift)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        """
+        This add to this histogram the latencies of other histogram (with the same unit and precision).
+
+        :param other: LatencyHistogram
+        :raise ValueError: if unit or precision are not the same
+        :return: self
+        """
+        if other.unit != self.unit or other.precision_bits != self.precision_bits:
+            raise ValueError("histograms with different unit or precision_bits can not be merged")
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+        return self
+
+    def percentile(self, q):
+        """
+        This return the latency of a percentile.
+
+        :param q: percentile between 0 and 100
+        :return: seconds (or None if histogram is empty)
+        """
+        if not self.count:
+            return None
+        rank = max(1, int(round(q / 100.0 * self.count)))
+        cumulative = 0
+        for shift, mantissa in sorted(self.counts, key=lambda key: key[1] << key[0]):
+            cumulative += self.counts[(shift, mantissa)]
+            if cumulative >= rank:
+                # Middle of bucket, without exceeding the real min and max
+                value = ((mantissa << shift) + ((1 << shift) - 1) / 2.0) * self.unit
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def snapshot(self):
+        """
+        This return a summary of histogram.
+
+        :return: dict with count, min, max, mean and percentiles 50, 90, 99 and 99.9 (seconds)
+        """
+        return {"count": self.count,
+                "min": self.min,
+                "max": self.max,
+                "mean": self.sum / self.count if self.count else None,
+                "p50": self.percentile(50),
+                "p90": self.percentile(90),
+                "p99": self.percentile(99),
+                "p999": self.percentile(99.9)}
+
+
+class QueueMetrics(object):
+
+    def __init__(self):
+        """
+        Counters and histograms of a queue in one process (each process has its own metrics).
+        """
+        self.items_put = 0
+        self.buckets_put = 0
+        self.bytes_serialized = 0
+        self.items_got = 0
+        self.buckets_got = 0
+        self.bytes_deserialized = 0
+        self.sensor_runs = 0
+        self.sensor_changes = 0
+        self.bucket_items = Histogram(ITEMS_BOUNDS)
+        self.put_blocked_seconds = Histogram(SECONDS_BOUNDS)
+        self.get_blocked_seconds = Histogram(SECONDS_BOUNDS)
+
+    def bucket_put(self, bucket, obj, blocked):
+        """
+        This count a bucket put in queue.
+
+        :param bucket: bucket put
+        :param obj: bucket serialized (or the bucket if there is not serializer)
+        :param blocked: seconds blocked to put it
+        :return:
+        """
+        items = _len(bucket)
+        self.items_put += items
+        self.buckets_put += 1
+        if isinstance(obj, bytes):
+            self.bytes_serialized += len(obj)
+        self.bucket_items.observe(items)
+        self.put_blocked_seconds.observe(blocked)
+
+    def bucket_got(self, bucket, obj, blocked):
+        """
+        This count a bucket got from queue.
+
+        :param bucket: bucket got
+        :param obj: bucket serialized (or the bucket if there is not serializer)
+        :param blocked: seconds blocked to get it
+        :return:
+        """
+        self.items_got += _len(bucket)
+        self.buckets_got += 1
+        if isinstance(obj, bytes):
+            self.bytes_deserialized += len(obj)
+        self.get_blocked_seconds.observe(blocked)
+
+    def sensor_decision(self, previous, size_bucket_list):
+        """
+        This count a run of sensor.
+
+        :param previous: size bucket list before the run
+        :param size_bucket_list: size bucket list determinated by the run
+        :return:
+        """
+        self.sensor_runs += 1
+        if size_bucket_list != previous:
+            self.sensor_changes += 1
+
+    def snapshot(self):
+        """
+        This return a snapshot of counters and histograms.
+
+        :return: dict with counters and "histograms" (dict of snapshots of histograms)
+        """
+        return {"items_put": self.items_put,
+                "buckets_put": self.buckets_put,
+                "bytes_serialized": self.bytes_serialized,
+                "items_got": self.items_got,
+                "buckets_got": self.buckets_got,
+                "bytes_deserialized": self.bytes_deserialized,
+                "sensor_runs": self.sensor_runs,
+                "sensor_changes": self.sensor_changes,
+                "put_blocked_seconds": self.put_blocked_seconds.sum,
+                "get_blocked_seconds": self.get_blocked_seconds.sum,
+                "histograms": {"bucket_items": self.bucket_items.snapshot(),
+                               "put_blocked_seconds": self.put_blocked_seconds.snapshot(),
+                               "get_blocked_seconds": self.get_blocked_seconds.snapshot()}}
+
+
+def _len(bucket):
+    try:
+        return len(bucket)
+    except TypeError:
+        # A bucket that is not a list (for example None to mark the end)
+        return 0
+
+
+def _labels(labels, extra=None):
+    items = list(labels.items()) + ([extra] if extra else [])
+    return "{" + ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                          for k, v in items) + "}"
+
+
+def to_prometheus(stats, prefix="quick_queue", labels=None):
+    """
+    This return the stats of a queue in Prometheus text format.
+
+    :param stats: dict returned by stats() of QQueue
+    :param prefix: prefix of names of metrics. By default: 'quick_queue'
+    :param labels: dict of labels added to each metric (label pid is always added). By default: None
+    :return: text
+    """
+    labels = dict(labels or {})
+    labels["pid"] = stats["pid"]
+    histograms = stats.get("histograms", {})
+
+    lines = list()
+    for name, (kind, description) in METRICS.items():
+        if kind == "histogram":
+            value = histograms.get(name)
+        else:
+            value = stats.get(name)
+        if value is None:
+            continue
+
+        full_name = "{}_{}{}".format(prefix, name, "_total" if kind == "counter" else "")
+        lines.append("# HELP {} {}".format(full_name, description))
+        lines.append("# TYPE {} {}".format(full_name, kind))
+        if kind == "histogram":
+            for bound, count in value["buckets"]:
+                lines.append("{}_bucket{} {}".format(full_name, _labels(labels, ("le", bound)), count))
+            lines.append("{}_sum{} {}".format(full_name, _labels(labels), value["sum"]))
+            lines.append("{}_count{} {}".format(full_name, _labels(labels), value["count"]))
+        else:
+            lines.append("{}{} {}".format(full_name, _labels(labels), value))
+    return "\n".join(lines) + "\n"
+
+
+class PrometheusFileExporter(object):
+
+    def __init__(self, stats, path, interval=10.0, prefix="quick_queue", labels=None):
+        """
+        Exporter that writes periodically (in a daemon thread) the stats of a queue in Prometheus text format to a local
+        file. The file is replaced atomically, then a reader never sees a file half written.
+
+        :param stats: function without args that returns the stats (for example qq.stats)
+        :param path: path of file. '{pid}' is replaced by the pid of process (then each process can have its own file)
+        :param interval: seconds between writes. By default: 10
+        :param prefix: prefix of names of metrics. By default: 'quick_queue'
+        :param labels: dict of labels added to each metric. By default: None
+        """
+        self.stats = stats
+        self.path = path.format(pid=os.getpid())
+        self.interval = interval
+        self.prefix = prefix
+        self.labels = labels
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def write(self):
+        """
+        This write the current stats in the file.
+
+        :return: path of file
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = "{}.{}.tmp".format(self.path, os.getpid())
+        with open(tmp_path, "w") as f:
+            f.write(to_prometheus(self.stats(), self.prefix, self.labels))
+        os.replace(tmp_path, self.path)
+        return self.path
+
+    def start(self):
+        """
+        This start the thread that writes the file each interval.
+
+        :return: self
+        """
+        self.thread = threading.Thread(target=self._loop, name="QQueueMetrics", daemon=True)
+        self.thread.start()
+        return self
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.write()
+
+    def stop(self):
+        """
+        This stop the thread and write the last stats in the file.
+
+        :return:
+        """
+        if self.stop_event.is_set():
+            return
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+        self.write()
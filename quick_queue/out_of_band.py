@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import os
+import pickle
+from multiprocessing import shared_memory
+
+
+# Segments attached by this process that are in use by data got (they are closed when data is not referenced)
+_attached_segments = []
+
+
+class _OutOfBand(object):
+    """
+    Wrapper of bytes, bytearray or memoryview to pickle its content as an out-of-band buffer (pickle only send
+    out-of-band buffers of objects that return a PickleBuffer when they are reduced).
+    """
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __reduce_ex__(self, protocol):
+        obj = self.obj
+        if isinstance(obj, memoryview):
+            return _rebuild_memoryview, (pickle.PickleBuffer(obj), obj.format, obj.shape)
+        return type(obj), (pickle.PickleBuffer(obj),)
+
+
+def prepare():
+    """
+    Start the resource tracker (in POSIX) before consumer processes are forked, then all processes share it and the
+    segments unlinked by consumers are not reported as leaked by the tracker of producer.
+    :return:
+    """
+    if os.name == "posix":
+        from multiprocessing import resource_tracker
+        resource_tracker.ensure_running()
+
+
+def _rebuild_memoryview(buf, fmt, shape):
+    """
+    Rebuild a memoryview over the out-of-band buffer (without copy).
+
+    :param buf: out-of-band buffer
+    :param fmt: format of original memoryview
+    :param shape: shape of original memoryview
+    :return: memoryview
+    """
+    return memoryview(buf).cast('B').cast(fmt, shape)
+
+
+def _wrap(value, threshold):
+    """
+    Wrap value to send it as out-of-band buffer if it is a bytes, bytearray or contiguous memoryview of threshold bytes
+    or more.
+
+    :param value: individual data
+    :param threshold: min bytes to send as out-of-band buffer
+    :return: value or value wrapped
+    """
+    if isinstance(value, (bytes, bytearray)):
+        if len(value) >= threshold:
+            return _OutOfBand(value)
+    elif isinstance(value, memoryview):
+        if value.nbytes >= threshold and value.contiguous:
+            return _OutOfBand(value)
+    return value
+
+
+class OutOfBandSerializer(object):
+
+    def __init__(self, threshold):
+        """
+        Serializer of buckets with pickle protocol 5 that copies the out-of-band buffers of threshold bytes or more
+        (bytes, bytearray, memoryview or objects that support it as NumPy arrays) to shared memory segments.
+
+        :param threshold: min bytes of buffer to send it out-of-band
+        """
+        self.threshold = threshold
+
+    def dumps(self, bucket):
+        """
+        Serialize a bucket
+
+        :param bucket: list of individual data
+        :return: tuple (pickled data, list of tuples (segment name, size, readonly))
+        """
+        threshold = self.threshold
+        bucket = [_wrap(v, threshold) for v in bucket]
+        segments = []
+
+        def buffer_callback(pickle_buffer):
+            raw = pickle_buffer.raw()
+            if raw.nbytes < threshold:
+                return True
+            shm = shared_memory.SharedMemory(create=True, size=max(raw.nbytes, 1))
+            try:
+                shm.buf[:raw.nbytes] = raw
+            finally:
+                shm.close()
+            segments.append((shm.name, raw.nbytes, raw.readonly))
+            return False
+
+        try:
+            data = pickle.dumps(bucket, protocol=5, buffer_callback=buffer_callback)
+        except BaseException:
+            self.release((None, segments))
+            raise
+        return data, segments
+
+    def loads(self, serialized):
+        """
+        Deserialize a bucket, the out-of-band buffers are read from shared memory segments (segments are unlinked here
+        and they are closed when the data got is not referenced). Memoryviews and objects that support out-of-band
+        buffers as NumPy arrays point to the segments without copy, bytes and bytearray are copied from them.
+
+        :param serialized: tuple (pickled data, list of tuples (segment name, size, readonly))
+        :return: list of individual data
+        """
+        _close_unused_segments()
+
+        data, segments = serialized
+        buffers = []
+        for name, size, readonly in segments:
+            shm = shared_memory.SharedMemory(name=name)
+            shm.unlink()
+            _attached_segments.append(shm)
+            buf = shm.buf[:size]
+            buffers.append(buf.toreadonly() if readonly else buf)
+        return pickle.loads(data, buffers=buffers)
+
+    def release(self, serialized):
+        """
+        Unlink the shared memory segments of a bucket serialized that will not be got.
+
+        :param serialized: tuple (pickled data, list of tuples (segment name, size, readonly))
+        :return:
+        """
+        for name, __, __ in serialized[1]:
+            try:
+                shm = shared_memory.SharedMemory(name=name)
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _close_unused_segments():
+    """
+    Close the segments attached by this process whose buffers are not referenced by data got.
+    :return:
+    """
+    for shm in list(_attached_segments):
+        try:
+            shm.close()
+            _attached_segments.remove(shm)
+        except BufferError:
+            pass
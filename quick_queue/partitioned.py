@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import numbers
+import pickle
+import zlib
+
+from quick_queue.quick_queue import QuickQueue
+
+"""
+Keyed queue of several partitions (one QuickQueue for each partition).
+
+Each value is put in the partition of its key (the same key always goes to the same partition, in any process) and each
+partition has its own bucket list and sensor, then partitions with many data put big bucket lists and partitions with
+few data are not blocked by them. Each consumer owns one partition, then all data of a key are processed by the same
+consumer in the order they were put (by each producer).
+"""
+
+
+def partition_of_key(key, partitions):
+    """
+    This return the partition of a key. The result is the same in all processes (hash() of str and bytes changes
+    between processes), then producers started with spawn put a key in the same partition.
+
+    Equal numbers are in the same partition (1, 1.0, True, Fraction(1) or Decimal(1)); other keys are compared by
+    their pickle, then keys with numbers inside (as tuples) must use the same types in all producers.
+
+    :param key: key of value (number, str, bytes or other picklable object)
+    :param partitions: number of partitions
+    :return: index of partition
+    """
+    if isinstance(key, numbers.Number) and not isinstance(key, int):
+        key = _normalize_number(key)
+    if isinstance(key, int):
+        return key % partitions
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    elif not isinstance(key, (bytes, bytearray)):
+        key = pickle.dumps(key, protocol=2)
+    return zlib.crc32(key) % partitions
+
+
+def _normalize_number(key):
+    """
+    Helper function to return the int equal to a number (other wise, its hash, that is the same for equal numbers and
+    in all processes).
+
+    :param key: number that is not an int
+    :return: int
+    """
+    if isinstance(key, complex):
+        if key.imag:
+            return hash(key)
+        key = key.real
+    try:
+        integer = int(key)
+    except (ValueError, OverflowError, TypeError):
+        # NaN, infinite or number without conversion to int
+        return hash(key)
+    return integer if integer == key else hash(key)
+
+
+def QPartitionedQueue(*args, **kwargs):
+    """
+    This method return one instance of QuickPartitionedQueue.
+
+    Example of use (about doctest: Process not work in doctest, you can try one example similar in
+    test/test_partitioned_queue.py):
+    >>> def _consumer(qpq):
+    ...     for user, value in qpq.partition_queue():
+    ...         print(user, value)
+    >>> qpq = QPartitionedQueue(2)
+    >>> processes = [multiprocessing.Process(target=_consumer, args=(qpq,)) for _ in range(2)]
+    >>> for p in processes:
+    ...     p.start()
+    >>> qpq.put(("user1", "A"), key="user1")
+    >>> qpq.put(("user2", "B"), key="user2")
+    >>> qpq.put(("user1", "C"), key="user1")
+    >>> qpq.end()
+    >>> for p in processes:
+    ...     p.join()
+
+    :param partitions: number of partitions (one consumer for each partition)
+    :param args: args of QQueue for each partition (maxsize, size_bucket_list, linger_ms...)
+    :param partitioner: function(key, partitions) that returns the index of partition of a key (defined at module
+                        level to be sent to processes). If None is partition_of_key. By default: None
+    :param kwargs: kwargs of QQueue for each partition (consumers is 1 and lanes can not be defined)
+    :raise ValueError: if partitions < 1, if consumers is not 1 or if lanes is defined
+    :return: QuickPartitionedQueue
+    """
+    return QuickPartitionedQueue(*args, **kwargs)
+
+
+class QuickPartitionedQueue(object):
+
+    def __init__(self, partitions, *args, partitioner=None, **kwargs):
+        """
+        Keyed queue of several partitions (see QPartitionedQueue).
+
+        :param partitions: number of partitions (one consumer for each partition)
+        :param args: args of QQueue for each partition
+        :param partitioner: function(key, partitions) that returns the index of partition of a key. If None is
+                            partition_of_key. By default: None
+        :param kwargs: kwargs of QQueue for each partition (consumers is 1 and lanes can not be defined)
+        :raise ValueError: if partitions < 1, if consumers is not 1 or if lanes is defined
+        """
+        if partitions < 1:
+            raise ValueError("partitions={} but range permitted: partitions >= 1".format(partitions))
+        if kwargs.setdefault("consumers", 1) != 1:
+            raise ValueError("consumers={} but each partition has one consumer".format(kwargs["consumers"]))
+        if kwargs.get("lanes") and kwargs["lanes"] > 1:
+            raise ValueError("lanes can not be defined in a partitioned queue (order of keys is not preserved)")
+
+        ctx = kwargs.get("ctx")
+        ctx = multiprocessing.get_context() if ctx is None else ctx
+        self.partitions = partitions
+        self.partitioner = partition_of_key if partitioner is None else partitioner
+        self.queues = [QuickQueue(*args, **kwargs) for _ in range(partitions)]
+        self.counter = ctx.Value('i', 0)
+
+    def partition(self, key):
+        """
+        This return the index of partition of a key.
+
+        :param key: key of value
+        :return: index of partition
+        """
+        return self.partitioner(key, self.partitions)
+
+    def partition_queue(self, index=None):
+        """
+        This return the queue of a partition (a QQueue), to get the data of that partition in its consumer: get,
+        get_bucket, get_many and iteration until the end-of-stream (see end).
+
+        :param index: index of partition. If None, partitions are assigned by turns to the processes that call it (call
+                      it once in each consumer). By default: None
+        :raise ValueError: if index is out of range or if all partitions were assigned
+        :return: QuickQueue of partition
+        """
+        if index is None:
+            with self.counter.get_lock():
+                index = self.counter.value
+                if index >= self.partitions:
+                    raise ValueError("all partitions ({}) were assigned".format(self.partitions))
+                self.counter.value += 1
+        elif not 0 <= index < self.partitions:
+            raise ValueError("index={} but range permitted: 0 <= index < {}".format(index, self.partitions))
+        return self.queues[index]
+
+    def put(self, value, key, *args, **kwargs):
+        """
+        This put a value in the bucket list of the partition of its key (see QQueue.put).
+
+        :param value: individual value to enqueue
+        :param key: key of value (the same key always goes to the same partition)
+        :param args: args of put (block, timeout)
+        :param kwargs: kwargs of put (block, timeout)
+        :return:
+        """
+        self.queues[self.partitioner(key, self.partitions)].put(value, *args, **kwargs)
+
+    def put_many(self, sequence, key, *args, **kwargs):
+        """
+        This put all values of a sequence with the same key (see QQueue.put_many).
+
+        :param sequence: sequence of values to enqueue (individually)
+        :param key: key of values
+        :param args: args of put (block, timeout)
+        :param kwargs: kwargs of put (block, timeout)
+        :return:
+        """
+        self.queues[self.partitioner(key, self.partitions)].put_many(sequence, *args, **kwargs)
+
+    def put_items(self, iterable, *args, **kwargs):
+        """
+        This put all values of an iterable of tuples (key, value) in the partitions of their keys.
+
+        :param iterable: iterable of tuples (key, value)
+        :param args: args of put (block, timeout)
+        :param kwargs: kwargs of put (block, timeout)
+        :return:
+        """
+        queues = self.queues
+        partitions = len(queues)
+        partitioner = self.partitioner
+        for key, value in iterable:
+            queues[partitioner(key, partitions)].put(value, *args, **kwargs)
+
+    def put_remain(self, *args, **kwargs):
+        """
+        This enqueue the rest values that remain in the bucket list of each partition.
+
+        :param args: args of put_remain (block, timeout)
+        :param kwargs: kwargs of put_remain (block, timeout)
+        :return:
+        """
+        for q in self.queues:
+            q.put_remain(*args, **kwargs)
+
+    def put_end(self):
+        """
+        This put the end-of-stream in each partition (after the rest values that remain), then the consumer of each
+        partition stops when it gets all data of its partition. Call it once when all producers have finished.
+
+        :return:
+        """
+        for q in self.queues:
+            q.put_end()
+
+    def end(self):
+        """
+        Helper to call to put_remain, put_end and close queue in one method
+        :return:
+        """
+        for q in self.queues:
+            q.end()
+
+    def close(self):
+        for q in self.queues:
+            q.close()
+
+    def stats(self):
+        """
+        This return the stats of each partition in this process (see QQueue.stats).
+
+        :return: list of dicts
+        """
+        return [q.stats() for q in self.queues]
+
+    def qsize(self):
+        """
+        This return the number of buckets in all partitions.
+
+        :return: number of buckets
+        """
+        return sum(q.qsize() for q in self.queues)
+
+    def empty(self):
+        return all(q.empty() for q in self.queues)
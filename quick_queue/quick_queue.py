@@ -2,10 +2,16 @@
 #
 # @autor: Ramón Invarato Menéndez
 # @version 1.7
+import itertools
 import logging
 import multiprocessing.context
 import multiprocessing.queues
+import multiprocessing.util
+import os
+import random
 import sys
+import threading
+import time
 
 try:
     import queue
@@ -13,6 +19,15 @@ except ImportError:
     # python 3.x
     import Queue as queue
 
+from quick_queue import serializers
+from quick_queue.metrics import LatencyHistogram, PrometheusFileExporter, QueueMetrics
+from quick_queue.sensors import ThroughputSensor
+
+try:
+    from quick_queue import out_of_band
+except ImportError:
+    # multiprocessing.shared_memory requires Python 3.8+
+    out_of_band = None
 
 __test__ = {'import_test': """
                            >>> from quick_queue.quick_queue import QQueue, QJoinableQueue
@@ -21,6 +36,52 @@ __test__ = {'import_test': """
             }
 
 
+# Max seconds that the prefetch thread waits in the queue before checking if it must stop
+_PREFETCH_POLL = 0.1
+
+# Max seconds that the leader of shared sensor can be without putting buckets before other producer becomes leader
+_SHARED_SENSOR_LEASE = 1.0
+
+
+class EndOfStream(queue.Empty):
+    """
+    Exception raised by get, get_bucket and get_many when the end-of-stream marker has been got (there are not more data
+    for this consumer). It is a subclass of queue.Empty, then loops that stop with queue.Empty also stop with it.
+    """
+
+
+class _EndOfStreamMarker(object):
+    """
+    Marker put in queue (instead of a bucket) to signal the end of stream. It is pickled by reference, then the process
+    that gets it has the same object of this module.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __reduce__(self):
+        return self.name
+
+
+# Marker got by one consumer and marker put again in queue by each consumer that gets it (for all consumers)
+_END_OF_STREAM = _EndOfStreamMarker("_END_OF_STREAM")
+_END_OF_STREAM_BROADCAST = _EndOfStreamMarker("_END_OF_STREAM_BROADCAST")
+
+
+def _estimate_bytes(value):
+    """
+    Estimate the size in bytes of a data serialized (cheap estimation without serialize).
+
+    :param value: individual data
+    :return: estimated size in bytes
+    """
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    elif isinstance(value, memoryview):
+        return value.nbytes
+    return sys.getsizeof(value)
+
+
 def QQueue(*args, **kwargs):
     """
     This method return one instance of QuickQueue.
@@ -70,11 +131,75 @@ def QQueue(*args, **kwargs):
     :param size_bucket_list: None to enable sensor size bucket list (require maxsize>0). If a number is defined
                              here then use this number to size_bucket_list and disable sensor. If maxsize<=0
                              and size_bucket_list==None then size_bucket_list is default to 1000; other wise,
-                             if maxsize<=0 and size_bucket_list is defined, then use this number. By default: None
+                             if maxsize<=0 and size_bucket_list is defined, then use this number. 'auto' to load
+                             the size bucket list calibrated in this machine with python -m quick_queue.calibrate (if
+                             there is not calibration, sensor is enabled). By default: None
     :param min_size_bucket_list: (only if sensor is enabled) min size bucket list.
                                  Min == 1 and max == max_size_bucket_list - 1. By default: 10
     :param max_size_bucket_list: (only if sensor is enabled) max size bucket list. If None is infinite.
                                  By defatult: None
+    :param linger_ms: max milliseconds that the oldest data waits in the bucket list before the bucket list is put in
+                      queue although it is not full (a linger thread puts it if there are not more calls to put). If
+                      None is disabled. By default: None
+    :param target_bucket_bytes: if it is defined, the bucket list is put in queue when the estimated size in bytes of
+                                its data reaches this number (or when it has more data than size_bucket_list if it is
+                                defined); sensor is disabled. If None is disabled. By default: None
+    :param sensor: (only if sensor is enabled) 'qsize' to determinate the size bucket list by the number of buckets in
+                   queue (the original sensor) or 'throughput' to determinate it by the data put per second measured in
+                   this process (hill climbing with the time blocked in put). By default: 'qsize'
+    :param maxbytes: if it is defined, max estimated size in bytes of all buckets in queue (put blocks until consumers
+                     get buckets; one bucket bigger than maxbytes is put when queue has not bytes). It could be used
+                     with maxsize<=0 to limit queue only by bytes. If None is disabled. By default: None
+    :param transport: 'pipe' to transport buckets with the pipe of multiprocessing.queues.Queue or 'shm' to transport
+                      buckets with a ring buffer in shared memory (multiprocessing.shared_memory, Python 3.8+).
+                      By default: 'pipe'
+    :param shm_size: (only if transport is 'shm') size in bytes of the ring buffer in shared memory (one serialized
+                     bucket must fit in it). By default: 16MB
+    :param oob_threshold: if it is defined, buckets are serialized with pickle protocol 5 and data of this number of
+                          bytes or more (bytes, bytearray, memoryview or objects with out-of-band buffers as NumPy
+                          arrays) are sent in shared memory segments (multiprocessing.shared_memory, Python 3.8+)
+                          instead of in the pickle. If None is disabled. By default: None
+    :param serializer: None to serialize buckets with pickle in the feeder thread of multiprocessing.queues.Queue; other
+                       wise, the whole bucket is serialized in the process that puts it with a built-in serializer
+                       ('pickle', 'pickle-highest' or 'marshal') or with a custom serializer (picklable object with
+                       methods dumps(bucket) -> bytes and loads(bytes) -> bucket). By default: None
+    :param compression: None to not compress; other wise, 'zlib' or 'lzma' to compress the buckets after serialization
+                        (if serializer is None, buckets are serialized with 'pickle'). By default: None
+    :param compression_min_bytes: (only if compression is defined) min bytes of a bucket serialized to compress it
+                                  (smaller buckets are not compressed). By default: 16KB
+    :param prefetch: if it is defined, a background thread in each consumer process gets and deserializes up to this
+                     number of buckets in advance (deserialization overlaps with the processing of data got). Call close
+                     in the consumer to put back in queue the buckets prefetched and not got (if the process exits
+                     without close, they are lost). If None is disabled. By default: None
+    :param shared_sensor: (only if sensor is enabled) if True, the producer processes share the size bucket list: the
+                          first producer that puts a bucket runs the sensor (until it closes the queue, exits or does
+                          not put data for 1 second) and the others use the size bucket list determinated by it,
+                          then producers do not react at the same time to the same qsize. By default: False
+    :param warm_start: (only if sensor is enabled) if True, processes that receive the queue when they start (spawn or
+                       forkserver) begin with the size bucket list (and the max size bucket list) learned by the sensor
+                       of the process that starts them, instead of begin a new sensor from the beginning.
+                       By default: True
+    :param metrics: if True, each process counts data, buckets and bytes put and got, seconds blocked in put_bucket and
+                    get_bucket and decisions of sensor (see stats() and start_metrics_exporter()); if False there is not
+                    overhead. By default: False
+    :param latency_sample: if it is defined, fraction (0 < latency_sample <= 1) of buckets stamped with the time when
+                           their first data entered the bucket list and the time when they were put in queue; the
+                           processes that get them record the latencies in HDR-style histograms (see
+                           latency_histograms()). If None is disabled. By default: None
+    :param consumers: if it is defined, number of consumer processes: end() puts in queue one end-of-stream marker for
+                      each consumer (see put_end()). If None, end() does not put markers (call put_end() to put one
+                      marker for all consumers). By default: None
+    :param lanes: (only if transport is 'pipe') if it is greater than 1, number of pipes (lanes) that transport the
+                  buckets: producers put buckets in lanes by turns and each consumer gets from its home lane (and from
+                  other lanes when it is empty), then consumers do not serialize on one lock of readers. The order of
+                  buckets is only preserved in each lane. By default: None
+    :param spill_dir: (only if maxsize > 0) if it is defined, directory where each producer process appends (to segment
+                      files in local disk) the buckets that it can not put because queue is full, instead of block; a
+                      thread of the producer puts them in queue in the same order when there are free slots (close and
+                      put_end wait for it). An unbounded queue (maxsize <= 0) is never full, then it can not spill (it
+                      raises ValueError): RAM is bounded by maxsize. By default: None
+    :param spill_segment_bytes: (only if spill_dir is defined) bytes of a segment file before start a new one (segments
+                                are deleted when all their buckets are put in queue). By default: 64MB
     """
     return QuickQueue(*args, **kwargs)
 
@@ -129,11 +254,75 @@ def QJoinableQueue(*args, **kwargs):
     :param size_bucket_list: None to enable sensor size bucket list (require maxsize>0). If a number is defined
                              here then use this number to size_bucket_list and disable sensor. If maxsize<=0
                              and size_bucket_list==None then size_bucket_list is default to 1000; other wise,
-                             if maxsize<=0 and size_bucket_list is defined, then use this number. By default: None
+                             if maxsize<=0 and size_bucket_list is defined, then use this number. 'auto' to load
+                             the size bucket list calibrated in this machine with python -m quick_queue.calibrate (if
+                             there is not calibration, sensor is enabled). By default: None
     :param min_size_bucket_list: (only if sensor is enabled) min size bucket list.
                                  Min == 1 and max == max_size_bucket_list - 1. By default: 10
     :param max_size_bucket_list: (only if sensor is enabled) max size bucket list. If None is infinite.
                                  By defatult: None
+    :param linger_ms: max milliseconds that the oldest data waits in the bucket list before the bucket list is put in
+                      queue although it is not full (a linger thread puts it if there are not more calls to put). If
+                      None is disabled. By default: None
+    :param target_bucket_bytes: if it is defined, the bucket list is put in queue when the estimated size in bytes of
+                                its data reaches this number (or when it has more data than size_bucket_list if it is
+                                defined); sensor is disabled. If None is disabled. By default: None
+    :param sensor: (only if sensor is enabled) 'qsize' to determinate the size bucket list by the number of buckets in
+                   queue (the original sensor) or 'throughput' to determinate it by the data put per second measured in
+                   this process (hill climbing with the time blocked in put). By default: 'qsize'
+    :param maxbytes: if it is defined, max estimated size in bytes of all buckets in queue (put blocks until consumers
+                     get buckets; one bucket bigger than maxbytes is put when queue has not bytes). It could be used
+                     with maxsize<=0 to limit queue only by bytes. If None is disabled. By default: None
+    :param transport: 'pipe' to transport buckets with the pipe of multiprocessing.queues.Queue or 'shm' to transport
+                      buckets with a ring buffer in shared memory (multiprocessing.shared_memory, Python 3.8+).
+                      By default: 'pipe'
+    :param shm_size: (only if transport is 'shm') size in bytes of the ring buffer in shared memory (one serialized
+                     bucket must fit in it). By default: 16MB
+    :param oob_threshold: if it is defined, buckets are serialized with pickle protocol 5 and data of this number of
+                          bytes or more (bytes, bytearray, memoryview or objects with out-of-band buffers as NumPy
+                          arrays) are sent in shared memory segments (multiprocessing.shared_memory, Python 3.8+)
+                          instead of in the pickle. If None is disabled. By default: None
+    :param serializer: None to serialize buckets with pickle in the feeder thread of multiprocessing.queues.Queue; other
+                       wise, the whole bucket is serialized in the process that puts it with a built-in serializer
+                       ('pickle', 'pickle-highest' or 'marshal') or with a custom serializer (picklable object with
+                       methods dumps(bucket) -> bytes and loads(bytes) -> bucket). By default: None
+    :param compression: None to not compress; other wise, 'zlib' or 'lzma' to compress the buckets after serialization
+                        (if serializer is None, buckets are serialized with 'pickle'). By default: None
+    :param compression_min_bytes: (only if compression is defined) min bytes of a bucket serialized to compress it
+                                  (smaller buckets are not compressed). By default: 16KB
+    :param prefetch: if it is defined, a background thread in each consumer process gets and deserializes up to this
+                     number of buckets in advance (deserialization overlaps with the processing of data got). Call close
+                     in the consumer to put back in queue the buckets prefetched and not got (if the process exits
+                     without close, they are lost). If None is disabled. By default: None
+    :param shared_sensor: (only if sensor is enabled) if True, the producer processes share the size bucket list: the
+                          first producer that puts a bucket runs the sensor (until it closes the queue, exits or does
+                          not put data for 1 second) and the others use the size bucket list determinated by it,
+                          then producers do not react at the same time to the same qsize. By default: False
+    :param warm_start: (only if sensor is enabled) if True, processes that receive the queue when they start (spawn or
+                       forkserver) begin with the size bucket list (and the max size bucket list) learned by the sensor
+                       of the process that starts them, instead of begin a new sensor from the beginning.
+                       By default: True
+    :param metrics: if True, each process counts data, buckets and bytes put and got, seconds blocked in put_bucket and
+                    get_bucket and decisions of sensor (see stats() and start_metrics_exporter()); if False there is not
+                    overhead. By default: False
+    :param latency_sample: if it is defined, fraction (0 < latency_sample <= 1) of buckets stamped with the time when
+                           their first data entered the bucket list and the time when they were put in queue; the
+                           processes that get them record the latencies in HDR-style histograms (see
+                           latency_histograms()). If None is disabled. By default: None
+    :param consumers: if it is defined, number of consumer processes: end() puts in queue one end-of-stream marker for
+                      each consumer (see put_end()). If None, end() does not put markers (call put_end() to put one
+                      marker for all consumers). By default: None
+    :param lanes: (only if transport is 'pipe') if it is greater than 1, number of pipes (lanes) that transport the
+                  buckets: producers put buckets in lanes by turns and each consumer gets from its home lane (and from
+                  other lanes when it is empty), then consumers do not serialize on one lock of readers. The order of
+                  buckets is only preserved in each lane. By default: None
+    :param spill_dir: (only if maxsize > 0) if it is defined, directory where each producer process appends (to segment
+                      files in local disk) the buckets that it can not put because queue is full, instead of block; a
+                      thread of the producer puts them in queue in the same order when there are free slots (close and
+                      put_end wait for it). An unbounded queue (maxsize <= 0) is never full, then it can not spill (it
+                      raises ValueError): RAM is bounded by maxsize. By default: None
+    :param spill_segment_bytes: (only if spill_dir is defined) bytes of a segment file before start a new one (segments
+                                are deleted when all their buckets are put in queue). By default: 64MB
     """
     return QuickJoinableQueue(*args, **kwargs)
 
@@ -146,6 +335,25 @@ class QuickQueue(multiprocessing.queues.Queue):
                  min_size_bucket_list=10,
                  max_size_bucket_list=None,
                  logging_level=logging.WARNING,
+                 linger_ms=None,
+                 target_bucket_bytes=None,
+                 sensor="qsize",
+                 maxbytes=None,
+                 transport="pipe",
+                 shm_size=16 * 1024 * 1024,
+                 oob_threshold=None,
+                 serializer=None,
+                 compression=None,
+                 compression_min_bytes=16 * 1024,
+                 prefetch=None,
+                 shared_sensor=False,
+                 warm_start=True,
+                 metrics=False,
+                 latency_sample=None,
+                 consumers=None,
+                 lanes=None,
+                 spill_dir=None,
+                 spill_segment_bytes=64 * 1024 * 1024,
                  ctx=None):
         """
         This class is a data wrapper into list structure to put in multiprocess queue and
@@ -159,19 +367,181 @@ class QuickQueue(multiprocessing.queues.Queue):
         :param size_bucket_list: None to enable sensor size bucket list (require maxsize>0). If a number is defined
                                  here then use this number to size_bucket_list and disable sensor. If maxsize<=0
                                  and size_bucket_list==None then size_bucket_list is default to 1000; other wise,
-                                 if maxsize<=0 and size_bucket_list is defined, then use this number. By default: None
+                                 if maxsize<=0 and size_bucket_list is defined, then use this number. 'auto' to load
+                                 the size bucket list calibrated in this machine with python -m quick_queue.calibrate
+                                 (if there is not calibration, sensor is enabled). By default: None
         :param min_size_bucket_list: (only if sensor is enabled) min size bucket list.
                                      Min == 1 and max == max_size_bucket_list - 1 (other wise, this raise a ValueError).
                                      By default: 10
         :param max_size_bucket_list: (only if sensor is enabled) max size bucket list. If None is infinite.
                                      By defatult: None
-        :raise ValueError: if min_size_bucket_list is not: 1 < min_size_bucket_list <= max_size_bucket_list - 1
+        :param linger_ms: max milliseconds that the oldest data waits in the bucket list before the bucket list is put
+                          in queue although it is not full (a linger thread puts it if there are not more calls to put).
+                          If None is disabled. By default: None
+        :param target_bucket_bytes: if it is defined, the bucket list is put in queue when the estimated size in bytes
+                                    of its data reaches this number (or when it has more data than size_bucket_list if
+                                    it is defined); sensor is disabled. If None is disabled. By default: None
+        :param sensor: (only if sensor is enabled) 'qsize' to determinate the size bucket list by the number of buckets
+                       in queue (the original sensor) or 'throughput' to determinate it by the data put per second
+                       measured in this process (hill climbing with the time blocked in put). By default: 'qsize'
+        :param maxbytes: if it is defined, max estimated size in bytes of all buckets in queue (put blocks until
+                         consumers get buckets; one bucket bigger than maxbytes is put when queue has not bytes). It
+                         could be used with maxsize<=0 to limit queue only by bytes. If None is disabled.
+                         By default: None
+        :param transport: 'pipe' to transport buckets with the pipe of multiprocessing.queues.Queue or 'shm' to
+                          transport buckets with a ring buffer in shared memory (multiprocessing.shared_memory, Python
+                          3.8+). By default: 'pipe'
+        :param shm_size: (only if transport is 'shm') size in bytes of the ring buffer in shared memory (one serialized
+                         bucket must fit in it). By default: 16MB
+        :param oob_threshold: if it is defined, buckets are serialized with pickle protocol 5 and data of this number of
+                              bytes or more (bytes, bytearray, memoryview or objects with out-of-band buffers as NumPy
+                              arrays) are sent in shared memory segments (multiprocessing.shared_memory, Python 3.8+)
+                              instead of in the pickle. If None is disabled. By default: None
+        :param serializer: None to serialize buckets with pickle in the feeder thread of multiprocessing.queues.Queue;
+                           other wise, the whole bucket is serialized in the process that puts it with a built-in
+                           serializer ('pickle', 'pickle-highest' or 'marshal') or with a custom serializer (picklable
+                           object with methods dumps(bucket) -> bytes and loads(bytes) -> bucket). By default: None
+        :param compression: None to not compress; other wise, 'zlib' or 'lzma' to compress the buckets after
+                            serialization (if serializer is None, buckets are serialized with 'pickle').
+                            By default: None
+        :param compression_min_bytes: (only if compression is defined) min bytes of a bucket serialized to compress it
+                                      (smaller buckets are not compressed). By default: 16KB
+        :param prefetch: if it is defined, a background thread in each consumer process gets and deserializes up to this
+                         number of buckets in advance (deserialization overlaps with the processing of data got). Call
+                         close in the consumer to put back in queue the buckets prefetched and not got (if the process
+                         exits without close, they are lost). If None is disabled. By default: None
+        :param shared_sensor: (only if sensor is enabled) if True, the producer processes share the size bucket list:
+                              the first producer that puts a bucket runs the sensor (until it closes the queue, exits or
+                              does not put data for 1 second) and the others use the size bucket list determinated by
+                              it, then producers do not react at the same time to the same qsize. By default: False
+        :param warm_start: (only if sensor is enabled) if True, processes that receive the queue when they start (spawn
+                           or forkserver) begin with the size bucket list (and the max size bucket list) learned by the
+                           sensor of the process that starts them, instead of begin a new sensor from the beginning.
+                           By default: True
+        :param metrics: if True, each process counts data, buckets and bytes put and got, seconds blocked in put_bucket
+                        and get_bucket and decisions of sensor (see stats() and start_metrics_exporter()); if False
+                        there is not overhead. By default: False
+        :param latency_sample: if it is defined, fraction (0 < latency_sample <= 1) of buckets stamped with the time
+                               when their first data entered the bucket list and the time when they were put in queue;
+                               the processes that get them record the latencies in HDR-style histograms (see
+                               latency_histograms()). If None is disabled. By default: None
+        :param consumers: if it is defined, number of consumer processes: end() puts in queue one end-of-stream marker
+                          for each consumer (see put_end()). If None, end() does not put markers (call put_end() to put
+                          one marker for all consumers). By default: None
+        :param lanes: (only if transport is 'pipe') if it is greater than 1, number of pipes (lanes) that transport the
+                      buckets: producers put buckets in lanes by turns and each consumer gets from its home lane (and
+                      from other lanes when it is empty), then consumers do not serialize on one lock of readers. The
+                      order of buckets is only preserved in each lane. By default: None
+        :param spill_dir: (only if maxsize > 0) if it is defined, directory where each producer process appends (to
+                          segment files in local disk) the buckets that it can not put because queue is full, instead of
+                          block; a thread of the producer puts them in queue in the same order when there are free slots
+                          (close and put_end wait for it). An unbounded queue (maxsize <= 0) is never full, then it can
+                          not spill (it raises ValueError): RAM is bounded by maxsize. By default: None
+        :param spill_segment_bytes: (only if spill_dir is defined) bytes of a segment file before start a new one
+                                    (segments are deleted when all their buckets are put in queue). By default: 64MB
+        :raise ValueError: if min_size_bucket_list is not: 1 < min_size_bucket_list <= max_size_bucket_list - 1 or
+                           if transport is not 'pipe' or 'shm' or if oob_threshold is defined without
+                           multiprocessing.shared_memory or with serializer or compression or if serializer,
+                           compression, sensor, latency_sample or consumers are not valid, if lanes is defined
+                           with transport 'shm' or if spill_dir is defined with maxsize<=0, maxbytes or oob_threshold
         """
-        multiprocessing.queues.Queue.__init__(self, maxsize, ctx=multiprocessing.get_context() if ctx is None else ctx)
+        ctx = multiprocessing.get_context() if ctx is None else ctx
+        multiprocessing.queues.Queue.__init__(self, maxsize, ctx=ctx)
+
+        self.maxbytes = maxbytes if maxbytes and maxbytes > 0 else None
+        if self.maxbytes:
+            self.bytes_in_queue = ctx.Value('q', 0, lock=False)
+            self.bytes_cond = ctx.Condition()
+        else:
+            self.bytes_in_queue = None
+            self.bytes_cond = None
+
+        self.transport = transport
+        if transport == "shm":
+            from quick_queue.shm_ring import SharedMemoryRing
+            self.ring = SharedMemoryRing(shm_size, maxsize, ctx=ctx)
+        elif transport == "pipe":
+            self.ring = None
+        else:
+            raise ValueError("transport={} but values permitted: 'pipe' or 'shm'".format(transport))
+
+        if lanes and lanes > 1:
+            if self.ring is not None:
+                raise ValueError("lanes can not be defined with transport='shm'")
+            from quick_queue.lanes import Lanes
+            self.lanes = Lanes(lanes, maxsize, ctx=ctx)
+        else:
+            self.lanes = None
+
+        self.serializer = serializers.get_serializer(serializer)
+        if oob_threshold:
+            if self.serializer is not None:
+                raise ValueError("serializer and oob_threshold can not be defined at the same time")
+            elif out_of_band is None:
+                raise ValueError("oob_threshold requires multiprocessing.shared_memory (Python 3.8+)")
+            out_of_band.prepare()
+            self.serializer = out_of_band.OutOfBandSerializer(oob_threshold)
+        if compression:
+            if oob_threshold:
+                raise ValueError("compression and oob_threshold can not be defined at the same time")
+            self.serializer = serializers.CompressedSerializer(self.serializer, compression, compression_min_bytes)
+
+        self.prefetch = prefetch if prefetch and prefetch > 0 else None
+        self.prefetch_buffer = None
+        self.prefetch_pending = None
+        self.prefetch_stop = None
+        self.prefetch_thread = None
+        if self.prefetch:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_prefetch)
+
+        # Spill to disk of buckets that can not be put because queue is full (spill file and thread of this process)
+        if spill_dir is not None:
+            if not maxsize or maxsize <= 0:
+                # Buckets are spilled when queue is full (an unbounded queue is never full)
+                raise ValueError("spill_dir requires maxsize > 0")
+            if maxbytes or oob_threshold:
+                raise ValueError("spill_dir can not be defined with maxbytes or oob_threshold")
+        self.spill_dir = spill_dir
+        self.spill_segment_bytes = spill_segment_bytes
+        self.spill = None
+        self.spill_stop = None
+        self.spill_thread = None
+        if self.spill_dir is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_spill)
+
+        # Shared sensor: [size bucket list determinated by the leader producer (0 if not yet), pid of leader (0 if not),
+        # last time (milliseconds of time.monotonic) that the leader renewed its lease]
+        self.shared_sensor = ctx.Array('q', [0, 0, 0]) if shared_sensor else None
+        self._init_shared_sensor_leader()
+        if self.shared_sensor is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._init_shared_sensor_leader)
+        self.warm_start = warm_start
+
+        # Metrics of this process (None if disabled)
+        self.metrics = QueueMetrics() if metrics else None
+        self.metrics_exporter = None
+        if self.metrics is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_metrics)
+
+        # Latency of a fraction of buckets: time when the first data entered the bucket list (if it is sampled) and
+        # histograms of this process
+        if latency_sample is not None and not 0 < latency_sample <= 1:
+            raise ValueError("latency_sample={} but range permitted: 0 < latency_sample <= 1".format(latency_sample))
+        self.latency_sample = latency_sample
+        self.latency_first = None
+        self.latency = QuickQueue._new_latency() if latency_sample else None
+        if self.latency is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_latency)
+
+        if consumers is not None and consumers < 1:
+            raise ValueError("consumers={} but range permitted: consumers >= 1".format(consumers))
+        self.consumers = consumers
+        self.end_of_stream = None
 
         self.enable_sensor = None
         self.size_bucket_list = None
         self.bucket_getting = None
+        self.index_bucket_getting = None
         self.bucket_list = None
 
         self.c_max_size = None
@@ -196,14 +566,111 @@ class QuickQueue(multiprocessing.queues.Queue):
         self.touch_min_size_bucket_list = None
         self.touch_max_size_bucket_list = None
 
+        self.linger = None
+        self.time_bucket_list = None
+        self.linger_cond = None
+        self.linger_thread = None
+
+        self.target_bucket_bytes = None
+        self.bytes_bucket_list = None
+
+        self.throughput_sensor = None
+        self.len_bucket_put = None
+        self.time_bucket_put = None
+
         self.init_args = {'maxsize': maxsize,
                           'size_bucket_list': size_bucket_list,
                           'min_size_bucket_list': min_size_bucket_list,
                           'max_size_bucket_list': max_size_bucket_list,
-                          'logging_level': logging_level}
+                          'logging_level': logging_level,
+                          'linger_ms': linger_ms,
+                          'target_bucket_bytes': target_bucket_bytes,
+                          'sensor': sensor}
 
         self.init(**self.init_args)
 
+    def __getstate__(self):
+        return super().__getstate__() + ({'maxbytes': self.maxbytes,
+                                          'bytes_in_queue': self.bytes_in_queue,
+                                          'bytes_cond': self.bytes_cond,
+                                          'transport': self.transport,
+                                          'ring': self.ring,
+                                          'lanes': self.lanes,
+                                          'serializer': self.serializer,
+                                          'prefetch': self.prefetch,
+                                          'shared_sensor': self.shared_sensor,
+                                          'warm_start': self.warm_start,
+                                          'metrics': self.metrics is not None,
+                                          'latency_sample': self.latency_sample,
+                                          'consumers': self.consumers,
+                                          'spill_dir': self.spill_dir,
+                                          'spill_segment_bytes': self.spill_segment_bytes,
+                                          'init_args': self.init_args,
+                                          'sensor_state': self._get_sensor_state() if self.warm_start else None},)
+
+    def __setstate__(self, state):
+        super().__setstate__(state[:-1])
+        config = dict(state[-1])
+        sensor_state = config.pop('sensor_state')
+        metrics = config.pop('metrics')
+        self.__dict__.update(config)
+        self._init_shared_sensor_leader()
+        if self.shared_sensor is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._init_shared_sensor_leader)
+        self.prefetch_buffer = None
+        self.prefetch_pending = None
+        self.prefetch_stop = None
+        self.prefetch_thread = None
+        if self.prefetch:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_prefetch)
+        self.spill = None
+        self.spill_stop = None
+        self.spill_thread = None
+        if self.spill_dir is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_spill)
+        self.metrics = QueueMetrics() if metrics else None
+        self.metrics_exporter = None
+        if self.metrics is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_metrics)
+        self.latency_first = None
+        self.latency = QuickQueue._new_latency() if self.latency_sample else None
+        if self.latency is not None:
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_latency)
+
+        # Initialization of this process with the args of constructor (and the state learned by the sensor)
+        self.init(**self.init_args)
+        if sensor_state:
+            self._set_sensor_state(sensor_state)
+
+    def _get_sensor_state(self):
+        """
+        Helper function to get the state learned by the sensor of this process.
+
+        :return: dict with size bucket list and max size bucket list or None if sensor is disabled
+        """
+        if not self.enable_sensor:
+            return None
+        return {'size_bucket_list': self.size_bucket_list,
+                'max_size_bucket_list': self.max_size_bucket_list,
+                'determinate_max': self.determinate_max}
+
+    def _set_sensor_state(self, sensor_state):
+        """
+        Helper function to start the sensor of this process with the state learned by the sensor of other process.
+
+        :param sensor_state: dict returned by _get_sensor_state
+        :return:
+        """
+        if not self.enable_sensor:
+            return
+        self.size_bucket_list = sensor_state['size_bucket_list']
+        if self.throughput_sensor is not None:
+            self.throughput_sensor.size_bucket_list = self.size_bucket_list
+        else:
+            self.max_size_bucket_list = sensor_state['max_size_bucket_list']
+            self.half_max_size_bucket_list = self.max_size_bucket_list / 2
+            self.determinate_max = sensor_state['determinate_max']
+
     def get_init_args(self):
         """
         This return initial args.
@@ -217,7 +684,10 @@ class QuickQueue(multiprocessing.queues.Queue):
              size_bucket_list=None,
              min_size_bucket_list=10,
              max_size_bucket_list=None,
-             logging_level=logging.WARNING):
+             logging_level=logging.WARNING,
+             linger_ms=None,
+             target_bucket_bytes=None,
+             sensor="qsize"):
         """
         Initialization in each process.
 
@@ -226,19 +696,42 @@ class QuickQueue(multiprocessing.queues.Queue):
         :param size_bucket_list: None to enable sensor size bucket list (require maxsize>0). If a number is defined
                                  here then use this number to size_bucket_list and disable sensor. If maxsize<=0
                                  and size_bucket_list==None then size_bucket_list is default to 1000; other wise,
-                                 if maxsize<=0 and size_bucket_list is defined, then use this number. By default: None
+                                 if maxsize<=0 and size_bucket_list is defined, then use this number. 'auto' to load
+                                 the size bucket list calibrated in this machine with python -m quick_queue.calibrate
+                                 (if there is not calibration, sensor is enabled). By default: None
         :param min_size_bucket_list: (only if sensor is enabled) min size bucket list.
                                      Min == 1 and max == max_size_bucket_list - 1 (other wise, this raise a ValueError).
                                      By default: 10
         :param max_size_bucket_list: (only if sensor is enabled) max size bucket list. If None is infinite.
                                      By defatult: None
+        :param linger_ms: max milliseconds that the oldest data waits in the bucket list before the bucket list is put
+                          in queue although it is not full (a linger thread puts it if there are not more calls to put).
+                          If None is disabled. By default: None
+        :param target_bucket_bytes: if it is defined, the bucket list is put in queue when the estimated size in bytes
+                                    of its data reaches this number (or when it has more data than size_bucket_list if
+                                    it is defined); sensor is disabled. If None is disabled. By default: None
+        :param sensor: (only if sensor is enabled) 'qsize' to determinate the size bucket list by the number of buckets
+                       in queue (the original sensor) or 'throughput' to determinate it by the data put per second
+                       measured in this process (hill climbing with the time blocked in put). By default: 'qsize'
         :param logging_level: logging level. By default: logging.WARNING
-        :raise ValueError: if min_size_bucket_list is not: 1 < min_size_bucket_list <= max_size_bucket_list - 1
+        :raise ValueError: if min_size_bucket_list is not: 1 < min_size_bucket_list <= max_size_bucket_list - 1 or
+                           if sensor is not 'qsize' or 'throughput'
         :return:
         """
 
         logging.basicConfig(stream=sys.stderr, level=logging_level)
-        if maxsize and maxsize > 0:
+        if size_bucket_list == "auto":
+            from quick_queue import calibrate
+            size_bucket_list = calibrate.calibrated_size_bucket_list()
+            if size_bucket_list is None:
+                logging.warning("[QQUEUE - CALIBRATION]: size_bucket_list='auto' but there is not calibration in {} "
+                                "(run python -m quick_queue.calibrate), sensor is enabled".format(
+                                    calibrate.calibration_path()))
+
+        if target_bucket_bytes:
+            self.enable_sensor = False
+            self.size_bucket_list = size_bucket_list if size_bucket_list else sys.maxsize
+        elif maxsize and maxsize > 0:
             self.enable_sensor = not bool(size_bucket_list)
             self.size_bucket_list = size_bucket_list if size_bucket_list else 10
         else:
@@ -250,7 +743,12 @@ class QuickQueue(multiprocessing.queues.Queue):
                                                    self.size_bucket_list))
 
         self.bucket_getting = list()
+        self.index_bucket_getting = 0
         self.bucket_list = list()
+        self.end_of_stream = False
+
+        self.target_bucket_bytes = target_bucket_bytes
+        self.bytes_bucket_list = 0
 
         self.c_max_size = maxsize if maxsize else 100000
         self.half_max_size = self.c_max_size // 2
@@ -270,6 +768,17 @@ class QuickQueue(multiprocessing.queues.Queue):
         self.min_size_bucket_list = min_size_bucket_list
         self.min_size_bucket_list_plusone = min_size_bucket_list + 1
 
+        if sensor == "throughput":
+            self.throughput_sensor = ThroughputSensor(self.size_bucket_list,
+                                                      min_size_bucket_list,
+                                                      max_size_bucket_list) if self.enable_sensor else None
+        elif sensor == "qsize":
+            self.throughput_sensor = None
+        else:
+            raise ValueError("sensor={} but values permitted: 'qsize' or 'throughput'".format(sensor))
+        self.len_bucket_put = 0
+        self.time_bucket_put = 0.0
+
         self.wait_check = 0
 
         self.change_quick = 0
@@ -282,6 +791,67 @@ class QuickQueue(multiprocessing.queues.Queue):
         self.touch_min_size_bucket_list = 0
         self.touch_max_size_bucket_list = 0
 
+        self.linger = linger_ms / 1000.0 if linger_ms else None
+        self.time_bucket_list = None
+        self.linger_thread = None
+        if self.linger:
+            self.linger_cond = threading.Condition(threading.Lock())
+            multiprocessing.util.register_after_fork(self, QuickQueue._after_fork_linger)
+        else:
+            self.linger_cond = None
+
+    def _after_fork_linger(self):
+        """
+        Helper function to renew in a forked process the lock of linger (it could be copied locked by the linger thread
+        of the parent process, that not exists in this process).
+        :return:
+        """
+        if self.linger:
+            self.linger_cond = threading.Condition(threading.Lock())
+            self.linger_thread = None
+
+    def _linger_loop(self):
+        """
+        Linger thread to put in queue the bucket list when its oldest data waits linger time.
+        :return:
+        """
+        with self.linger_cond:
+            while not self._closed:
+                if self.bucket_list:
+                    wait = self.time_bucket_list + self.linger - time.monotonic()
+                    if wait <= 0:
+                        self._put_bucket_list()
+                        continue
+                    self.linger_cond.wait(wait)
+                else:
+                    self.linger_cond.wait()
+
+    def _put_linger(self, value, *args, **kwargs):
+        """
+        Helper function to put a data with linger enabled: the bucket list is put in queue when it is full or when its
+        oldest data waits linger time (checked here and in the linger thread).
+
+        :param value: individual value to enqueue
+        :param args: args to put queue method
+        :return:
+        """
+        with self.linger_cond:
+            if not self.bucket_list:
+                self.time_bucket_list = time.monotonic()
+                if self.linger_thread is None:
+                    self.linger_thread = threading.Thread(target=self._linger_loop,
+                                                          name="QQueueLinger",
+                                                          daemon=True)
+                    self.linger_thread.start()
+                else:
+                    self.linger_cond.notify()
+
+            if self._append_bucket_list(value) or time.monotonic() - self.time_bucket_list >= self.linger:
+                self._put_bucket_list(*args, **kwargs)
+
+                if self.enable_sensor:
+                    self._sensor_size_list()
+
     def _autocalculate_size_bucket_list(self, qsize):
         """
         Helper function to calculate distante new size bucket list relatively to distance to half in relation
@@ -308,6 +878,101 @@ class QuickQueue(multiprocessing.queues.Queue):
         """
         Sensor to determinate in realtime the size bucket list.
 
+        :return:
+        """
+        if self.shared_sensor is not None and not self._lead_shared_sensor():
+            return
+
+        previous = self.size_bucket_list
+        if self.throughput_sensor is not None:
+            self.size_bucket_list = self.throughput_sensor.update(self.len_bucket_put, self.time_bucket_put)
+        else:
+            self._sensor_qsize()
+
+        if self.metrics is not None:
+            self.metrics.sensor_decision(previous, self.size_bucket_list)
+
+        if self.shared_sensor is not None:
+            self.shared_sensor[0] = self.size_bucket_list
+
+    def _init_shared_sensor_leader(self):
+        """
+        Helper function to begin a process as follower of shared sensor (also a forked process of the leader) and
+        without the finalizer that releases the leadership.
+        :return:
+        """
+        self.shared_sensor_leader = False
+        self.shared_sensor_renewed = 0
+        self.shared_sensor_finalizer = None
+
+    def _lead_shared_sensor(self):
+        """
+        Helper function to know if this process is the leader of shared sensor (it becomes leader if there is not
+        one or if the leader has not renewed its lease for _SHARED_SENSOR_LEASE seconds, because it does not put data
+        or it was killed). If it is not the leader, it takes the size bucket list determinated by the leader.
+
+        :return: True if this process runs the sensor
+        """
+        pid = os.getpid()
+        now = int(time.monotonic() * 1000)
+        lease = _SHARED_SENSOR_LEASE * 1000
+        leader = self.shared_sensor[1]
+        if leader == pid:
+            self.shared_sensor[2] = self.shared_sensor_renewed = now
+            self.shared_sensor_leader = True
+            return True
+        elif leader == 0 or now - self.shared_sensor[2] > lease:
+            with self.shared_sensor.get_lock():
+                if self.shared_sensor[1] == 0 or now - self.shared_sensor[2] > lease:
+                    self.shared_sensor[1] = pid
+                    self.shared_sensor[2] = self.shared_sensor_renewed = now
+                    self.shared_sensor_leader = True
+                    if self.shared_sensor[0]:
+                        self.size_bucket_list = self.shared_sensor[0]
+                    if self.shared_sensor_finalizer is None:
+                        # One finalizer for each process (although it becomes leader several times)
+                        self.shared_sensor_finalizer = multiprocessing.util.Finalize(
+                            self, QuickQueue._release_shared_sensor, args=(self.shared_sensor, pid), exitpriority=10)
+                    return True
+
+        self.shared_sensor_leader = False
+        size_bucket_list = self.shared_sensor[0]
+        if size_bucket_list:
+            self.size_bucket_list = size_bucket_list
+        return False
+
+    def _renew_shared_sensor(self):
+        """
+        Helper function to renew the lease of the leader of shared sensor while it puts data (although its bucket list
+        is not full yet). The shared time is written at most each quarter of lease.
+        :return:
+        """
+        now = int(time.monotonic() * 1000)
+        if now - self.shared_sensor_renewed >= _SHARED_SENSOR_LEASE * 250:
+            self.shared_sensor_renewed = now
+            if self.shared_sensor[1] == os.getpid():
+                self.shared_sensor[2] = now
+            else:
+                # Other producer took the leadership
+                self.shared_sensor_leader = False
+
+    @staticmethod
+    def _release_shared_sensor(shared_sensor, pid):
+        """
+        Helper function to release the leadership of shared sensor (other producer becomes leader in its next put).
+
+        :param shared_sensor: shared array of sensor
+        :param pid: pid of leader process
+        :return:
+        """
+        with shared_sensor.get_lock():
+            if shared_sensor[1] == pid:
+                shared_sensor[1] = 0
+
+    def _sensor_qsize(self):
+        """
+        Helper function of sensor to determinate the size bucket list by the number of buckets in queue.
+
         :return:
         """
         if self.wait_check > 0:
@@ -316,7 +981,9 @@ class QuickQueue(multiprocessing.queues.Queue):
             qsize = self.qsize()
             if self.determinate_max:
                 self.size_bucket_list += 100
-                if qsize < self.max_qsize_determinate_max or \
+                # The max is found when a bigger bucket list does not increase qsize (it stays empty or full, or it
+                # decreases), other wise the size bucket list grows without limit with a steady qsize
+                if qsize <= self.max_qsize_determinate_max or \
                         (self.def_max_size_bucket_list and self.size_bucket_list > self.def_max_size_bucket_list):
                     self.determinate_max = False
                     if self.def_max_size_bucket_list:
@@ -369,45 +1036,339 @@ class QuickQueue(multiprocessing.queues.Queue):
                           "size_bucket_list={}".format(qsize,
                                                        self.size_bucket_list))
 
-    def put_bucket(self, bucket, *args, **kwargs):
+    def _acquire_bytes(self, bucket, serialized, block=True, timeout=None):
+        """
+        Helper function to wait until the bytes of the bucket fit in maxbytes (a bucket bigger than maxbytes only wait
+        until queue has not bytes).
+
+        :param bucket: list of individual data
+        :param serialized: bucket serialized (if it is bytes, its length is the bytes of bucket; other wise, bytes of
+                           bucket are estimated)
+        :param block: block until bytes fit in maxbytes
+        :param timeout: max seconds to wait (raise the Full exception)
+        :return: bytes of bucket
+        """
+        if isinstance(serialized, bytes):
+            nbytes = len(serialized)
+        elif self.target_bucket_bytes and bucket is self.bucket_list:
+            nbytes = self.bytes_bucket_list
+        else:
+            nbytes = sum(map(_estimate_bytes, bucket))
+
+        with self.bytes_cond:
+            if not self.bytes_cond.wait_for(lambda: self.bytes_in_queue.value <= 0 or
+                                            self.bytes_in_queue.value + nbytes <= self.maxbytes,
+                                            timeout if block else 0):
+                raise queue.Full
+            self.bytes_in_queue.value += nbytes
+        return nbytes
+
+    def _release_bytes(self, nbytes):
+        """
+        Helper function to discount the bytes of a bucket that is out of queue.
+
+        :param nbytes: bytes of bucket
+        :return:
+        """
+        with self.bytes_cond:
+            self.bytes_in_queue.value -= nbytes
+            self.bytes_cond.notify_all()
+
+    def put_bucket(self, bucket, block=True, timeout=None):
         """
         This put in queue a list of data
 
         :param bucket: list of individual data
+        :param block: optional args block is true and timeout is None (the default), block if necessary until a free
+        slot is available.
+        :param timeout: If timeout is a positive number, it blocks at most timeout seconds and raises the Full exception
+        if no free slot was available within that time.
+        :return:
+        """
+        obj = bucket if self.serializer is None else self.serializer.dumps(bucket)
+        sent = obj if self.latency_sample is None else (self._latency_stamp(bucket), obj)
+        start = time.monotonic() if self.metrics is not None else None
+        try:
+            if self.maxbytes:
+                nbytes = self._acquire_bytes(bucket, obj, block, timeout)
+                try:
+                    self._put_obj((nbytes, sent), block, timeout)
+                except BaseException:
+                    self._release_bytes(nbytes)
+                    raise
+            elif self.spill_dir is not None:
+                self._put_spill(sent)
+            else:
+                self._put_obj(sent, block, timeout)
+        except BaseException:
+            if hasattr(self.serializer, "release"):
+                self.serializer.release(obj)
+            raise
+        if start is not None:
+            self.metrics.bucket_put(bucket, obj, time.monotonic() - start)
+
+    def _put_obj(self, obj, block=True, timeout=None, lane=None):
+        """
+        Helper function to put one object in the transport of queue (pipe, lanes or shared memory ring).
+
+        :param obj: object to put (usually a bucket)
+        :param block: block if necessary until a free slot is available
+        :param timeout: max seconds to wait (raise the Full exception)
+        :param lane: (only with lanes) index of lane to put the object in that lane. If None is the next lane of this
+                     process. By default: None
+        :return:
+        """
+        if self.lanes is not None:
+            if self._closed:
+                raise ValueError(f"Queue {self!r} is closed")
+            self.lanes.put(obj, block, timeout, lane)
+        elif self.ring is None:
+            multiprocessing.queues.Queue.put(self, obj, block, timeout)
+        else:
+            if self._closed:
+                raise ValueError(f"Queue {self!r} is closed")
+            self.ring.put(obj, block, timeout)
+
+    def _put_spill(self, obj):
+        """
+        Helper function to put one object in queue without block: if queue is full (or there are objects spilled
+        before, to keep the order) it is appended to the spill file of this process.
+
+        :param obj: object to put (usually a bucket)
+        :return:
+        """
+        if self.spill is None or not self.spill.pending:
+            try:
+                self._put_obj(obj, False)
+                return
+            except queue.Full:
+                pass
+        if self.spill is None:
+            self._start_spill()
+        self.spill.append(obj)
+
+    def _after_fork_spill(self):
+        """
+        Helper function to forget in a forked process the spill file and the spill thread of the parent process (a new
+        spill file is created in the first bucket spilled).
+        :return:
+        """
+        self.spill = None
+        self.spill_stop = None
+        self.spill_thread = None
+
+    def _start_spill(self):
+        """
+        Helper function to create the spill file of this process and start the spill thread (it is stopped when the
+        queue is closed or when the process exits, after it puts all the buckets spilled).
+        :return:
+        """
+        from quick_queue.spill import SpillFile
+        self.spill = SpillFile(self.spill_dir, self.spill_segment_bytes)
+        self.spill_stop = threading.Event()
+        self.spill_thread = threading.Thread(target=self._spill_loop,
+                                             args=(self.spill, self.spill_stop),
+                                             name="QQueueSpill",
+                                             daemon=True)
+        self.spill_thread.start()
+        multiprocessing.util.Finalize(self, QuickQueue._stop_spill,
+                                      args=(self.spill, self.spill_stop, self.spill_thread),
+                                      exitpriority=10)
+
+    @staticmethod
+    def _stop_spill(spill, stop, thread):
+        """
+        Helper function to stop a spill thread (it puts all buckets spilled before it stops) and delete its spill file.
+
+        :param spill: SpillFile
+        :param stop: event to stop the spill thread
+        :param thread: spill thread
+        :return:
+        """
+        stop.set()
+        with spill.cond:
+            spill.cond.notify_all()
+        if thread is not threading.current_thread():
+            thread.join()
+        spill.close()
+
+    def _spill_loop(self, spill, stop):
+        """
+        Loop of spill thread: it puts in queue (in order) the buckets of the spill file when there are free slots.
+
+        :param spill: SpillFile of this process
+        :param stop: event to stop the thread (when the spill file is empty)
+        :return:
+        """
+        while True:
+            with spill.cond:
+                spill.cond.wait_for(lambda: spill.pending or stop.is_set())
+            obj = spill.peek()
+            if obj is None:
+                if stop.is_set():
+                    return
+                continue
+            self._put_obj(obj)
+            spill.commit()
+
+    def _get_obj(self, *args, **kwargs):
+        """
+        Helper function to get one object from the transport of queue (pipe, lanes or shared memory ring).
+
+        :param args: args to get queue method
+        :param kwargs: kwargs to get queue method
+        :return: object got (usually a bucket)
+        """
+        if self.lanes is not None:
+            return self.lanes.get(*args, **kwargs)
+        if self.ring is None:
+            return multiprocessing.queues.Queue.get(self, *args, **kwargs)
+        return self.ring.get(*args, **kwargs)
+
+    def _append_bucket_list(self, value):
+        """
+        Helper function to add a data to the bucket list of this process.
+
+        :param value: individual value to enqueue
+        :return: True if the bucket list is full (by size_bucket_list or by target_bucket_bytes)
+        """
+        self.bucket_list.append(value)
+        if self.target_bucket_bytes:
+            self.bytes_bucket_list += _estimate_bytes(value)
+            if self.bytes_bucket_list >= self.target_bucket_bytes:
+                return True
+        return len(self.bucket_list) > self.size_bucket_list
+
+    def _put_bucket_list(self, *args, **kwargs):
+        """
+        Helper function to put in queue the bucket list of this process and start a new bucket list.
+
         :param args: args to put queue method
         :return:
         """
-        super().put(bucket, *args, **kwargs)
+        if self.throughput_sensor is None:
+            self.put_bucket(self.bucket_list, *args, **kwargs)
+        else:
+            start = time.monotonic()
+            self.put_bucket(self.bucket_list, *args, **kwargs)
+            self.time_bucket_put = time.monotonic() - start
+            self.len_bucket_put = len(self.bucket_list)
+        self.bucket_list = list()
+        self.bytes_bucket_list = 0
 
     def put(self, value, *args, **kwargs):
         """
-        This put in queue a data wrapped in a list. Accumulate data until size_bucket_list, then put in queue.
+        This put in queue a data wrapped in a list. Accumulate data until size_bucket_list (or until
+        target_bucket_bytes if it is defined), then put in queue.
 
         In the end all put all, call to put_remain() to ensure enqueue all buckets.
 
-        Note: If you put in other process different where QQueue was instanced, then you should be call to init()
-        method prior to put. In other case, default values will load in other process instance by default.
+        Note: If you put in other process different where QQueue was instanced, the args of constructor are loaded in
+        that process when it receives the queue (call to init() method prior to put to define other values).
 
         :param value: individual value to enqueue
         :param args: args to put queue method
         :return:
         """
-        try:
-            self.bucket_list.append(value)
+        if self.bucket_list is None:
+            self._init_default()
 
-            if len(self.bucket_list) > self.size_bucket_list:
-                self.put_bucket(self.bucket_list, *args, **kwargs)
-                self.bucket_list = list()
+        if self.shared_sensor_leader:
+            self._renew_shared_sensor()
 
-                if self.enable_sensor:
-                    self._sensor_size_list()
-        except AttributeError:
-            self.init(maxsize=1000,
-                      size_bucket_list=None,
-                      min_size_bucket_list=10,
-                      max_size_bucket_list=None,
-                      logging_level=logging.WARNING)
-            self.bucket_list = [value]
+        if self.latency_sample and not self.bucket_list:
+            self._start_latency()
+
+        if self.linger:
+            return self._put_linger(value, *args, **kwargs)
+
+        if self.target_bucket_bytes:
+            if self._append_bucket_list(value):
+                self._put_bucket_list(*args, **kwargs)
+            return
+
+        self.bucket_list.append(value)
+
+        if len(self.bucket_list) > self.size_bucket_list:
+            self._put_bucket_list(*args, **kwargs)
+
+            if self.enable_sensor:
+                self._sensor_size_list()
+
+    def _init_default(self):
+        """
+        Helper function to initialize with default values a process that has not called to init().
+        :return:
+        """
+        self.init(maxsize=1000,
+                  size_bucket_list=None,
+                  min_size_bucket_list=10,
+                  max_size_bucket_list=None,
+                  logging_level=logging.WARNING)
+
+    def _free_bucket_list(self):
+        """
+        Helper function to know how many data fit in the bucket list of this process until it must be put in queue.
+
+        :return: number of data (at least 1)
+        """
+        if self.bucket_list is None:
+            self._init_default()
+        return max(self.size_bucket_list + 1 - len(self.bucket_list), 1)
+
+    def _put_chunk(self, chunk, *args, **kwargs):
+        """
+        Helper function to add a list of data (that fits in the bucket list of this process) and put in queue the
+        bucket list if it is full.
+
+        :param chunk: list of individual values to enqueue
+        :param args: args to put queue method
+        :return:
+        """
+        if self.shared_sensor_leader:
+            self._renew_shared_sensor()
+
+        if self.latency_sample and not self.bucket_list:
+            self._start_latency()
+
+        if self.bucket_list:
+            self.bucket_list.extend(chunk)
+        else:
+            self.bucket_list = chunk
+
+        if len(self.bucket_list) > self.size_bucket_list:
+            self._put_bucket_list(*args, **kwargs)
+
+            if self.enable_sensor:
+                self._sensor_size_list()
+
+    def put_many(self, sequence, *args, **kwargs):
+        """
+        This put in queue all data from a sequence (list, tuple, range...). The sequence is sliced directly in bucket
+        lists of size_bucket_list (the size determinated by the sensor at each moment), then it is quicker than call to
+        put for each data.
+
+        Like put, data remain in the bucket list of this process until it is full, call to put_remain() to ensure
+        enqueue all buckets.
+
+        :param sequence: sequence of values to enqueue (individually)
+        :param args: args to put queue method
+        :return:
+        """
+        if self.linger or self.target_bucket_bytes:
+            for v in sequence:
+                self.put(v, *args, **kwargs)
+            return
+
+        free = self._free_bucket_list()
+        is_list = isinstance(sequence, list)
+        start = 0
+        end = len(sequence)
+        while start < end:
+            chunk = sequence[start:start + free]
+            start += free
+            self._put_chunk(chunk if is_list else list(chunk), *args, **kwargs)
+            free = self._free_bucket_list()
 
     def put_remain(self, *args, **kwargs):
         """
@@ -416,9 +1377,12 @@ class QuickQueue(multiprocessing.queues.Queue):
         :param args: args to put queue method
         :return:
         """
-        if self.bucket_list:
-            self.put_bucket(self.bucket_list, *args, **kwargs)
-            self.bucket_list = list()
+        if self.linger:
+            with self.linger_cond:
+                if self.bucket_list:
+                    self._put_bucket_list(*args, **kwargs)
+        elif self.bucket_list:
+            self._put_bucket_list(*args, **kwargs)
 
     def put_iterable(self, iterable, *args, **kwargs):
         """
@@ -428,32 +1392,414 @@ class QuickQueue(multiprocessing.queues.Queue):
 
         This method not call to close queue (you can use several times this method with multiples iterables).
 
+        The iterable is consumed in slices of size_bucket_list (the size determinated by the sensor at each moment), then
+        it is quicker than call to put for each data.
+
         :param iterable: iterable of values to enqueue (individually)
         :param args: args to put queue method
         :return:
         """
-        for v in iterable:
-            self.put(v, *args, **kwargs)
+        if self.linger or self.target_bucket_bytes:
+            for v in iterable:
+                self.put(v, *args, **kwargs)
+        else:
+            free = self._free_bucket_list()
+            iterator = iter(iterable)
+            while True:
+                chunk = list(itertools.islice(iterator, free))
+                if not chunk:
+                    break
+                self._put_chunk(chunk, *args, **kwargs)
+                free = self._free_bucket_list()
 
         self.put_remain()
 
     def end(self):
         """
-        Helper to call to put_remain and close queue in one method
+        Helper to call to put_remain, put_end (only if consumers is defined) and close queue in one method
         :return:
         """
         self.put_remain()
+        if self.consumers:
+            self.put_end()
         self.close()
 
+    def put_end(self):
+        """
+        This put in queue the end-of-stream (after the rest values that remain): one marker for each consumer if
+        consumers is defined (each consumer stops when it gets one marker); other wise, one marker that each consumer
+        puts again in queue when it gets it (then all consumers stop and the marker remains in queue).
+
+        When a consumer gets the end-of-stream (after all data put before it), get, get_bucket and get_many raise
+        EndOfStream and iteration (for data in qq or iter_buckets) stops. Call it once when all producers have finished
+        (for example, in the main process after join the producers).
+
+        :return:
+        """
+        self.put_remain()
+        if self.spill is not None:
+            # The end-of-stream is put after the buckets spilled
+            self.spill.wait_empty()
+        # With lanes, the end-of-stream is put in each lane (a consumer stops when it has got it from all lanes)
+        for lane in (range(len(self.lanes.queues)) if self.lanes is not None else [None]):
+            if self.consumers:
+                for _ in range(self.consumers):
+                    self._put_end_of_stream(_END_OF_STREAM, lane=lane)
+            else:
+                self._put_end_of_stream(_END_OF_STREAM_BROADCAST, lane=lane)
+
+    def _put_end_of_stream(self, marker, block=True, timeout=None, lane=None):
+        """
+        Helper function to put a marker of end-of-stream in the transport of queue (it is not serialized and it is not
+        counted in maxbytes).
+
+        :param marker: _END_OF_STREAM or _END_OF_STREAM_BROADCAST
+        :param block: block if necessary until a free slot is available
+        :param timeout: max seconds to wait (raise the Full exception)
+        :param lane: (only with lanes) index of lane. By default: None
+        :return:
+        """
+        obj = marker if self.latency_sample is None else (None, marker)
+        self._put_obj((0, obj) if self.maxbytes else obj, block, timeout, lane)
+
+    def async_view(self):
+        """
+        This return a front end of this queue for asyncio (see AsyncQQueue): coroutines put and get without block the
+        event loop. Create it in the process (and event loop) where it is used.
+
+        :return: AsyncQQueue
+        """
+        from quick_queue.async_queue import AsyncQQueue
+        return AsyncQQueue(self)
+
+    def close(self):
+        """
+        Close the queue (stop the linger thread, the prefetch thread and the metrics exporter if they are running, put
+        back in queue the buckets prefetched and not got, wait until the buckets spilled to disk are put and release
+        the shared sensor if this process is its leader)
+        :return:
+        """
+        if self.prefetch_thread is not None:
+            QuickQueue._stop_prefetch(self.prefetch_stop, self.prefetch_thread)
+            self.prefetch_thread = None
+        if self.prefetch_buffer is not None:
+            self._put_back_prefetch()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+            self.metrics_exporter = None
+        if self.spill_thread is not None:
+            QuickQueue._stop_spill(self.spill, self.spill_stop, self.spill_thread)
+            self.spill = None
+            self.spill_thread = None
+        if self.shared_sensor is not None:
+            QuickQueue._release_shared_sensor(self.shared_sensor, os.getpid())
+            self.shared_sensor_leader = False
+        if self.lanes is not None:
+            self.lanes.close()
+        super().close()
+        if self.linger_cond is not None:
+            with self.linger_cond:
+                self.linger_cond.notify()
+
+    def _after_fork_metrics(self):
+        """
+        Helper function to begin in a forked process its own metrics (instead of the counters copied from the parent
+        process, that also has not its exporter thread in this process).
+        :return:
+        """
+        self.metrics = QueueMetrics()
+        self.metrics_exporter = None
+
+    def stats(self):
+        """
+        This return a snapshot of the metrics of this process: current size bucket list, qsize, (if metrics is
+        enabled) counters of data, buckets and bytes put and got, seconds blocked in put_bucket and get_bucket,
+        decisions of sensor and their histograms and (if latency_sample is defined) percentiles of latency.
+
+        :return: dict with the metrics
+        """
+        try:
+            qsize = self.qsize()
+        except (NotImplementedError, OSError, ValueError):
+            # qsize is not implemented in macOS (and it fails if queue is closed with shared memory)
+            qsize = None
+        stats = {"pid": os.getpid(),
+                 "enable_sensor": self.enable_sensor,
+                 "size_bucket_list": self.size_bucket_list,
+                 "qsize": qsize,
+                 "bytes_in_queue": self.bytes_in_queue.value if self.maxbytes else None}
+        if self.metrics is not None:
+            stats.update(self.metrics.snapshot())
+        if self.latency is not None:
+            stats["latency"] = dict((name, histogram.snapshot()) for name, histogram in self.latency.items())
+        if self.spill_dir is not None:
+            stats["spilled_buckets"] = self.spill.pending if self.spill is not None else 0
+            stats["spilled_bytes"] = self.spill.pending_bytes if self.spill is not None else 0
+        return stats
+
+    def start_metrics_exporter(self, path, interval=10.0, prefix="quick_queue", labels=None):
+        """
+        This start in this process a thread that writes stats() in Prometheus text format to a local file each
+        interval (for example, for the textfile collector of node_exporter). It is stopped (with a last write) when the
+        queue is closed or when the process exits.
+
+        :param path: path of file. '{pid}' is replaced by the pid of process (then each process can have its own file)
+        :param interval: seconds between writes. By default: 10
+        :param prefix: prefix of names of metrics. By default: 'quick_queue'
+        :param labels: dict of labels added to each metric (label pid is always added). By default: None
+        :raise ValueError: if metrics is not enabled
+        :return: exporter (PrometheusFileExporter)
+        """
+        if self.metrics is None:
+            raise ValueError("metrics exporter requires metrics=True")
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
+        self.metrics_exporter = PrometheusFileExporter(self.stats, path, interval, prefix, labels).start()
+        multiprocessing.util.Finalize(self, PrometheusFileExporter.stop,
+                                      args=(self.metrics_exporter,),
+                                      exitpriority=10)
+        return self.metrics_exporter
+
+    @staticmethod
+    def _new_latency():
+        """
+        Helper function to create the histograms of latency of a process: 'fill' (from the first data in the bucket
+        list until the bucket is put, recorded by producers), 'queue' (from put until get) and 'end_to_end' (from the
+        first data in the bucket list until get), these two last recorded by consumers.
+
+        :return: dict of LatencyHistogram
+        """
+        return {"fill": LatencyHistogram(), "queue": LatencyHistogram(), "end_to_end": LatencyHistogram()}
+
+    def _after_fork_latency(self):
+        """
+        Helper function to begin in a forked process its own histograms of latency.
+        :return:
+        """
+        self.latency_first = None
+        self.latency = QuickQueue._new_latency()
+
+    def _start_latency(self):
+        """
+        Helper function called when the first data enters the bucket list: it decides if the bucket is sampled and
+        remembers the time.
+        :return:
+        """
+        self.latency_first = time.time() if random.random() < self.latency_sample else None
+
+    def _latency_stamp(self, bucket):
+        """
+        Helper function to stamp a bucket that is put in queue (if it is sampled) and record its fill latency.
+
+        :param bucket: bucket to put
+        :return: tuple (time of first data, time of put) or None if the bucket is not sampled
+        """
+        if bucket is self.bucket_list:
+            first = self.latency_first
+            self.latency_first = None
+            if first is None:
+                return None
+        elif random.random() < self.latency_sample:
+            # Bucket put directly with put_bucket
+            first = time.time()
+        else:
+            return None
+        now = time.time()
+        self.latency["fill"].observe(now - first)
+        return first, now
+
+    def _record_latency(self, stamp):
+        """
+        Helper function to record the latencies of a bucket stamped that is got from queue.
+
+        :param stamp: tuple (time of first data, time of put)
+        :return:
+        """
+        first, enqueued = stamp
+        now = time.time()
+        self.latency["queue"].observe(now - enqueued)
+        self.latency["end_to_end"].observe(now - first)
+
+    def latency_histograms(self):
+        """
+        This return the histograms of latency recorded in this process (producers record 'fill' and consumers record
+        'queue' and 'end_to_end'). Histograms of several processes can be joined with LatencyHistogram.merge.
+
+        :raise ValueError: if latency_sample is not defined
+        :return: dict with LatencyHistogram of 'fill' (seconds from the first data in the bucket list until the bucket
+                 is put), 'queue' (seconds from put until get) and 'end_to_end' (seconds from the first data in the
+                 bucket list until get)
+        """
+        if self.latency is None:
+            raise ValueError("latency histograms require latency_sample")
+        return self.latency
+
+    def _after_fork_prefetch(self):
+        """
+        Helper function to forget in a forked process the prefetch thread of the parent process (it not exists in this
+        process, then a new one is started in the first get).
+        :return:
+        """
+        self.prefetch_buffer = None
+        self.prefetch_pending = None
+        self.prefetch_stop = None
+        self.prefetch_thread = None
+
+    def _start_prefetch(self):
+        """
+        Helper function to start the prefetch thread of this process (it is stopped when the queue is closed or when
+        the process exits).
+        :return:
+        """
+        self.prefetch_buffer = queue.Queue(self.prefetch)
+        self.prefetch_pending = []
+        self.prefetch_stop = threading.Event()
+        self.prefetch_thread = threading.Thread(target=self._prefetch_loop,
+                                                args=(self.prefetch_buffer, self.prefetch_pending, self.prefetch_stop),
+                                                name="QQueuePrefetch",
+                                                daemon=True)
+        self.prefetch_thread.start()
+        multiprocessing.util.Finalize(self, QuickQueue._stop_prefetch,
+                                      args=(self.prefetch_stop, self.prefetch_thread),
+                                      exitpriority=10)
+
+    @staticmethod
+    def _stop_prefetch(stop, thread):
+        """
+        Helper function to stop a prefetch thread (it must not be killed while it waits in the queue, because it could
+        hold the lock of readers shared with other consumers).
+
+        :param stop: event to stop the prefetch thread
+        :param thread: prefetch thread
+        :return:
+        """
+        stop.set()
+        if thread is not threading.current_thread():
+            thread.join()
+
+    def _prefetch_loop(self, buffer, pending, stop):
+        """
+        Prefetch thread to get and deserialize buckets in advance. It waits in the queue by intervals of
+        _PREFETCH_POLL seconds to check if it must stop; an exception is passed in the buffer to be raised by get.
+
+        :param buffer: local queue of buckets deserialized
+        :param pending: list where the bucket got is left if the thread is stopped while the buffer is full
+        :param stop: event to stop the prefetch thread
+        :return:
+        """
+        def _put(obj):
+            while not stop.is_set():
+                try:
+                    buffer.put(obj, True, _PREFETCH_POLL)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        try:
+            while not stop.is_set():
+                try:
+                    bucket = self._get_bucket(True, _PREFETCH_POLL)
+                except EndOfStream:
+                    raise
+                except queue.Empty:
+                    continue
+                if not _put(bucket):
+                    pending.append(bucket)
+                    return
+        except BaseException as e:
+            _put(e)
+
+    def _put_back_prefetch(self):
+        """
+        Helper function to put back in queue (at the end) the buckets prefetched and not got by this process when the
+        prefetch thread is stopped, then other consumers get them (and join of QJoinableQueue does not wait forever
+        for their data). If the queue is full, they are lost with a warning.
+        :return:
+        """
+        buckets = list()
+        while True:
+            try:
+                bucket = self.prefetch_buffer.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(bucket, BaseException):
+                buckets.append(bucket)
+        buckets.extend(self.prefetch_pending)
+        self.prefetch_buffer = None
+        self.prefetch_pending = None
+
+        lost = 0
+        for bucket in buckets:
+            try:
+                # The data of bucket are already counted as unfinished tasks by QJoinableQueue
+                QuickQueue.put_bucket(self, bucket, False)
+            except queue.Full:
+                lost += len(bucket)
+        if lost:
+            logging.warning("[QQUEUE - PREFETCH]: queue is full, {} data prefetched are lost".format(lost))
+
     def get_bucket(self, *args, **kwargs):
         """
         This get from queue a list of data
 
+        :param args: args to get queue method
+        :param kwargs: kwargs to get queue method
+        :raise EndOfStream: if this process has got the end-of-stream
+        :return:
+        """
+        if self.end_of_stream:
+            raise EndOfStream
+        try:
+            if not self.prefetch:
+                return self._get_bucket(*args, **kwargs)
+
+            if self.prefetch_thread is None:
+                self._start_prefetch()
+            bucket = self.prefetch_buffer.get(*args, **kwargs)
+            if isinstance(bucket, BaseException):
+                # The prefetch thread has finished, then a new one is started in the next get
+                self.prefetch_thread = None
+                raise bucket
+            return bucket
+        except EndOfStream:
+            # This process does not get more from queue (the markers of other consumers remain in queue)
+            self.end_of_stream = True
+            raise
+
+    def _get_bucket(self, *args, **kwargs):
+        """
+        Helper function to get from the transport of queue a list of data (deserialized).
+
         :param args: args to get queue method
         :param kwargs: kwargs to get queue method
         :return:
         """
-        return super().get(*args, **kwargs)
+        if self.metrics is None:
+            obj = self._get_obj(*args, **kwargs)
+        else:
+            start = time.monotonic()
+            obj = self._get_obj(*args, **kwargs)
+            blocked = time.monotonic() - start
+        if self.maxbytes:
+            nbytes, obj = obj
+            self._release_bytes(nbytes)
+        if self.latency_sample is not None:
+            stamp, obj = obj
+            if stamp is not None:
+                self._record_latency(stamp)
+        if isinstance(obj, _EndOfStreamMarker):
+            lane = None if self.lanes is None else self.lanes.last
+            if obj is _END_OF_STREAM_BROADCAST:
+                self._put_end_of_stream(obj, lane=lane)
+            if lane is not None and not self.lanes.end_lane(lane):
+                # There are lanes not finished for this process
+                return self._get_bucket(*args, **kwargs)
+            raise EndOfStream
+        bucket = obj if self.serializer is None else self.serializer.loads(obj)
+        if self.metrics is not None:
+            self.metrics.bucket_got(bucket, obj, blocked)
+        return bucket
 
     def get(self, *args, **kwargs):
         """
@@ -462,18 +1808,136 @@ class QuickQueue(multiprocessing.queues.Queue):
         To prevent miss data, you need to call get until end of queue; if you think in terminate premature a consumer,
         then it is best call get_bucket to obtain a list of data and iterate until end.
 
+        The bucket in use is read with a cursor (index_bucket_getting) instead of removing its first element, then
+        the cost to get one data is constant whatever the size of the bucket list.
+
         :param args: args to get queue method
         :param kwargs: kwargs to get queue method
         :return:
         """
-        try:
-            return self.bucket_getting.pop(0)
-        except IndexError:
-            self.bucket_getting = self.get_bucket(*args, **kwargs)
-            return self.get(*args, **kwargs)
-        except AttributeError:
-            self.bucket_getting = self.get_bucket(*args, **kwargs)
-            return self.get(*args, **kwargs)
+        while True:
+            try:
+                value = self.bucket_getting[self.index_bucket_getting]
+                self.index_bucket_getting += 1
+                return value
+            except (IndexError, AttributeError):
+                self.bucket_getting = self.get_bucket(*args, **kwargs)
+                self.index_bucket_getting = 0
+
+    def get_many(self, max_items, timeout=None):
+        """
+        This get from queue up to max_items data unwrapped from the lists (it can join data from several buckets).
+
+        Block until max_items data are got. If timeout is a positive number, it blocks at most timeout seconds and
+        return the data got in that time (less than max_items); if there is not data in that time, it raises the
+        Empty exception.
+
+        :param max_items: max number of data to get
+        :param timeout: max seconds to wait to complete max_items data. None to wait until complete. By default: None
+        :raise ValueError: if max_items < 1
+        :return: list with up to max_items data
+        """
+        if max_items < 1:
+            raise ValueError("max_items={} but range permitted: max_items >= 1".format(max_items))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        items = list()
+        while True:
+            try:
+                index = self.index_bucket_getting
+                chunk = self.bucket_getting[index:index + max_items - len(items)]
+            except AttributeError:
+                self.bucket_getting = list()
+                self.index_bucket_getting = 0
+                continue
+
+            self.index_bucket_getting = index + len(chunk)
+            if items:
+                items.extend(chunk)
+            else:
+                items = chunk
+
+            if len(items) >= max_items:
+                return items
+
+            try:
+                if deadline is None:
+                    self.bucket_getting = self.get_bucket()
+                else:
+                    self.bucket_getting = self.get_bucket(timeout=max(deadline - time.monotonic(), 0))
+                self.index_bucket_getting = 0
+            except queue.Empty:
+                if items:
+                    return items
+                raise
+
+    def __iter__(self):
+        """
+        This iterate the data got from queue until the end-of-stream (see put_end).
+
+        :return: iterator of data
+        """
+        while True:
+            try:
+                yield self.get()
+            except EndOfStream:
+                return
+
+    def iter_buckets(self):
+        """
+        This iterate the buckets got from queue until the end-of-stream (see put_end). If a bucket was begun with get,
+        first it returns the data that remain in that bucket.
+
+        :return: iterator of lists of data
+        """
+        if self.bucket_getting and self.index_bucket_getting < len(self.bucket_getting):
+            bucket = self.bucket_getting[self.index_bucket_getting:]
+            self.bucket_getting = list()
+            self.index_bucket_getting = 0
+            yield bucket
+        while True:
+            try:
+                yield self.get_bucket()
+            except EndOfStream:
+                return
+
+    def qsize(self):
+        """
+        This return the number of buckets in queue (not the number of elements)
+
+        :return: number of buckets
+        """
+        if self.lanes is not None:
+            return self.lanes.qsize()
+        if self.ring is None:
+            return super().qsize()
+        return self.ring.qsize()
+
+    def empty(self):
+        """
+        This return True if there are not buckets in queue (neither buckets prefetched by this process)
+
+        :return: True if queue is empty
+        """
+        if self.prefetch_buffer is not None and not self.prefetch_buffer.empty():
+            return False
+        if self.lanes is not None:
+            return self.lanes.empty()
+        if self.ring is None:
+            return super().empty()
+        return self.ring.qsize() == 0
+
+    def full(self):
+        """
+        This return True if queue has maxsize buckets
+
+        :return: True if queue is full
+        """
+        if self.lanes is not None:
+            return self.lanes.full()
+        if self.ring is None:
+            return super().full()
+        return bool(self.ring.maxsize) and self.ring.qsize() >= self.ring.maxsize
 
 
 class QuickJoinableQueue(QuickQueue,
@@ -485,6 +1949,25 @@ class QuickJoinableQueue(QuickQueue,
                  min_size_bucket_list=10,
                  max_size_bucket_list=None,
                  logging_level=logging.WARNING,
+                 linger_ms=None,
+                 target_bucket_bytes=None,
+                 sensor="qsize",
+                 maxbytes=None,
+                 transport="pipe",
+                 shm_size=16 * 1024 * 1024,
+                 oob_threshold=None,
+                 serializer=None,
+                 compression=None,
+                 compression_min_bytes=16 * 1024,
+                 prefetch=None,
+                 shared_sensor=False,
+                 warm_start=True,
+                 metrics=False,
+                 latency_sample=None,
+                 consumers=None,
+                 lanes=None,
+                 spill_dir=None,
+                 spill_segment_bytes=64 * 1024 * 1024,
                  ctx=None):
         """
         This class is a data wrapper into list structure to put in multiprocess queue and
@@ -498,12 +1981,78 @@ class QuickJoinableQueue(QuickQueue,
         :param size_bucket_list: None to enable sensor size bucket list (require maxsize>0). If a number is defined
                                  here then use this number to size_bucket_list and disable sensor. If maxsize<=0
                                  and size_bucket_list==None then size_bucket_list is default to 1000; other wise,
-                                 if maxsize<=0 and size_bucket_list is defined, then use this number. By default: None
+                                 if maxsize<=0 and size_bucket_list is defined, then use this number. 'auto' to load
+                                 the size bucket list calibrated in this machine with python -m quick_queue.calibrate
+                                 (if there is not calibration, sensor is enabled). By default: None
         :param min_size_bucket_list: (only if sensor is enabled) min size bucket list.
                                      Min == 1 and max == max_size_bucket_list - 1 (other wise, this raise a ValueError).
                                      By default: 10
         :param max_size_bucket_list: (only if sensor is enabled) max size bucket list. If None is infinite.
                                      By defatult: None
+        :param linger_ms: max milliseconds that the oldest data waits in the bucket list before the bucket list is put
+                          in queue although it is not full (a linger thread puts it if there are not more calls to put).
+                          If None is disabled. By default: None
+        :param target_bucket_bytes: if it is defined, the bucket list is put in queue when the estimated size in bytes
+                                    of its data reaches this number (or when it has more data than size_bucket_list if
+                                    it is defined); sensor is disabled. If None is disabled. By default: None
+        :param sensor: (only if sensor is enabled) 'qsize' to determinate the size bucket list by the number of buckets
+                       in queue (the original sensor) or 'throughput' to determinate it by the data put per second
+                       measured in this process (hill climbing with the time blocked in put). By default: 'qsize'
+        :param maxbytes: if it is defined, max estimated size in bytes of all buckets in queue (put blocks until
+                         consumers get buckets; one bucket bigger than maxbytes is put when queue has not bytes). It
+                         could be used with maxsize<=0 to limit queue only by bytes. If None is disabled.
+                         By default: None
+        :param transport: 'pipe' to transport buckets with the pipe of multiprocessing.queues.Queue or 'shm' to
+                          transport buckets with a ring buffer in shared memory (multiprocessing.shared_memory, Python
+                          3.8+). By default: 'pipe'
+        :param shm_size: (only if transport is 'shm') size in bytes of the ring buffer in shared memory (one serialized
+                         bucket must fit in it). By default: 16MB
+        :param oob_threshold: if it is defined, buckets are serialized with pickle protocol 5 and data of this number of
+                              bytes or more (bytes, bytearray, memoryview or objects with out-of-band buffers as NumPy
+                              arrays) are sent in shared memory segments (multiprocessing.shared_memory, Python 3.8+)
+                              instead of in the pickle. If None is disabled. By default: None
+        :param serializer: None to serialize buckets with pickle in the feeder thread of multiprocessing.queues.Queue;
+                           other wise, the whole bucket is serialized in the process that puts it with a built-in
+                           serializer ('pickle', 'pickle-highest' or 'marshal') or with a custom serializer (picklable
+                           object with methods dumps(bucket) -> bytes and loads(bytes) -> bucket). By default: None
+        :param compression: None to not compress; other wise, 'zlib' or 'lzma' to compress the buckets after
+                            serialization (if serializer is None, buckets are serialized with 'pickle').
+                            By default: None
+        :param compression_min_bytes: (only if compression is defined) min bytes of a bucket serialized to compress it
+                                      (smaller buckets are not compressed). By default: 16KB
+        :param prefetch: if it is defined, a background thread in each consumer process gets and deserializes up to this
+                         number of buckets in advance (deserialization overlaps with the processing of data got). Call
+                         close in the consumer to put back in queue the buckets prefetched and not got (if the process
+                         exits without close, they are lost). If None is disabled. By default: None
+        :param shared_sensor: (only if sensor is enabled) if True, the producer processes share the size bucket list:
+                              the first producer that puts a bucket runs the sensor (until it closes the queue, exits or
+                              does not put data for 1 second) and the others use the size bucket list determinated by
+                              it, then producers do not react at the same time to the same qsize. By default: False
+        :param warm_start: (only if sensor is enabled) if True, processes that receive the queue when they start (spawn
+                           or forkserver) begin with the size bucket list (and the max size bucket list) learned by the
+                           sensor of the process that starts them, instead of begin a new sensor from the beginning.
+                           By default: True
+        :param metrics: if True, each process counts data, buckets and bytes put and got, seconds blocked in put_bucket
+                        and get_bucket and decisions of sensor (see stats() and start_metrics_exporter()); if False
+                        there is not overhead. By default: False
+        :param latency_sample: if it is defined, fraction (0 < latency_sample <= 1) of buckets stamped with the time
+                               when their first data entered the bucket list and the time when they were put in queue;
+                               the processes that get them record the latencies in HDR-style histograms (see
+                               latency_histograms()). If None is disabled. By default: None
+        :param consumers: if it is defined, number of consumer processes: end() puts in queue one end-of-stream marker
+                          for each consumer (see put_end()). If None, end() does not put markers (call put_end() to put
+                          one marker for all consumers). By default: None
+        :param lanes: (only if transport is 'pipe') if it is greater than 1, number of pipes (lanes) that transport the
+                      buckets: producers put buckets in lanes by turns and each consumer gets from its home lane (and
+                      from other lanes when it is empty), then consumers do not serialize on one lock of readers. The
+                      order of buckets is only preserved in each lane. By default: None
+        :param spill_dir: (only if maxsize > 0) if it is defined, directory where each producer process appends (to
+                          segment files in local disk) the buckets that it can not put because queue is full, instead of
+                          block; a thread of the producer puts them in queue in the same order when there are free slots
+                          (close and put_end wait for it). An unbounded queue (maxsize <= 0) is never full, then it can
+                          not spill (it raises ValueError): RAM is bounded by maxsize. By default: None
+        :param spill_segment_bytes: (only if spill_dir is defined) bytes of a segment file before start a new one
+                                    (segments are deleted when all their buckets are put in queue). By default: 64MB
         :raise ValueError: if min_size_bucket_list is not: 1 < min_size_bucket_list <= max_size_bucket_list - 1
         """
         self._ctx = multiprocessing.get_context() if ctx is None else ctx
@@ -513,9 +2062,40 @@ class QuickJoinableQueue(QuickQueue,
                             min_size_bucket_list=min_size_bucket_list,
                             max_size_bucket_list=max_size_bucket_list,
                             logging_level=logging_level,
+                            linger_ms=linger_ms,
+                            target_bucket_bytes=target_bucket_bytes,
+                            sensor=sensor,
+                            maxbytes=maxbytes,
+                            transport=transport,
+                            shm_size=shm_size,
+                            oob_threshold=oob_threshold,
+                            serializer=serializer,
+                            compression=compression,
+                            compression_min_bytes=compression_min_bytes,
+                            prefetch=prefetch,
+                            shared_sensor=shared_sensor,
+                            warm_start=warm_start,
+                            metrics=metrics,
+                            latency_sample=latency_sample,
+                            consumers=consumers,
+                            lanes=lanes,
+                            spill_dir=spill_dir,
+                            spill_segment_bytes=spill_segment_bytes,
                             ctx=self._ctx)
         multiprocessing.queues.JoinableQueue.__init__(self, maxsize, ctx=self._ctx)
 
+        # Counter of unfinished tasks protected by _cond (instead of one release of semaphore for each data)
+        self._unfinished_count = self._ctx.Value('q', 0, lock=False)
+        self.len_bucket_got = 0
+
+    def __getstate__(self):
+        return super().__getstate__() + (self._unfinished_count,)
+
+    def __setstate__(self, state):
+        super().__setstate__(state[:-1])
+        self._unfinished_count = state[-1]
+        self.len_bucket_got = 0
+
     def put_bucket(self, bucket, block=True, timeout=None):
         """
         This put in queue a list of data
@@ -529,22 +2109,55 @@ class QuickJoinableQueue(QuickQueue,
         :return:
         """
 
-        if self._closed:
-            raise ValueError(f"Queue {self!r} is closed")
-        if not self._sem.acquire(block, timeout):
-            raise queue.Full
+        c = len(bucket)
+        with self._cond:
+            self._unfinished_count.value += c
+        try:
+            QuickQueue.put_bucket(self, bucket, block, timeout)
+        except BaseException:
+            with self._cond:
+                self._unfinished_count.value -= c
+            raise
+
+    def get_bucket(self, *args, **kwargs):
+        """
+        This get from queue a list of data
 
-        with self._notempty, self._cond:
-            if self._thread is None:
-                self._start_thread()
+        :param args: args to get queue method
+        :param kwargs: kwargs to get queue method
+        :return:
+        """
+        bucket = QuickQueue.get_bucket(self, *args, **kwargs)
+        self.len_bucket_got = len(bucket)
+        return bucket
 
-            c = len(bucket)
-            self._buffer.append(bucket)
+    def task_done(self, n=1):
+        """
+        Indicate that n formerly enqueued data are complete.
 
-            for _ in range(c):
-                self._unfinished_tasks.release()
+        :param n: number of data complete. By default: 1
+        :raise ValueError: if it is called more times than data were put in queue
+        :return:
+        """
+        with self._cond:
+            if self._unfinished_count.value < n:
+                raise ValueError('task_done() called too many times')
+            self._unfinished_count.value -= n
+            if self._unfinished_count.value == 0:
+                self._cond.notify_all()
+
+    def task_done_bucket(self):
+        """
+        Indicate that all data of the last bucket got with get_bucket (in this process) are complete.
 
-            self._notempty.notify()
+        :raise ValueError: if there is not a bucket got pending to mark as complete
+        :return:
+        """
+        if not self.len_bucket_got:
+            raise ValueError('task_done_bucket() called without a bucket got')
+        n = self.len_bucket_got
+        self.len_bucket_got = 0
+        self.task_done(n)
 
     def join(self):
         """
@@ -557,7 +2170,8 @@ class QuickJoinableQueue(QuickQueue,
         :return:
         """
         QuickQueue.put_remain(self)
-        multiprocessing.queues.JoinableQueue.join(self)
+        with self._cond:
+            self._cond.wait_for(lambda: self._unfinished_count.value == 0)
 
     def end(self):
         """
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import logging
+import time
+
+
+class ThroughputSensor(object):
+
+    def __init__(self,
+                 size_bucket_list=10,
+                 min_size_bucket_list=10,
+                 max_size_bucket_list=None,
+                 window=0.1,
+                 tolerance=0.05,
+                 block_ratio=0.5,
+                 clock=time.monotonic):
+        """
+        Sensor to determinate in realtime the size bucket list by the throughput (data put per second) measured in the
+        producer process.
+
+        Each window of time, it compares the throughput with the throughput of previous window (hill climbing): if it
+        improves, the size bucket list continues changing in the same direction; if it gets worse, the direction is
+        reversed and the step is halved (then it converges to the best size); if it is stable, the size is kept. The
+        first step doubles the size (then the best size is found quickly from min_size_bucket_list). If the producer
+        is blocked in put_bucket more than block_ratio of the window (queue is full, then consumers are slower than
+        producer), the size bucket list increases, because bigger buckets reduce the cost per data for consumers.
+
+        :param size_bucket_list: initial size bucket list. By default: 10
+        :param min_size_bucket_list: min size bucket list. By default: 10
+        :param max_size_bucket_list: max size bucket list. If None is 100000. By default: None
+        :param window: seconds of each measure of throughput. By default: 0.1
+        :param tolerance: relative change of throughput that is considered stable. By default: 0.05
+        :param block_ratio: ratio of window blocked in put_bucket to consider queue full. By default: 0.5
+        :param clock: function that returns the current time in seconds. By default: time.monotonic
+        """
+        self.min_size_bucket_list = min_size_bucket_list
+        self.max_size_bucket_list = max_size_bucket_list if max_size_bucket_list else 100000
+        self.size_bucket_list = min(max(size_bucket_list, self.min_size_bucket_list), self.max_size_bucket_list)
+
+        self.window = window
+        self.tolerance = tolerance
+        self.block_ratio = block_ratio
+        self.clock = clock
+
+        self.max_step = 2.0
+        self.min_step = 1.0 + tolerance
+        self.step = self.max_step
+        self.direction = 1
+
+        self.prev_throughput = None
+        self.start_window = None
+        self.items_window = 0
+        self.blocked_window = 0.0
+
+    def update(self, items, blocked):
+        """
+        Add a bucket put in queue to the measure of current window and return the size bucket list to use.
+
+        :param items: number of data of bucket put
+        :param blocked: seconds blocked in put_bucket
+        :return: new size bucket list
+        """
+        now = self.clock()
+        if self.start_window is None:
+            # The data of first bucket were put before the start of measure
+            self.start_window = now
+            return self.size_bucket_list
+
+        self.items_window += items
+        self.blocked_window += blocked
+        elapsed = now - self.start_window
+        if elapsed < self.window:
+            return self.size_bucket_list
+
+        self._decide(self.items_window / elapsed, self.blocked_window / elapsed)
+
+        self.start_window = now
+        self.items_window = 0
+        self.blocked_window = 0.0
+        return self.size_bucket_list
+
+    def _decide(self, throughput, blocked):
+        """
+        Helper function to change the size bucket list with the measure of a window.
+
+        :param throughput: data put per second in window
+        :param blocked: ratio of window blocked in put_bucket
+        :return:
+        """
+        prev = self.prev_throughput
+        self.prev_throughput = throughput
+
+        if blocked >= self.block_ratio:
+            self.direction = 1
+        elif prev is None or throughput > prev * (1.0 + self.tolerance):
+            pass
+        elif throughput < prev * (1.0 - self.tolerance):
+            self.direction = -self.direction
+            self.step = max(1.0 + (self.step - 1.0) / 2, self.min_step)
+        else:
+            logging.debug("[QQUEUE - THROUGHPUT SENSOR STABLE]: throughput={:.0f} | "
+                          "size_bucket_list={}".format(throughput, self.size_bucket_list))
+            return
+
+        if self.direction > 0:
+            size_bucket_list = max(int(self.size_bucket_list * self.step), self.size_bucket_list + 1)
+        else:
+            size_bucket_list = int(self.size_bucket_list / self.step)
+        size_bucket_list = min(max(size_bucket_list, self.min_size_bucket_list), self.max_size_bucket_list)
+
+        if size_bucket_list == self.size_bucket_list:
+            # Limit reached, then next change goes in the other direction
+            self.direction = -self.direction
+        self.size_bucket_list = size_bucket_list
+
+        logging.debug("[QQUEUE - THROUGHPUT SENSOR]: throughput={:.0f} | blocked={:.2f} | "
+                      "size_bucket_list={}".format(throughput, blocked, self.size_bucket_list))
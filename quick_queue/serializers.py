@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import functools
+import marshal
+import pickle
+import zlib
+
+try:
+    import lzma
+except ImportError:
+    # Python built without lzma
+    lzma = None
+
+
+class PickleSerializer(object):
+
+    def __init__(self, protocol=None):
+        """
+        Serializer of buckets with pickle.
+
+        :param protocol: pickle protocol. If None is pickle.DEFAULT_PROTOCOL. By default: None
+        """
+        self.protocol = protocol
+
+    def dumps(self, bucket):
+        """
+        Serialize a bucket
+
+        :param bucket: list of individual data
+        :return: bytes
+        """
+        return pickle.dumps(bucket, self.protocol)
+
+    def loads(self, data):
+        """
+        Deserialize a bucket
+
+        :param data: bytes
+        :return: list of individual data
+        """
+        return pickle.loads(data)
+
+
+class MarshalSerializer(object):
+    """
+    Serializer of buckets with marshal (only for data of Python core types: int, float, str, bytes, tuple, list, dict,
+    set...). It is quicker than pickle with this data.
+    """
+
+    def dumps(self, bucket):
+        """
+        Serialize a bucket
+
+        :param bucket: list of individual data
+        :return: bytes
+        """
+        return marshal.dumps(bucket)
+
+    def loads(self, data):
+        """
+        Deserialize a bucket
+
+        :param data: bytes
+        :return: list of individual data
+        """
+        return marshal.loads(data)
+
+
+class CompressedSerializer(object):
+
+    def __init__(self, serializer, compression, min_bytes=16 * 1024):
+        """
+        Serializer that compresses the buckets serialized by other serializer if they have min_bytes or more (the first
+        byte of data indicates if the rest is compressed).
+
+        :param serializer: serializer object of buckets (dumps must return bytes). If None is PickleSerializer
+        :param compression: name of compression ('zlib' or 'lzma')
+        :param min_bytes: min bytes of bucket serialized to compress it. By default: 16KB
+        :raise ValueError: if compression is not 'zlib' or 'lzma'
+        """
+        try:
+            self._compress, self._decompress = COMPRESSIONS[compression]
+        except KeyError:
+            raise ValueError("compression={} but names permitted: {}".format(compression, ", ".join(COMPRESSIONS)))
+        self.serializer = SERIALIZERS["pickle"] if serializer is None else serializer
+        self.compression = compression
+        self.min_bytes = min_bytes
+
+    def dumps(self, bucket):
+        """
+        Serialize and compress a bucket
+
+        :param bucket: list of individual data
+        :return: bytes
+        """
+        data = self.serializer.dumps(bucket)
+        if len(data) >= self.min_bytes:
+            return b"\x01" + self._compress(data)
+        return b"\x00" + data
+
+    def loads(self, data):
+        """
+        Decompress and deserialize a bucket
+
+        :param data: bytes
+        :return: list of individual data
+        """
+        if data[0]:
+            return self.serializer.loads(self._decompress(memoryview(data)[1:]))
+        return self.serializer.loads(data[1:])
+
+
+# Built-in compressions (compress function, decompress function), with fast levels to not slow down the producer
+COMPRESSIONS = {"zlib": (functools.partial(zlib.compress, level=1), zlib.decompress)}
+if lzma is not None:
+    COMPRESSIONS["lzma"] = (functools.partial(lzma.compress, preset=0), lzma.decompress)
+
+SERIALIZERS = {"pickle": PickleSerializer(),
+               "pickle-highest": PickleSerializer(pickle.HIGHEST_PROTOCOL),
+               "marshal": MarshalSerializer()}
+
+
+def get_serializer(serializer):
+    """
+    This return the serializer object for a serializer name or object.
+
+    A custom serializer is any object with methods dumps(bucket) -> bytes and loads(bytes) -> bucket (and optionally
+    release(serialized) to free resources of a serialized bucket that will not be got). It must be picklable to be used
+    in other processes.
+
+    :param serializer: None, name of a built-in serializer ('pickle', 'pickle-highest' or 'marshal') or custom
+                       serializer object
+    :raise ValueError: if serializer is not a name of a built-in serializer or an object with dumps and loads
+    :return: serializer object or None
+    """
+    if serializer is None:
+        return None
+    elif isinstance(serializer, str):
+        try:
+            return SERIALIZERS[serializer]
+        except KeyError:
+            raise ValueError("serializer={} but names permitted: {}".format(serializer, ", ".join(SERIALIZERS)))
+    elif hasattr(serializer, "dumps") and hasattr(serializer, "loads"):
+        return serializer
+    raise ValueError("serializer={} has not dumps and loads methods".format(serializer))
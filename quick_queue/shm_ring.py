@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import multiprocessing.context
+import os
+import struct
+import weakref
+from multiprocessing import shared_memory
+from multiprocessing.reduction import ForkingPickler
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+
+# Header of ring: write offset, read offset, number of records
+_HEADER = struct.Struct("=qqq")
+# Header of record: size of record (_WRAP if the rest of the ring is empty and next record is in offset 0)
+_RECORD = struct.Struct("=q")
+_WRAP = -1
+
+
+def _unlink(shm, owner_pid):
+    """
+    Release the shared memory segment (only in the process that created it).
+
+    :param shm: SharedMemory of ring
+    :param owner_pid: pid of process that created the shared memory segment
+    :return:
+    """
+    if os.getpid() == owner_pid:
+        try:
+            shm.close()
+            shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+
+class SharedMemoryRing(object):
+
+    def __init__(self, capacity, maxsize=0, ctx=None):
+        """
+        Bounded ring buffer of serialized buckets in shared memory (multiprocessing.shared_memory) to transport
+        buckets between processes without the feeder thread and the pipe of multiprocessing.queues.Queue.
+
+        Each bucket is serialized with ForkingPickler and copied to the ring with a header with its size; producers
+        and consumers are synchronized with one lock and two conditions (not empty and not full).
+
+        :param capacity: size in bytes of ring
+        :param maxsize: max number of buckets in ring. If maxsize<=0 then it is only limited by capacity. By default: 0
+        :param ctx: multiprocessing context
+        """
+        ctx = multiprocessing.get_context() if ctx is None else ctx
+        self.capacity = capacity
+        self.maxsize = maxsize if maxsize and maxsize > 0 else 0
+
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + capacity)
+        _HEADER.pack_into(self._shm.buf, 0, 0, 0, 0)
+
+        self._lock = ctx.Lock()
+        self._not_empty = ctx.Condition(self._lock)
+        self._not_full = ctx.Condition(self._lock)
+
+        weakref.finalize(self, _unlink, self._shm, os.getpid())
+
+    def __getstate__(self):
+        multiprocessing.context.assert_spawning(self)
+        return self.capacity, self.maxsize, self._shm.name, self._lock, self._not_empty, self._not_full
+
+    def __setstate__(self, state):
+        self.capacity, self.maxsize, name, self._lock, self._not_empty, self._not_full = state
+        self._shm = shared_memory.SharedMemory(name=name)
+
+    def _reserve(self, need):
+        """
+        Helper function to find the offset in ring to write a record (it must be called with lock).
+
+        :param need: size in bytes of record with its header
+        :return: offset to write the record or None if it does not fit now
+        """
+        w, r, count = _HEADER.unpack_from(self._shm.buf, 0)
+        if self.maxsize and count >= self.maxsize:
+            return None
+
+        if count == 0:
+            return 0
+        elif w > r:
+            if self.capacity - w >= need:
+                return w
+            elif r >= need:
+                if self.capacity - w >= _RECORD.size:
+                    _RECORD.pack_into(self._shm.buf, _HEADER.size + w, _WRAP)
+                return 0
+        elif r - w >= need:
+            return w
+        return None
+
+    def put(self, obj, block=True, timeout=None):
+        """
+        This serialize and put in ring one object
+
+        :param obj: object to put (usually a bucket)
+        :param block: block until there is space in ring
+        :param timeout: max seconds to wait (raise the Full exception)
+        :raise ValueError: if the serialized object is bigger than the capacity of ring
+        :return:
+        """
+        data = ForkingPickler.dumps(obj)
+        size = len(data)
+        need = _RECORD.size + size
+        if need > self.capacity:
+            raise ValueError("Serialized bucket of {} bytes does not fit in shared memory ring of {} bytes".format(
+                size, self.capacity))
+
+        with self._not_full:
+            offset = self._reserve(need)
+            if offset is None:
+                if not block:
+                    raise queue.Full
+                if not self._not_full.wait_for(lambda: self._reserve(need) is not None, timeout):
+                    raise queue.Full
+                offset = self._reserve(need)
+
+            buf = self._shm.buf
+            _RECORD.pack_into(buf, _HEADER.size + offset, size)
+            start = _HEADER.size + offset + _RECORD.size
+            buf[start:start + size] = data
+
+            __, r, count = _HEADER.unpack_from(buf, 0)
+            _HEADER.pack_into(buf, 0, offset + need, r if count else 0, count + 1)
+            self._not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        """
+        This get from ring one object and deserialize it
+
+        :param block: block until there is one object in ring
+        :param timeout: max seconds to wait (raise the Empty exception)
+        :return: object got (usually a bucket)
+        """
+        with self._not_empty:
+            if not self._not_empty.wait_for(self.qsize, timeout if block else 0):
+                raise queue.Empty
+
+            buf = self._shm.buf
+            w, r, count = _HEADER.unpack_from(buf, 0)
+            if self.capacity - r < _RECORD.size:
+                r = 0
+            size, = _RECORD.unpack_from(buf, _HEADER.size + r)
+            if size == _WRAP:
+                r = 0
+                size, = _RECORD.unpack_from(buf, _HEADER.size)
+
+            start = _HEADER.size + r + _RECORD.size
+            data = bytes(buf[start:start + size])
+
+            count -= 1
+            if count:
+                _HEADER.pack_into(buf, 0, w, r + _RECORD.size + size, count)
+            else:
+                _HEADER.pack_into(buf, 0, 0, 0, 0)
+            self._not_full.notify_all()
+
+        return ForkingPickler.loads(data)
+
+    def qsize(self):
+        """
+        This return the number of objects in ring
+
+        :return: number of objects
+        """
+        return _HEADER.unpack_from(self._shm.buf, 0)[2]
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import bisect
+import collections
+import csv
+import logging
+import random
+import sys
+
+from quick_queue.quick_queue import QuickQueue
+
+"""
+Deterministic simulation of the sensors of size bucket list (without processes, pipes or real time).
+
+One producer and one consumer are modelled with a trace of rates (data per second that each one can generate or
+process without the cost of queue) and a fixed cost for each bucket (put_cost in producer and get_cost in consumer);
+the queue is bounded by maxsize buckets. The sensor is the real code of QuickQueue (or ThroughputSensor), driven with
+the simulated qsize and clock, then the size bucket list chosen in each moment and the modelled throughput (data got
+per second) can be evaluated or tuned without run processes.
+
+Execute this module to see in console the simulation of a trace (a step trace or a recorded trace in a CSV file with
+rows: time,producer_rate,consumer_rate):
+    python -m quick_queue.simulation [trace.csv] [qsize|throughput]
+"""
+
+TracePoint = collections.namedtuple("TracePoint", ["time", "producer_rate", "consumer_rate"])
+Sample = collections.namedtuple("Sample", ["time", "size_bucket_list", "qsize", "throughput"])
+
+
+class Trace(object):
+
+    def __init__(self, points, duration):
+        """
+        Trace of rates of producer and consumer. Rates are constant from the time of each point until the next point.
+
+        :param points: iterable of TracePoint (or tuples (time, producer_rate, consumer_rate)) sorted by time
+        :param duration: seconds of trace
+        :raise ValueError: if there are not points or the first point is not in time 0
+        """
+        self.points = [TracePoint(*point) for point in points]
+        if not self.points or self.points[0].time != 0:
+            raise ValueError("trace must have a first point in time 0")
+        self.times = [point.time for point in self.points]
+        self.duration = duration
+
+    def rates(self, t):
+        """
+        This return the rates in a time.
+
+        :param t: time in seconds
+        :return: TracePoint with the rates in that time
+        """
+        return self.points[bisect.bisect_right(self.times, t) - 1]
+
+
+def step_trace(duration, before, after, at):
+    """
+    This return a trace with a step change of rates.
+
+    :param duration: seconds of trace
+    :param before: tuple (producer_rate, consumer_rate) before the step
+    :param after: tuple (producer_rate, consumer_rate) after the step
+    :param at: time of step in seconds
+    :return: Trace
+    """
+    return Trace([(0, ) + tuple(before), (at, ) + tuple(after)], duration)
+
+
+def ramp_trace(duration, start, end, steps=100):
+    """
+    This return a trace with a linear change of rates from start to end (in steps).
+
+    :param duration: seconds of trace
+    :param start: tuple (producer_rate, consumer_rate) in time 0
+    :param end: tuple (producer_rate, consumer_rate) in the end of trace
+    :param steps: number of changes of rates. By default: 100
+    :return: Trace
+    """
+    points = list()
+    for i in range(steps):
+        f = i / float(steps - 1) if steps > 1 else 1.0
+        points.append((duration * i / float(steps),
+                       start[0] + (end[0] - start[0]) * f,
+                       start[1] + (end[1] - start[1]) * f))
+    return Trace(points, duration)
+
+
+def bursty_trace(duration, base, burst, period=1.0, burst_ratio=0.2, seed=0):
+    """
+    This return a trace with bursts of producer: each period, the producer rate is burst a random fraction of time
+    (around burst_ratio) and base the rest of time.
+
+    :param duration: seconds of trace
+    :param base: tuple (producer_rate, consumer_rate) out of bursts
+    :param burst: tuple (producer_rate, consumer_rate) in bursts
+    :param period: seconds of each period with one burst. By default: 1.0
+    :param burst_ratio: mean fraction of period in burst. By default: 0.2
+    :param seed: seed of random generator (the same seed returns the same trace). By default: 0
+    :return: Trace
+    """
+    rnd = random.Random(seed)
+    points = list()
+    t = 0.0
+    while t < duration:
+        length = period * min(max(rnd.gauss(burst_ratio, burst_ratio / 4), 0.0), 1.0)
+        start = t + rnd.uniform(0, period - length)
+        points.append((t, ) + tuple(base))
+        points.append((start, ) + tuple(burst))
+        points.append((start + length, ) + tuple(base))
+        t += period
+    return Trace(points, duration)
+
+
+def load_trace(path):
+    """
+    This return a trace recorded in a CSV file with rows: time,producer_rate,consumer_rate (a first row with other
+    values is a header). The duration is the time of last row.
+
+    :param path: path of CSV file
+    :return: Trace
+    """
+    points = list()
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            try:
+                points.append(tuple(float(v) for v in row[:3]))
+            except ValueError:
+                if points:
+                    raise
+    return Trace(points, points[-1][0])
+
+
+class _SimulatedQueue(QuickQueue):
+    """
+    QuickQueue without transport to run its sensor with the qsize and the clock of a simulation.
+    """
+
+    def __init__(self, simulation, **init_args):
+        self.simulation = simulation
+        self.shared_sensor = None
+        self.metrics = None
+        self.init(**init_args)
+        if self.throughput_sensor is not None:
+            self.throughput_sensor.clock = simulation.clock
+
+    def qsize(self):
+        return len(self.simulation.queue)
+
+
+class _Simulation(object):
+
+    def __init__(self):
+        self.now = 0.0
+        self.queue = collections.deque()
+
+    def clock(self):
+        return self.now
+
+
+def simulate(trace,
+             sensor="qsize",
+             maxsize=1000,
+             size_bucket_list=None,
+             min_size_bucket_list=10,
+             max_size_bucket_list=None,
+             put_cost=50e-6,
+             get_cost=50e-6,
+             sample=0.1):
+    """
+    Simulate one producer and one consumer of a QuickQueue with a trace of rates.
+
+    >>> samples = simulate(step_trace(1.0, (100000, 100000), (100000, 50000), 0.5))
+    >>> samples[-1].time
+    1.0
+
+    :param trace: Trace of rates
+    :param sensor: 'qsize' or 'throughput' (see QQueue). By default: 'qsize'
+    :param maxsize: maxsize of buckets in queue. By default: 1000
+    :param size_bucket_list: None to enable sensor; other wise, fixed size bucket list. By default: None
+    :param min_size_bucket_list: min size bucket list. By default: 10
+    :param max_size_bucket_list: max size bucket list. By default: None
+    :param put_cost: seconds that producer spends to put one bucket. By default: 50us
+    :param get_cost: seconds that consumer spends to get one bucket. By default: 50us
+    :param sample: seconds between samples. By default: 0.1
+    :return: list of Sample (time, size bucket list, qsize and data got per second in the last sample)
+    """
+    sim = _Simulation()
+    qq = _SimulatedQueue(sim,
+                         maxsize=maxsize,
+                         size_bucket_list=size_bucket_list,
+                         min_size_bucket_list=min_size_bucket_list,
+                         max_size_bucket_list=max_size_bucket_list,
+                         logging_level=logging.getLogger().level,
+                         sensor=sensor)
+
+    # Consumer: time when it finishes the current bucket and buckets finished (time, data) not sampled yet
+    free_consumer = 0.0
+    finished = collections.deque()
+
+    def consumer_take():
+        nonlocal free_consumer
+        enqueued, n = sim.queue.popleft()
+        start = max(free_consumer, enqueued)
+        free_consumer = start + get_cost + n / float(trace.rates(start).consumer_rate)
+        finished.append((free_consumer, n))
+        return start
+
+    samples = list()
+    next_sample = sample
+    got = 0
+    t = 0.0
+    while t < trace.duration:
+        n = qq.size_bucket_list + 1
+        ready = t + n / float(trace.rates(t).producer_rate) + put_cost
+
+        # Consumer takes the buckets that it can start until the producer is ready to put
+        while sim.queue and max(free_consumer, sim.queue[0][0]) <= ready:
+            consumer_take()
+        # Queue is full: the producer is blocked until the consumer takes a bucket
+        put_time = ready
+        while len(sim.queue) >= maxsize > 0:
+            put_time = max(ready, consumer_take())
+
+        sim.queue.append((put_time, n))
+        sim.now = put_time
+        t = put_time
+
+        qq.len_bucket_put = n
+        qq.time_bucket_put = put_time - ready + put_cost
+        if qq.enable_sensor:
+            qq._sensor_size_list()
+
+        while t >= next_sample and next_sample <= trace.duration:
+            while finished and finished[0][0] <= next_sample:
+                got += finished.popleft()[1]
+            samples.append(Sample(round(next_sample, 9), qq.size_bucket_list, len(sim.queue), got / sample))
+            got = 0
+            next_sample += sample
+
+    return samples
+
+
+def optimal_throughput(producer_rate, consumer_rate, size_bucket_list, put_cost=50e-6, get_cost=50e-6):
+    """
+    This return the modelled throughput (data got per second) with constant rates and a fixed size bucket list.
+
+    :param producer_rate: data per second that producer can generate
+    :param consumer_rate: data per second that consumer can process
+    :param size_bucket_list: size bucket list
+    :param put_cost: seconds that producer spends to put one bucket. By default: 50us
+    :param get_cost: seconds that consumer spends to get one bucket. By default: 50us
+    :return: data per second
+    """
+    n = size_bucket_list + 1
+    return min(n / (n / float(producer_rate) + put_cost), n / (n / float(consumer_rate) + get_cost))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1].endswith(".csv"):
+        trace = load_trace(sys.argv[1])
+    else:
+        trace = step_trace(20.0, (200000, 100000), (200000, 50000), 10.0)
+    sensor = sys.argv[-1] if sys.argv[-1] in ("qsize", "throughput") else "qsize"
+
+    print("{:>8} | {:>16} | {:>6} | {:>12}".format("time", "size_bucket_list", "qsize", "throughput"))
+    for s in simulate(trace, sensor=sensor):
+        print("{:>8.2f} | {:>16} | {:>6} | {:>12.0f}".format(s.time, s.size_bucket_list, s.qsize, s.throughput))
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import collections
+import itertools
+import mmap
+import os
+import struct
+import threading
+from multiprocessing.reduction import ForkingPickler
+
+
+# Header of record: size of record
+_RECORD = struct.Struct("=q")
+
+# Number of spill files created in this process (to name their segments)
+_spill_files = itertools.count()
+
+
+class SpillFile(object):
+
+    def __init__(self, directory, segment_bytes):
+        """
+        Append-only file in local disk of the buckets that a producer process could not put in queue because it was
+        full (see spill_dir of QQueue), to put them later in the same order.
+
+        Buckets are serialized with ForkingPickler (like the pipe of multiprocessing.queues.Queue) and appended with a
+        header with their size to segment files of about segment_bytes. Segments are read with mmap and each segment is
+        deleted when all its buckets were put in queue (all segments are deleted when the spill file is empty).
+
+        All methods are thread safe (the producer appends and the spill thread of the queue reads).
+
+        :param directory: directory of segment files (it is created if it not exists)
+        :param segment_bytes: bytes of a segment before start a new one
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.prefix = "quick_queue-{}-{}".format(os.getpid(), next(_spill_files))
+        self.cond = threading.Condition()
+
+        # Segments not read completely (the last one is the segment where buckets are appended)
+        self.segments = collections.deque()
+        self.count_segments = 0
+        self.writer = None
+        self.written = 0
+
+        # Read position in the first segment (mapped in memory) and end of the bucket returned by peek
+        self.map = None
+        self.offset = 0
+        self.next_offset = None
+
+        # Buckets appended and not put in queue yet and their bytes
+        self.pending = 0
+        self.pending_bytes = 0
+
+    def append(self, obj):
+        """
+        This append an object (usually a bucket) to the end of spill file.
+
+        :param obj: object to append
+        :return:
+        """
+        data = ForkingPickler.dumps(obj)
+        with self.cond:
+            if self.writer is None or self.written >= self.segment_bytes:
+                self._new_segment()
+            self.writer.write(_RECORD.pack(len(data)))
+            self.writer.write(data)
+            # Flush to be read by mmap
+            self.writer.flush()
+            self.written += _RECORD.size + len(data)
+            self.pending += 1
+            self.pending_bytes += len(data)
+            self.cond.notify_all()
+
+    def _new_segment(self):
+        """
+        Helper function to start a new segment where buckets are appended.
+        :return:
+        """
+        if self.writer is not None:
+            self.writer.close()
+        path = os.path.join(self.directory, "{}-{:06d}.seg".format(self.prefix, self.count_segments))
+        self.count_segments += 1
+        self.writer = open(path, "wb")
+        self.written = 0
+        self.segments.append(path)
+
+    def peek(self):
+        """
+        This return the first object not put in queue yet (call commit when it is put).
+
+        :return: object or None if the spill file is empty
+        """
+        with self.cond:
+            while self.pending:
+                if self.map is not None and self.offset + _RECORD.size <= len(self.map):
+                    size, = _RECORD.unpack_from(self.map, self.offset)
+                    start = self.offset + _RECORD.size
+                    if start + size <= len(self.map):
+                        self.next_offset = start + size
+                        return ForkingPickler.loads(self.map[start:start + size])
+
+                path = self.segments[0]
+                if self.map is not None:
+                    self.map.close()
+                    self.map = None
+                if self.offset >= os.path.getsize(path) and len(self.segments) > 1:
+                    # The first segment was read completely and buckets are appended in other segment
+                    os.remove(path)
+                    self.segments.popleft()
+                    self.offset = 0
+                    continue
+                # Map the segment again (buckets were appended after it was mapped)
+                with open(path, "rb") as f:
+                    self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def commit(self):
+        """
+        This mark the object returned by peek as put in queue.
+        :return:
+        """
+        with self.cond:
+            if self.next_offset is None:
+                # The spill file was closed
+                return
+            self.pending_bytes -= self.next_offset - self.offset - _RECORD.size
+            self.offset = self.next_offset
+            self.next_offset = None
+            self.pending -= 1
+            if not self.pending:
+                self._clear()
+            self.cond.notify_all()
+
+    def wait_empty(self, timeout=None):
+        """
+        This wait until all objects are put in queue.
+
+        :param timeout: max seconds to wait. None to wait until it is empty. By default: None
+        :return: True if it is empty
+        """
+        with self.cond:
+            return self.cond.wait_for(lambda: not self.pending, timeout)
+
+    def _clear(self):
+        """
+        Helper function to delete all segments (the spill file is empty).
+        :return:
+        """
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        for path in self.segments:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        self.segments.clear()
+        self.offset = 0
+        self.written = 0
+
+    def close(self):
+        """
+        This delete the segments (objects not put in queue are lost).
+        :return:
+        """
+        with self.cond:
+            self._clear()
+            self.pending = 0
+            self.pending_bytes = 0
+            self.cond.notify_all()
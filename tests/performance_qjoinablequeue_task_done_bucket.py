@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import multiprocessing.queues
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+
+"""
+Execute this script to see result in console
+
+Compare in your system the performance of QuickJoinableQueue marking as done each data (task_done) and marking as done
+each bucket (task_done_bucket) with QuickQueue (without task accounting)
+
+:param count_elements: generate more elements to test in a range method
+"""
+count_elements = 1000000
+
+
+def _process_qq(qq):
+    for _ in range(1, count_elements):
+        __ = qq.get()
+
+
+def _process_task_done(qjq):
+    for _ in range(1, count_elements):
+        __ = qjq.get()
+        qjq.task_done()
+
+
+def _process_task_done_bucket(qjq):
+    count = 1
+    while count < count_elements:
+        bucket = qjq.get_bucket()
+        for __ in bucket:
+            pass
+        qjq.task_done_bucket()
+        count += len(bucket)
+
+
+def _velocity_test(name, q_qjq, target):
+    print("========================= VELOCITY TEST {} =========================".format(name))
+
+    start = datetime.now()
+    print("[ROOT START]: {}".format(start))
+
+    p = multiprocessing.Process(target=target, args=(q_qjq,))
+    p.start()
+
+    for num in range(1, count_elements):
+        q_qjq.put(num)
+
+    if isinstance(q_qjq, multiprocessing.queues.JoinableQueue):
+        q_qjq.join()
+    else:
+        q_qjq.put_remain()
+
+    p.join()
+    q_qjq.close()
+
+    finish = datetime.now()
+    diff = finish - start
+    print("[ROOT END] finish: {} | diff finish-start: {}".format(finish, diff))
+    return diff
+
+
+if __name__ == "__main__":
+    diff1 = _velocity_test("QUICK QUEUE", QQueue(1000), _process_qq)
+    diff2 = _velocity_test("QUICK JOINABLE QUEUE (task_done)", QJoinableQueue(1000), _process_task_done)
+    diff3 = _velocity_test("QUICK JOINABLE QUEUE (task_done_bucket)", QJoinableQueue(1000), _process_task_done_bucket)
+
+    print("")
+    print("[ROOT COMPARE] diff QuickQueue: {} | diff QuickJoinableQueue task_done: {} | "
+          "diff QuickJoinableQueue task_done_bucket: {}".format(diff1, diff2, diff3))
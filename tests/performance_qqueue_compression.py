@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import itertools
+import multiprocessing
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Compare in your system the performance of QuickQueue without compression vs with each compression, with the text data
+of test_queue_complex.py. It shows the size in bytes of one bucket serialized too.
+
+:param iterable_with_data: text data to repeat
+:param times_repeat: times to repeat iterable_with_data
+:param compressions: compressions to test
+"""
+iterable_with_data = [
+    "key3|value3",
+    "key1|value1",
+    "key2|value2"
+]
+times_repeat = 300000
+compressions = [None, "zlib", "lzma"]
+count_elements = len(iterable_with_data) * times_repeat
+
+
+def _process(qq):
+    for _ in range(count_elements):
+        __ = qq.get()
+
+
+def _velocity_test(compression):
+    start = datetime.now()
+    qq = QQueue(1000, size_bucket_list=1000, serializer="pickle", compression=compression)
+
+    p = multiprocessing.Process(target=_process, args=(qq,))
+    p.start()
+    for n, value in enumerate(itertools.chain(*itertools.repeat(iterable_with_data, times=times_repeat)), 1):
+        qq.put("[{}]: {}".format(n, value))
+    qq.end()
+
+    p.join()
+
+    finish = datetime.now()
+    diff = finish - start
+
+    bucket = ["[{}]: {}".format(n, value) for n, value in enumerate(iterable_with_data * 334, 1)]
+    size_bucket = len(qq.serializer.dumps(bucket))
+    print("[compression={}] diff finish-start: {} | bytes of one bucket: {}".format(compression, diff, size_bucket))
+    return diff, size_bucket
+
+
+if __name__ == "__main__":
+
+    print("========================= VELOCITY TEST COMPRESSION =========================")
+
+    results = [(compression, _velocity_test(compression)) for compression in compressions]
+
+    print("")
+    print("[ROOT COMPARE] {}".format(" | ".join("diff {}: {} ({} bytes per bucket)".format(compression, diff, size)
+                                              for compression, (diff, size) in results)))
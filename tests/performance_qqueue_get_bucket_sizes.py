@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Measure in your system the cost to get one element from QuickQueue with different sizes of bucket list (the sensor is
+disabled to fix the size of bucket list). The time per element should be flat whatever the size of bucket list.
+
+:param count_elements: generate more elements to test in a range method
+:param sizes_bucket_list: sizes of bucket list to test
+"""
+count_elements = 1000000
+sizes_bucket_list = [10, 100, 1000, 10000, 100000]
+
+
+def _process(qq):
+    for num in range(count_elements):
+        qq.put(num)
+    qq.end()
+
+
+if __name__ == "__main__":
+
+    print("========================= GET LATENCY BY SIZE OF BUCKET LIST =========================")
+
+    results = []
+    for size_bucket_list in sizes_bucket_list:
+        qq = QQueue(1000, size_bucket_list=size_bucket_list)
+
+        p = multiprocessing.Process(target=_process, args=(qq,))
+        p.start()
+
+        # Wait the first bucket to not measure the process start
+        qq.get()
+
+        start = datetime.now()
+        for _ in range(1, count_elements):
+            __ = qq.get()
+        finish = datetime.now()
+
+        p.join()
+        qq.close()
+
+        diff = finish - start
+        ns_per_element = diff.total_seconds() * 1e9 / (count_elements - 1)
+        results.append((size_bucket_list, diff, ns_per_element))
+        print("[SIZE BUCKET LIST {}] diff finish-start: {} | "
+              "ns per element: {:.1f}".format(size_bucket_list, diff, ns_per_element))
+
+    print("")
+    for size_bucket_list, diff, ns_per_element in results:
+        print("[ROOT COMPARE] size_bucket_list: {:>7} | diff: {} | ns per element: {:.1f}".format(size_bucket_list,
+                                                                                                  diff,
+                                                                                                  ns_per_element))
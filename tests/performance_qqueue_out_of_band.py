@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Compare in your system the performance of QuickQueue putting big binary data in the pickle (by default) vs with
+out-of-band buffers in shared memory (oob_threshold)
+
+:param count_elements: number of binary data to put
+:param size_element: size in bytes of each binary data
+"""
+count_elements = 2000
+size_element = 1024 * 1024
+
+
+def _process(qq):
+    for _ in range(count_elements):
+        __ = qq.get()
+
+
+def _velocity_test(oob_threshold):
+    start = datetime.now()
+    qq = QQueue(100, size_bucket_list=10, oob_threshold=oob_threshold)
+
+    p = multiprocessing.Process(target=_process, args=(qq,))
+    p.start()
+    for _ in range(count_elements):
+        qq.put(bytearray(size_element))
+    qq.end()
+
+    p.join()
+
+    finish = datetime.now()
+    diff = finish - start
+    print("[oob_threshold={}] diff finish-start: {}".format(oob_threshold, diff))
+    return diff
+
+
+if __name__ == "__main__":
+
+    print("========================= VELOCITY TEST OUT-OF-BAND BUFFERS =========================")
+
+    diff1 = _velocity_test(None)
+    diff2 = _velocity_test(64 * 1024)
+
+    print("")
+    print("[ROOT COMPARE] diff in pickle: {} | diff out-of-band: {}".format(diff1, diff2))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Measure in your system the time of one consumer that waits I/O to process data (simulated with a sleep for each
+bucket of data) with and without prefetch of buckets. With prefetch the deserialization of next buckets is done while
+the consumer waits I/O.
+
+:param count_elements: generate more elements to test in a range method
+:param size_bucket_list: size of bucket list (fixed)
+:param io_wait: seconds that consumer waits I/O for each size_bucket_list data
+:param prefetches: values of prefetch to test (None is disabled)
+"""
+count_elements = 500000
+size_bucket_list = 1000
+io_wait = 0.002
+prefetches = [None, 1, 2, 8]
+
+
+def _value(num):
+    return {"id": num, "name": "element {}".format(num), "values": [num, num * 2.0, str(num)]}
+
+
+def _process(qq):
+    for num in range(count_elements):
+        qq.put(_value(num))
+    qq.end()
+
+
+if __name__ == "__main__":
+
+    print("========================= CONSUMER WITH I/O WAIT BY PREFETCH =========================")
+
+    results = []
+    for prefetch in prefetches:
+        qq = QQueue(1000, size_bucket_list=size_bucket_list, serializer="pickle", prefetch=prefetch)
+
+        p = multiprocessing.Process(target=_process, args=(qq,))
+        p.start()
+
+        start = datetime.now()
+        for num in range(count_elements):
+            __ = qq.get()
+            if num % size_bucket_list == 0:
+                time.sleep(io_wait)
+        finish = datetime.now()
+
+        p.join()
+        qq.close()
+
+        diff = finish - start
+        results.append((prefetch, diff))
+        print("[PREFETCH {}] diff finish-start: {}".format(prefetch, diff))
+
+    print("")
+    for prefetch, diff in results:
+        print("[ROOT COMPARE] prefetch: {:>4} | diff: {}".format(str(prefetch), diff))
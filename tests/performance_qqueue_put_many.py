@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Measure in your system the time to put a list of elements in QuickQueue calling to put for each element, to
+put_iterable and to put_many (the consumer gets bucket lists to not measure the get of each element).
+
+:param count_elements: generate more elements to test in a range method
+"""
+count_elements = 1000000
+
+
+def _process(qq, count):
+    got = 0
+    while got < count:
+        got += len(qq.get_bucket())
+
+
+def _put(qq, data):
+    for v in data:
+        qq.put(v)
+    qq.put_remain()
+
+
+def _put_iterable(qq, data):
+    qq.put_iterable(data)
+
+
+def _put_many(qq, data):
+    qq.put_many(data)
+    qq.put_remain()
+
+
+if __name__ == "__main__":
+
+    print("========================= PUT vs PUT_ITERABLE vs PUT_MANY =========================")
+
+    data = list(range(count_elements))
+
+    results = []
+    for name, func in [("put", _put), ("put_iterable", _put_iterable), ("put_many", _put_many)]:
+        qq = QQueue()
+
+        p = multiprocessing.Process(target=_process, args=(qq, count_elements))
+        p.start()
+
+        start = datetime.now()
+        func(qq, data)
+        finish = datetime.now()
+
+        p.join()
+        qq.close()
+
+        diff = finish - start
+        results.append((name, diff))
+        print("[{}] diff finish-start: {}".format(name.upper(), diff))
+
+    print("")
+    for name, diff in results:
+        print("[ROOT COMPARE] {:>12} | diff: {}".format(name, diff))
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Measure in your system the convergence and the throughput of each sensor of size bucket list ('qsize' and
+'throughput'). Convergence time is when the size bucket list stays within a margin of its final value; steady
+throughput is measured in the last half of elements.
+
+:param count_elements: generate more elements to test in a range method
+:param sample_every: elements between samples of size_bucket_list
+:param margin: relative margin of size bucket list around its final value to consider it converged
+"""
+count_elements = 5000000
+sample_every = 10000
+margin = 0.25
+
+
+def _process(qq):
+    while True:
+        bucket = qq.get_bucket()
+        if bucket is None:
+            break
+
+
+def _convergence(samples):
+    final = samples[-1][1]
+    converged = samples[-1][0]
+    for t, size in reversed(samples):
+        if abs(size - final) > final * margin:
+            break
+        converged = t
+    return converged, final
+
+
+if __name__ == "__main__":
+
+    print("========================= SENSOR CONVERGENCE AND THROUGHPUT =========================")
+
+    results = []
+    for sensor in ["qsize", "throughput"]:
+        qq = QQueue(sensor=sensor)
+
+        p = multiprocessing.Process(target=_process, args=(qq,))
+        p.start()
+
+        samples = []
+        start = time.monotonic()
+        for num in range(count_elements):
+            qq.put(num)
+            if num % sample_every == 0:
+                samples.append((time.monotonic() - start, qq.size_bucket_list))
+                if num == count_elements // 2:
+                    start_half = time.monotonic()
+        qq.put_remain()
+        finish = time.monotonic()
+
+        qq.put_bucket(None)
+        p.join()
+        qq.close()
+
+        converged, final = _convergence(samples)
+        steady = (count_elements - count_elements // 2) / (finish - start_half)
+        results.append((sensor, finish - start, converged, final, steady))
+        print("[SENSOR {}] total: {:.2f}s | convergence: {:.2f}s | final size_bucket_list: {} | "
+              "steady: {:.0f} elements/s".format(sensor, finish - start, converged, final, steady))
+        print("    size_bucket_list: {}".format([size for __, size in samples[::len(samples) // 20 or 1]]))
+
+    print("")
+    for sensor, total, converged, final, steady in results:
+        print("[ROOT COMPARE] sensor: {:>10} | total: {:.2f}s | convergence: {:.2f}s | final: {:>6} | "
+              "steady: {:.0f} elements/s".format(sensor, total, converged, final, steady))
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Compare in your system the performance of QuickQueue with each built-in serializer (same test than
+performance_qqueue_vs_queue.py)
+
+:param count_elements: generate more elements to test in a range method
+:param serializers: serializers to test (None is pickle in the feeder thread of multiprocessing.queues.Queue)
+"""
+count_elements = 1000000
+serializers = [None, "pickle", "pickle-highest", "marshal"]
+
+
+def _process(qq):
+    for _ in range(1, count_elements):
+        __ = qq.get()
+
+
+def _velocity_test(serializer):
+    start = datetime.now()
+    qq = QQueue(1000, serializer=serializer)
+
+    p = multiprocessing.Process(target=_process, args=(qq,))
+    p.start()
+    for num in range(1, count_elements):
+        qq.put(num)
+    qq.end()
+
+    p.join()
+
+    finish = datetime.now()
+    diff = finish - start
+    print("[serializer={}] diff finish-start: {}".format(serializer, diff))
+    return diff
+
+
+if __name__ == "__main__":
+
+    print("========================= VELOCITY TEST SERIALIZERS =========================")
+
+    results = [(serializer, _velocity_test(serializer)) for serializer in serializers]
+
+    print("")
+    print("[ROOT COMPARE] {}".format(" | ".join("diff {}: {}".format(serializer, diff)
+                                              for serializer, diff in results)))
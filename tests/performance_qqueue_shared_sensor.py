@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import statistics
+import time
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Measure in your system the fill level of queue (qsize sampled while producers put) and the time with several producers
+that run the sensor each one independently and with shared sensor (one producer determinates the size bucket list of
+all).
+
+:param count_elements: elements to put by each producer
+:param num_producers: number of producer processes
+:param maxsize: maxsize of queue
+:param sample_interval: seconds between samples of qsize
+"""
+count_elements = 500000
+num_producers = 8
+maxsize = 1000
+sample_interval = 0.01
+
+
+def _producer(qq):
+    for num in range(count_elements):
+        qq.put(num)
+    qq.end()
+
+
+def _consumer(qq):
+    while qq.get_bucket() is not None:
+        pass
+
+
+if __name__ == "__main__":
+
+    print("========================= INDEPENDENT SENSORS vs SHARED SENSOR =========================")
+
+    results = []
+    for shared_sensor in [False, True]:
+        qq = QQueue(maxsize, shared_sensor=shared_sensor)
+
+        c = multiprocessing.Process(target=_consumer, args=(qq,))
+        c.start()
+        producers = [multiprocessing.Process(target=_producer, args=(qq,)) for _ in range(num_producers)]
+
+        start = datetime.now()
+        for p in producers:
+            p.start()
+
+        samples = []
+        while any(p.is_alive() for p in producers):
+            samples.append(qq.qsize())
+            time.sleep(sample_interval)
+        for p in producers:
+            p.join()
+
+        qq.put_bucket(None)
+        c.join()
+        finish = datetime.now()
+        qq.close()
+
+        diff = finish - start
+        full = sum(1 for s in samples if s >= maxsize * 0.9) / float(len(samples))
+        empty = sum(1 for s in samples if s <= maxsize * 0.1) / float(len(samples))
+        results.append((shared_sensor, diff, statistics.mean(samples), statistics.pstdev(samples), full, empty))
+        print("[SHARED SENSOR {}] diff finish-start: {}".format(shared_sensor, diff))
+
+    print("")
+    for shared_sensor, diff, mean, stdev, full, empty in results:
+        print("[ROOT COMPARE] shared_sensor: {:>5} | diff: {} | qsize mean: {:.0f} | qsize stdev: {:.0f} | "
+              "full: {:.0%} | empty: {:.0%}".format(str(shared_sensor), diff, mean, stdev, full, empty))
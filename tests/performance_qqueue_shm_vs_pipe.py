@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+from datetime import datetime
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console
+
+Compare in your system the performance of QuickQueue with transport by pipe (multiprocessing.queues.Queue) vs transport
+by ring buffer in shared memory
+
+:param count_elements: generate more elements to test in a range method
+:param payloads: functions to generate the data to put from a number (an int and a bytes of 1KB)
+"""
+count_elements = 1000000
+payloads = {"int": int, "bytes 1KB": lambda num: num.to_bytes(8, "little") * 128}
+
+
+def _process(qq):
+    for _ in range(1, count_elements):
+        __ = qq.get()
+
+
+def _velocity_test(transport, name, payload):
+    start = datetime.now()
+    qq = QQueue(1000, transport=transport, shm_size=64 * 1024 * 1024)
+
+    p = multiprocessing.Process(target=_process, args=(qq,))
+    p.start()
+    for num in range(1, count_elements):
+        qq.put(payload(num))
+    qq.end()
+
+    p.join()
+
+    finish = datetime.now()
+    diff = finish - start
+    print("[{} | {}] diff finish-start: {}".format(transport, name, diff))
+    return diff
+
+
+if __name__ == "__main__":
+
+    print("========================= VELOCITY TEST PIPE VS SHARED MEMORY =========================")
+
+    results = []
+    for name, payload in payloads.items():
+        diff1 = _velocity_test("pipe", name, payload)
+        diff2 = _velocity_test("shm", name, payload)
+        results.append((name, diff1, diff2))
+
+    print("")
+    for name, diff1, diff2 in results:
+        print("[ROOT COMPARE] payload: {} | diff pipe: {} | diff shm: {}".format(name, diff1, diff2))
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import asyncio
+import multiprocessing
+import shutil
+import tempfile
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+One asyncio process drains two queues fed by producer processes and feeds a queue drained by a consumer process, while
+a ticker coroutine checks that the event loop is not blocked.
+"""
+
+COUNT_ELEMENTS = 100000
+
+
+def _producer(qq):
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    qq.end()
+
+
+def _consumer(qq, result):
+    result.put(sum(1 for _ in qq))
+
+
+async def _ticker(ticks, stop):
+    while not stop.is_set():
+        ticks.append(asyncio.get_running_loop().time())
+        await asyncio.sleep(0.005)
+
+
+def _max_gap(ticks):
+    return max((b - a for a, b in zip(ticks, ticks[1:])), default=0.0)
+
+
+def test_async_get():
+    async def drain(aqq):
+        count = 0
+        total = 0
+        async for value in aqq:
+            count += 1
+            total += value
+        return count, total
+
+    async def main(queues):
+        ticks = list()
+        stop = asyncio.Event()
+        ticker = asyncio.ensure_future(_ticker(ticks, stop))
+        results = await asyncio.gather(*[drain(qq.async_view()) for qq in queues])
+        stop.set()
+        await ticker
+        return results, ticks
+
+    queues = [QQueue(consumers=1) for _ in range(2)]
+    processes = [multiprocessing.Process(target=_producer, args=(qq,)) for qq in queues]
+    for p in processes:
+        p.start()
+    results, ticks = asyncio.run(main(queues))
+    for p in processes:
+        p.join()
+
+    assert results == [(COUNT_ELEMENTS, sum(range(COUNT_ELEMENTS)))] * 2
+    assert _max_gap(ticks) < 0.5
+
+
+def test_async_put():
+    async def main(aqq):
+        ticks = list()
+        stop = asyncio.Event()
+        ticker = asyncio.ensure_future(_ticker(ticks, stop))
+        for value in range(COUNT_ELEMENTS):
+            await aqq.put(value)
+        await aqq.put_end()
+        stop.set()
+        await ticker
+        return ticks
+
+    # Small maxsize: the producer waits for the consumer many times
+    qq = QQueue(maxsize=2, size_bucket_list=100, consumers=1)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_consumer, args=(qq, result))
+    p.start()
+    ticks = asyncio.run(main(qq.async_view()))
+    assert result.get() == COUNT_ELEMENTS
+    p.join()
+    qq.close()
+    assert _max_gap(ticks) < 0.5
+
+
+def test_async_get_many_timeout():
+    async def main(aqq):
+        try:
+            await aqq.get_many(10, timeout=0.05)
+            assert False, "get_many without data must raise queue.Empty"
+        except queue.Empty:
+            pass
+
+        await aqq.put_many(range(15))
+        await aqq.put_remain()
+        assert await aqq.get_many(10, timeout=1) == list(range(10))
+        assert await aqq.get_many(10, timeout=0.05) == list(range(10, 15))
+
+        await aqq.put_bucket([1, 2, 3])
+        assert await aqq.get_bucket(timeout=1) == [1, 2, 3]
+        aqq.qq.task_done(18)
+
+    qjq = QJoinableQueue(size_bucket_list=10)
+    asyncio.run(main(qjq.async_view()))
+    qjq.close()
+
+
+def test_async_put_end_spill():
+    async def main(aqq):
+        for value in range(COUNT_ELEMENTS):
+            await aqq.put(value)
+        await aqq.put_end()
+
+    # The queue is full most of time: the end-of-stream must be put after the buckets spilled
+    spill_dir = tempfile.mkdtemp()
+    try:
+        qq = QQueue(maxsize=1, size_bucket_list=1, consumers=1, spill_dir=spill_dir)
+        result = multiprocessing.Queue()
+        p = multiprocessing.Process(target=_consumer, args=(qq, result))
+        p.start()
+        asyncio.run(main(qq.async_view()))
+        assert result.get() == COUNT_ELEMENTS
+        p.join()
+        qq.close()
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+if __name__ == "__main__":
+    test_async_get()
+    test_async_put()
+    test_async_get_many_timeout()
+    test_async_put_end_spill()
+    print("OK")
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+from quick_queue import bench
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Run a small benchmark and compare it with a worse copy of itself to check that regressions are flagged.
+"""
+
+
+def test_bench_run():
+    matrix = bench.scenarios(queues=["qqueue", "queue"], payloads=["int"], workers=[(1, 1)])
+    assert len(matrix) == 3
+
+    result = bench.run(matrix, count_elements=10000, verbose=False)
+    assert len(result["results"]) == 3
+    for r in result["results"]:
+        assert r["elements"] == 10000
+        assert r["items_per_second"] > 0
+        assert r["latency_p50_ms"] <= r["latency_p99_ms"]
+
+
+def test_bench_compare():
+    baseline = {"results": [{"name": "a", "items_per_second": 1000.0, "latency_p99_ms": 1.0},
+                            {"name": "b", "items_per_second": 1000.0, "latency_p99_ms": 1.0},
+                            {"name": "c", "items_per_second": 1000.0, "latency_p99_ms": 1.0}]}
+    current = {"results": [{"name": "a", "items_per_second": 950.0, "latency_p99_ms": 1.2},
+                           {"name": "b", "items_per_second": 800.0, "latency_p99_ms": 2.0},
+                           {"name": "d", "items_per_second": 1000.0, "latency_p99_ms": 1.0}]}
+
+    rows, unmatched = bench.compare(baseline, current, threshold=0.1, latency_threshold=0.5)
+    regressions = dict((row["name"], row["regressions"]) for row in rows)
+    assert regressions == {"a": [], "b": ["throughput", "latency"]}
+    assert unmatched == ["c", "d"]
+
+
+if __name__ == "__main__":
+    test_bench_run()
+    test_bench_compare()
+    print("OK")
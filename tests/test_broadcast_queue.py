@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import pickle
+import time
+
+from quick_queue.broadcast import QBroadcastQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Every subscriber gets all data in order while the producer serializes each bucket list once; with slow_policy 'drop' the
+bucket lists that do not fit in the backlog of a slow subscriber are dropped for it.
+"""
+
+COUNT_ELEMENTS = 100000
+COUNT_SUBSCRIBERS = 3
+
+
+class CountSerializer(object):
+
+    def __init__(self):
+        self.count_dumps = 0
+
+    def dumps(self, bucket):
+        self.count_dumps += 1
+        return pickle.dumps(bucket, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, obj):
+        return pickle.loads(obj)
+
+
+def _subscriber(qbq, result):
+    values = list(qbq.subscribe())
+    result.put((len(values), values == list(range(COUNT_ELEMENTS))))
+
+
+def _run(ctx):
+    serializer = CountSerializer()
+    qbq = QBroadcastQueue(COUNT_SUBSCRIBERS, maxsize=10, serializer=serializer, ctx=ctx)
+    result = ctx.Queue()
+    processes = [ctx.Process(target=_subscriber, args=(qbq, result)) for _ in range(COUNT_SUBSCRIBERS)]
+    for p in processes:
+        p.start()
+
+    count_buckets = 0
+    for value in range(COUNT_ELEMENTS):
+        if not qbq.bucket_list:
+            count_buckets += 1
+        qbq.put(value)
+    qbq.end()
+
+    results = [result.get() for _ in processes]
+    for p in processes:
+        p.join()
+    assert results == [(COUNT_ELEMENTS, True)] * COUNT_SUBSCRIBERS
+    # One serialization for each bucket list (not for each subscriber)
+    assert serializer.count_dumps == count_buckets
+
+
+def test_broadcast():
+    _run(multiprocessing.get_context())
+
+
+def test_broadcast_spawn():
+    _run(multiprocessing.get_context("spawn"))
+
+
+def test_broadcast_drop():
+    qbq = QBroadcastQueue(2, maxsize=2, size_bucket_list=10, slow_policy="drop")
+    qbq.put_bucket(list(range(10)))
+    qbq.put_bucket(list(range(10, 20)))
+    qbq.put_bucket(list(range(20, 30)))
+
+    assert qbq.subscribe(0).get_bucket(timeout=1) == list(range(10))
+    qbq.put_bucket(list(range(30, 40)))
+    assert qbq.dropped(0) == 1
+    assert qbq.dropped(1) == 2
+    assert qbq.stats()["dropped"] == [1, 2]
+    assert qbq.get_many(100, timeout=0.1) == list(range(10, 20)) + list(range(30, 40))
+
+    assert qbq.subscribe(1).get_many(100, timeout=0.1) == list(range(20))
+    qbq.put_end()
+    assert list(qbq) == []
+    assert list(qbq.subscribe(0)) == []
+    qbq.close()
+
+    for kwargs in ({"slow_policy": "other"}, {"slow_timeout": 1}, {"maxbytes": 1024}, {"lanes": 2},
+                   {"transport": "shm"}, {"consumers": 2}):
+        try:
+            QBroadcastQueue(2, **kwargs)
+            assert False, "{} must raise ValueError".format(kwargs)
+        except ValueError:
+            pass
+
+
+def test_broadcast_drop_timeout():
+    qbq = QBroadcastQueue(3, maxsize=1, size_bucket_list=10, slow_policy="drop", slow_timeout=0.3)
+    qbq.put_bucket([1])
+
+    # The three subscribers are slow (their backlogs are full): the put waits slow_timeout for all of them
+    start = time.monotonic()
+    qbq.put_bucket([2])
+    elapsed = time.monotonic() - start
+    assert 0.3 <= elapsed < 0.6, elapsed
+    assert qbq.stats()["dropped"] == [1, 1, 1]
+    qbq.close()
+
+
+def test_broadcast_block_without_timeout():
+    qbq = QBroadcastQueue(2, maxsize=1, size_bucket_list=10)
+    # A bucket list is never sent to some subscribers only
+    for kwargs in ({"block": False}, {"timeout": 0.1}):
+        try:
+            qbq.put_bucket([1], **kwargs)
+            assert False, "{} must raise ValueError".format(kwargs)
+        except ValueError:
+            pass
+    assert qbq.empty()
+
+    qbq.put_bucket([2])
+    assert qbq.subscribe(0).get_bucket(timeout=1) == [2]
+    assert qbq.subscribe(1).get_bucket(timeout=1) == [2]
+    qbq.close()
+
+
+if __name__ == "__main__":
+    test_broadcast()
+    test_broadcast_spawn()
+    test_broadcast_drop()
+    test_broadcast_drop_timeout()
+    test_broadcast_block_without_timeout()
+    print("OK")
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import os
+import tempfile
+
+from quick_queue import calibrate
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Run a small calibration, save it in a temporal cache file and check that QQueue(size_bucket_list="auto") loads the
+size bucket list calibrated.
+"""
+
+
+def test_calibrate_auto():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calibration.json")
+        os.environ["QUICK_QUEUE_CALIBRATION"] = path
+        try:
+            qq = QQueue(size_bucket_list="auto")
+            assert qq.enable_sensor
+            qq.close()
+
+            calibration = calibrate.calibrate(payloads=["int"], workers=[(1, 1)], sizes=[10, 1000],
+                                              count_elements=20000, verbose=False)
+            assert calibration["size_bucket_list"] in (10, 1000)
+            assert len(calibration["results"]) == 2
+            assert calibrate.save_calibration(calibration) == path
+
+            qq = QQueue(size_bucket_list="auto")
+            assert not qq.enable_sensor
+            assert qq.size_bucket_list == calibration["size_bucket_list"]
+            qq.close()
+        finally:
+            del os.environ["QUICK_QUEUE_CALIBRATION"]
+
+
+def test_invalid_calibration():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "calibration.json")
+        with open(path, "w") as f:
+            f.write("{not json")
+        assert calibrate.load_calibration(path) is None
+        assert calibrate.calibrated_size_bucket_list(path) is None
+
+
+if __name__ == "__main__":
+    test_calibrate_auto()
+    test_invalid_calibration()
+    print("OK")
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QJoinableQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Counter of unfinished tasks of QJoinableQueue: join returns when the acks (task_done and task_done_bucket) add up to the
+data put, task_done_bucket acks a whole bucket, acks over the data put raise ValueError and the counter is shared by
+producer and consumer processes.
+"""
+
+COUNT_ELEMENTS = 10000
+COUNT_PRODUCERS = 2
+COUNT_CONSUMERS = 2
+ACK_DELAY = 0.3
+
+
+def _ack_process(qjq, count):
+    # Half of data acked one by one and the rest with one task_done(n) after a delay
+    half = count // 2
+    for _ in range(half):
+        qjq.get()
+        qjq.task_done()
+    for _ in range(count - half):
+        qjq.get()
+    time.sleep(ACK_DELAY)
+    qjq.task_done(count - half)
+
+
+def test_join_when_acks_add_up():
+    qjq = QJoinableQueue(size_bucket_list=10)
+    p = multiprocessing.Process(target=_ack_process, args=(qjq, 100))
+    p.start()
+
+    start = time.monotonic()
+    qjq.put_iterable(range(100))
+    qjq.join()
+    assert time.monotonic() - start >= ACK_DELAY
+    assert qjq._unfinished_count.value == 0
+    p.join()
+    qjq.close()
+
+
+def test_task_done_bucket():
+    qjq = QJoinableQueue(size_bucket_list=10)
+    qjq.put_bucket([1, 2, 3])
+    qjq.put_bucket([4, 5])
+    assert qjq._unfinished_count.value == 5
+
+    assert qjq.get_bucket(timeout=5) == [1, 2, 3]
+    qjq.task_done_bucket()
+    assert qjq._unfinished_count.value == 2
+    # The bucket was already acked
+    try:
+        qjq.task_done_bucket()
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+    assert qjq.get_bucket(timeout=5) == [4, 5]
+    qjq.task_done_bucket()
+    qjq.join()
+    qjq.close()
+
+
+def test_over_ack():
+    qjq = QJoinableQueue(size_bucket_list=10)
+    try:
+        qjq.task_done()
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+    qjq.put_bucket([1, 2, 3])
+    qjq.get_bucket(timeout=5)
+    try:
+        qjq.task_done(4)
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+    # The counter is not changed by a wrong ack
+    assert qjq._unfinished_count.value == 3
+    qjq.task_done(3)
+    qjq.join()
+    qjq.close()
+
+
+def _producer(qjq, start, count):
+    qjq.put_iterable(range(start, start + count))
+
+
+def _consumer(qjq, result):
+    count = 0
+    total = 0
+    while True:
+        try:
+            bucket = qjq.get_bucket(timeout=1)
+        except queue.Empty:
+            break
+        count += len(bucket)
+        total += sum(bucket)
+        qjq.task_done_bucket()
+    result.put((count, total))
+
+
+def test_counter_across_processes():
+    qjq = QJoinableQueue()
+    result = multiprocessing.Queue()
+    consumers = [multiprocessing.Process(target=_consumer, args=(qjq, result)) for _ in range(COUNT_CONSUMERS)]
+    producers = [multiprocessing.Process(target=_producer, args=(qjq, num * COUNT_ELEMENTS, COUNT_ELEMENTS))
+                 for num in range(COUNT_PRODUCERS)]
+    for p in consumers + producers:
+        p.start()
+    for p in producers:
+        p.join()
+
+    qjq.join()
+    assert qjq._unfinished_count.value == 0
+
+    results = [result.get() for _ in consumers]
+    for p in consumers:
+        p.join()
+    total_elements = COUNT_PRODUCERS * COUNT_ELEMENTS
+    assert sum(r[0] for r in results) == total_elements
+    assert sum(r[1] for r in results) == sum(range(total_elements))
+    qjq.close()
+
+
+if __name__ == "__main__":
+    test_join_when_acks_add_up()
+    test_task_done_bucket()
+    test_over_ack()
+    test_counter_across_processes()
+    print("OK")
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import pickle
+import random
+
+from quick_queue.metrics import LatencyHistogram
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Check the percentiles of the HDR-style histogram and the latencies recorded by a producer and a consumer with
+latency_sample and linger.
+"""
+
+COUNT_ELEMENTS = 10000
+
+
+def test_histogram_percentiles():
+    rnd = random.Random(0)
+    values = sorted(rnd.uniform(0.0001, 2.0) for _ in range(10000))
+    histogram = LatencyHistogram()
+    for v in values:
+        histogram.observe(v)
+
+    for q in (50, 90, 99, 99.9):
+        expected = values[int(round(q / 100.0 * len(values))) - 1]
+        assert abs(histogram.percentile(q) - expected) <= expected * 0.02, q
+    assert histogram.percentile(100) == values[-1]
+
+    other = pickle.loads(pickle.dumps(histogram))
+    merged = LatencyHistogram().merge(histogram).merge(other)
+    assert merged.count == 2 * len(values)
+    assert merged.percentile(50) == histogram.percentile(50)
+
+
+def _process(qq, result):
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    result.put(qq.latency_histograms())
+
+
+def test_latency_sample():
+    qq = QQueue(size_bucket_list=100, latency_sample=1.0, linger_ms=5)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_process, args=(qq, result))
+    p.start()
+    assert qq.get_many(COUNT_ELEMENTS) == list(range(COUNT_ELEMENTS))
+    producer = result.get()
+    p.join()
+
+    consumer = qq.latency_histograms()
+    buckets = consumer["queue"].count
+    assert buckets >= COUNT_ELEMENTS // 101
+    assert producer["fill"].count == buckets
+    assert consumer["end_to_end"].count == buckets
+    assert consumer["end_to_end"].percentile(99) >= consumer["queue"].percentile(50)
+    assert producer["queue"].count == 0
+    assert qq.stats()["latency"]["queue"]["count"] == buckets
+    qq.close()
+
+
+def test_latency_sample_fraction():
+    qq = QQueue(size_bucket_list=10, latency_sample=0.1)
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    assert qq.get_many(COUNT_ELEMENTS) == list(range(COUNT_ELEMENTS))
+    buckets = qq.latency_histograms()["queue"].count
+    assert 0 < buckets < COUNT_ELEMENTS // 11 / 2
+    qq.close()
+
+    for latency_sample in (0, 2):
+        try:
+            QQueue(latency_sample=latency_sample)
+            assert False, "latency_sample={} must raise ValueError".format(latency_sample)
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_histogram_percentiles()
+    test_latency_sample()
+    test_latency_sample_fraction()
+    print("OK")
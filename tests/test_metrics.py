@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import os
+import tempfile
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Put data in a producer process and get them in this process with metrics enabled, check the stats of both processes
+and the file written by the Prometheus exporter.
+"""
+
+COUNT_ELEMENTS = 10000
+
+
+def _process(qq, result):
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    result.put(qq.stats())
+
+
+def test_stats():
+    qq = QQueue(metrics=True, serializer="pickle")
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_process, args=(qq, result))
+    p.start()
+
+    got = qq.get_many(COUNT_ELEMENTS)
+    producer_stats = result.get()
+    p.join()
+
+    assert got == list(range(COUNT_ELEMENTS))
+    assert producer_stats["pid"] == p.pid
+    assert producer_stats["items_put"] == COUNT_ELEMENTS
+    assert producer_stats["buckets_put"] == producer_stats["histograms"]["bucket_items"]["count"]
+    assert producer_stats["bytes_serialized"] > 0
+    assert producer_stats["sensor_runs"] >= producer_stats["sensor_changes"] > 0
+
+    stats = qq.stats()
+    assert stats["items_put"] == 0
+    assert stats["items_got"] == COUNT_ELEMENTS
+    assert stats["buckets_got"] == producer_stats["buckets_put"]
+    assert stats["bytes_deserialized"] == producer_stats["bytes_serialized"]
+    assert stats["histograms"]["get_blocked_seconds"]["buckets"][-1] == ("+Inf", stats["buckets_got"])
+    qq.close()
+
+
+def test_stats_disabled():
+    qq = QQueue()
+    qq.put_iterable(range(100))
+    stats = qq.stats()
+    assert stats["size_bucket_list"] == qq.size_bucket_list
+    assert "items_put" not in stats
+    try:
+        qq.start_metrics_exporter("unused.prom")
+        assert False, "start_metrics_exporter without metrics must raise ValueError"
+    except ValueError:
+        pass
+    qq.close()
+
+
+def test_prometheus_exporter():
+    with tempfile.TemporaryDirectory() as directory:
+        qq = QQueue(metrics=True)
+        exporter = qq.start_metrics_exporter(os.path.join(directory, "qq_{pid}.prom"), interval=60,
+                                             labels={"queue": "test"})
+        assert exporter.path == os.path.join(directory, "qq_{}.prom".format(os.getpid()))
+
+        qq.put_iterable(range(COUNT_ELEMENTS))
+        assert qq.get_many(COUNT_ELEMENTS) == list(range(COUNT_ELEMENTS))
+        qq.close()
+
+        with open(exporter.path) as f:
+            text = f.read()
+        labels = '{{queue="test",pid="{}"}}'.format(os.getpid())
+        assert "# TYPE quick_queue_items_put_total counter" in text
+        assert "quick_queue_items_put_total{} {}".format(labels, COUNT_ELEMENTS) in text
+        assert "quick_queue_items_got_total{} {}".format(labels, COUNT_ELEMENTS) in text
+        assert 'quick_queue_put_blocked_seconds_bucket{{queue="test",pid="{}",le="+Inf"}}'.format(os.getpid()) in text
+
+
+if __name__ == "__main__":
+    test_stats()
+    test_stats_disabled()
+    test_prometheus_exporter()
+    print("OK")
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import pickle
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from multiprocessing import shared_memory
+
+from quick_queue import out_of_band
+from quick_queue.out_of_band import OutOfBandSerializer
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Lifecycle of shared memory segments of out-of-band buffers (oob_threshold): segments are unlinked when they are got and
+closed when data got is not referenced, they are released if pickling or put fails, and a memoryview is got without
+copy from its segment.
+"""
+
+THRESHOLD = 1024
+
+
+class _RecordedSharedMemory(shared_memory.SharedMemory):
+    """
+    SharedMemory that records the names of segments created (to check that they are released).
+    """
+    created = []
+
+    def __init__(self, name=None, create=False, size=0):
+        super().__init__(name=name, create=create, size=size)
+        if create:
+            _RecordedSharedMemory.created.append(self.name)
+
+
+def _record_segments():
+    _RecordedSharedMemory.created = []
+    out_of_band.shared_memory.SharedMemory = _RecordedSharedMemory
+    return _RecordedSharedMemory.created
+
+
+def _stop_recording():
+    out_of_band.shared_memory.SharedMemory = _RecordedSharedMemory.__base__
+
+
+def _exists(name):
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+def test_segments_unlinked_and_closed():
+    serializer = OutOfBandSerializer(THRESHOLD)
+    out_of_band._close_unused_segments()
+    data = bytearray(b"a" * THRESHOLD)
+    serialized = serializer.dumps([memoryview(data), b"b" * THRESHOLD, b"small"])
+    names = [name for name, __, __ in serialized[1]]
+    # Only the buffers of threshold bytes or more are sent in segments
+    assert len(names) == 2
+    assert all(_exists(name) for name in names)
+
+    bucket = serializer.loads(serialized)
+    assert bytes(bucket[0]) == bytes(data)
+    assert bucket[1] == b"b" * THRESHOLD
+    assert bucket[2] == b"small"
+    # Segments are unlinked when they are got (nobody else can attach them)
+    assert not any(_exists(name) for name in names)
+    assert len(out_of_band._attached_segments) == 2
+
+    # The memoryview references its segment, the bytes were copied
+    out_of_band._close_unused_segments()
+    assert len(out_of_band._attached_segments) == 1
+    del bucket
+    out_of_band._close_unused_segments()
+    assert not out_of_band._attached_segments
+
+
+def test_release_when_pickling_fails():
+    serializer = OutOfBandSerializer(THRESHOLD)
+    created = _record_segments()
+    try:
+        try:
+            # The big buffer is copied to a segment before the lambda fails
+            serializer.dumps([b"a" * THRESHOLD, lambda: None])
+            assert False, "pickling error expected"
+        except (pickle.PicklingError, AttributeError, TypeError):
+            pass
+    finally:
+        _stop_recording()
+    assert len(created) == 1
+    assert not _exists(created[0])
+
+
+def test_release_when_put_fails():
+    qq = QQueue(maxsize=1, size_bucket_list=1, oob_threshold=THRESHOLD)
+    created = _record_segments()
+    try:
+        qq.put_bucket([b"a" * THRESHOLD])
+        try:
+            qq.put_bucket([b"b" * THRESHOLD], block=False)
+            assert False, "queue.Full expected"
+        except queue.Full:
+            pass
+    finally:
+        _stop_recording()
+    assert len(created) == 2
+    # The bucket in queue keeps its segment, the bucket not put was released
+    assert _exists(created[0])
+    assert not _exists(created[1])
+
+    assert qq.get_bucket() == [b"a" * THRESHOLD]
+    assert not _exists(created[0])
+    qq.close()
+
+
+def test_memoryview_zero_copy():
+    serializer = OutOfBandSerializer(THRESHOLD)
+    out_of_band._close_unused_segments()
+    data = memoryview(bytearray(range(256)) * (THRESHOLD // 256)).cast('i')
+    bucket = serializer.loads(serializer.dumps([data]))
+    got = bucket[0]
+    assert isinstance(got, memoryview)
+    assert got.format == 'i' and got.shape == data.shape and not got.readonly
+    assert got.tolist() == data.tolist()
+
+    # The memoryview got writes in the segment (it was not copied)
+    shm = out_of_band._attached_segments[-1]
+    got[0] = -1
+    assert shm.buf[:got.itemsize].cast('i')[0] == -1
+
+    # A memoryview of bytes is got read only
+    bucket_readonly = serializer.loads(serializer.dumps([memoryview(b"r" * THRESHOLD)]))
+    assert bucket_readonly[0].readonly
+
+    del got, bucket, bucket_readonly
+    out_of_band._close_unused_segments()
+    assert not out_of_band._attached_segments
+
+
+if __name__ == "__main__":
+    test_segments_unlinked_and_closed()
+    test_release_when_pickling_fails()
+    test_release_when_put_fails()
+    test_memoryview_zero_copy()
+    print("OK")
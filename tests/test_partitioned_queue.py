@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+from decimal import Decimal
+from fractions import Fraction
+
+from quick_queue.partitioned import QPartitionedQueue, partition_of_key
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Producers put values of skewed keys in a partitioned queue and each consumer owns a partition: all values of a key are
+got by the same consumer and in the order each producer put them.
+"""
+
+COUNT_ELEMENTS = 50000
+COUNT_PRODUCERS = 2
+COUNT_PARTITIONS = 3
+
+
+def _key(num):
+    # Skewed keys: half of values are of key "hot"
+    return "hot" if num % 2 == 0 else "key{}".format(num % 17)
+
+
+def _producer(qpq, producer):
+    qpq.put_items((_key(num), (producer, _key(num), num)) for num in range(COUNT_ELEMENTS))
+    qpq.put_remain()
+
+
+def _consumer(qpq, result):
+    last = dict()
+    in_order = True
+    count = 0
+    for producer, key, num in qpq.partition_queue():
+        if last.get((producer, key), -1) >= num:
+            in_order = False
+        last[(producer, key)] = num
+        count += 1
+    result.put((count, {key for _, key in last}, in_order))
+
+
+def _run(ctx, **kwargs):
+    qpq = QPartitionedQueue(COUNT_PARTITIONS, maxsize=10, ctx=ctx, **kwargs)
+    result = ctx.Queue()
+    consumers = [ctx.Process(target=_consumer, args=(qpq, result)) for _ in range(COUNT_PARTITIONS)]
+    producers = [ctx.Process(target=_producer, args=(qpq, i)) for i in range(COUNT_PRODUCERS)]
+    for p in consumers + producers:
+        p.start()
+    for p in producers:
+        p.join()
+    qpq.end()
+
+    results = [result.get() for _ in consumers]
+    for p in consumers:
+        p.join()
+
+    assert sum(r[0] for r in results) == COUNT_PRODUCERS * COUNT_ELEMENTS
+    assert all(r[2] for r in results)
+    # Each key is got by only one consumer
+    keys = [key for r in results for key in r[1]]
+    assert len(keys) == len(set(keys)) == 18
+
+
+def test_partitioned_queue():
+    _run(multiprocessing.get_context())
+
+
+def test_partitioned_queue_spawn():
+    _run(multiprocessing.get_context("spawn"), linger_ms=5)
+
+
+def test_partition_of_key():
+    assert [partition_of_key(k, 4) for k in (0, 5, -1)] == [0, 1, 3]
+    assert partition_of_key("hot", 3) == partition_of_key(b"hot", 3)
+    assert 0 <= partition_of_key(("a", 1), 3) < 3
+
+    # Equal numbers of different types are in the same partition
+    for partitions in (3, 4, 7):
+        for equal in ((1, 1.0, True, Fraction(1), Decimal(1), 1 + 0j),
+                      (0, 0.0, -0.0, False),
+                      (-1, -1.0, Decimal("-1.0")),
+                      (2 ** 70, float(2 ** 70)),
+                      (1.5, Fraction(3, 2), Decimal("1.5"))):
+            assert len(set(partition_of_key(k, partitions) for k in equal)) == 1, equal
+    assert 0 <= partition_of_key(float("inf"), 3) < 3
+
+    qpq = QPartitionedQueue(2, size_bucket_list=10)
+    qpq.put_many(range(5), key=1)
+    qpq.put("A", key=0)
+    qpq.put_remain()
+    assert qpq.partition_queue(1).get_many(5, timeout=1) == list(range(5))
+    assert qpq.partition_queue(0).get(timeout=1) == "A"
+    try:
+        qpq.partition_queue(2)
+        assert False, "partition_queue out of range must raise ValueError"
+    except ValueError:
+        pass
+    qpq.close()
+
+    for kwargs in ({"consumers": 2}, {"lanes": 2}):
+        try:
+            QPartitionedQueue(2, **kwargs)
+            assert False, "{} must raise ValueError".format(kwargs)
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_partitioned_queue()
+    test_partitioned_queue_spawn()
+    test_partition_of_key()
+    print("OK")
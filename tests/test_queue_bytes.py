@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Buckets by bytes: bucket lists cut by their estimated size in bytes (target_bucket_bytes) and queue bounded by the
+estimated bytes of its buckets (maxbytes), also with maxsize<=0 (queue limited only by bytes).
+"""
+
+VALUE_BYTES = 300
+MAXBYTES = 1000
+DRAIN_DELAY = 0.3
+
+
+def _drain_consumer(qq, result):
+    time.sleep(DRAIN_DELAY)
+    result.put(qq.get_bucket())
+
+
+def test_target_bucket_bytes():
+    qq = QQueue(target_bucket_bytes=1000)
+    values = [bytes([num]) * VALUE_BYTES for num in range(10)]
+    for value in values:
+        qq.put(value)
+    qq.put_remain()
+
+    buckets = [qq.get_bucket(timeout=5) for _ in range(3)]
+    # The bucket list is put when its bytes reach target_bucket_bytes (4 * 300 >= 1000), the rest with put_remain
+    assert [len(bucket) for bucket in buckets] == [4, 4, 2]
+    assert [value for bucket in buckets for value in bucket] == values
+    qq.close()
+
+
+def _check_maxbytes(qq):
+    qq.put_bucket([b"A" * 400])
+    qq.put_bucket([b"B" * 400])
+    assert qq.stats()["bytes_in_queue"] == 800
+
+    # 800 + 400 > maxbytes
+    try:
+        qq.put_bucket([b"C" * 400], block=False)
+        assert False, "queue.Full expected"
+    except queue.Full:
+        pass
+    start = time.monotonic()
+    try:
+        qq.put_bucket([b"C" * 400], timeout=0.2)
+        assert False, "queue.Full expected"
+    except queue.Full:
+        pass
+    assert time.monotonic() - start >= 0.2
+    assert qq.stats()["bytes_in_queue"] == 800
+
+    # put blocks until the consumer gets a bucket
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_drain_consumer, args=(qq, result))
+    p.start()
+    start = time.monotonic()
+    qq.put_bucket([b"C" * 400])
+    assert time.monotonic() - start >= DRAIN_DELAY / 2
+    assert result.get(timeout=5) == [b"A" * 400]
+    p.join()
+
+    assert qq.get_bucket(timeout=5) == [b"B" * 400]
+    assert qq.get_bucket(timeout=5) == [b"C" * 400]
+    assert qq.stats()["bytes_in_queue"] == 0
+
+
+def test_maxbytes():
+    qq = QQueue(maxsize=100, size_bucket_list=1, maxbytes=MAXBYTES)
+    _check_maxbytes(qq)
+    qq.close()
+
+
+def test_maxbytes_without_maxsize():
+    qq = QQueue(maxsize=0, maxbytes=MAXBYTES)
+    # Many buckets fit while their bytes fit (queue is not limited by the number of buckets)
+    for num in range(50):
+        qq.put_bucket([b"x" * 10], block=False)
+    try:
+        qq.put_bucket([b"y" * 600], block=False)
+        assert False, "queue.Full expected"
+    except queue.Full:
+        pass
+    for num in range(50):
+        assert qq.get_bucket(timeout=5) == [b"x" * 10]
+
+    _check_maxbytes(qq)
+    qq.close()
+
+
+def test_bucket_bigger_than_maxbytes():
+    qq = QQueue(maxsize=0, maxbytes=MAXBYTES)
+    # One bucket bigger than maxbytes is put when queue has not bytes
+    qq.put_bucket([b"Z" * (MAXBYTES * 2)], block=False)
+    try:
+        qq.put_bucket([b"z"], block=False)
+        assert False, "queue.Full expected"
+    except queue.Full:
+        pass
+    assert qq.get_bucket(timeout=5) == [b"Z" * (MAXBYTES * 2)]
+    qq.close()
+
+
+if __name__ == "__main__":
+    test_target_bucket_bytes()
+    test_maxbytes()
+    test_maxbytes_without_maxsize()
+    test_bucket_bigger_than_maxbytes()
+    print("OK")
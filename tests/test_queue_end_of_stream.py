@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+
+from quick_queue.quick_queue import EndOfStream, QQueue, QJoinableQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Consumers iterate the queue until the end-of-stream (without timeouts, events or polling): one marker for each consumer
+(consumers=N and end) or one marker for all consumers (put_end).
+"""
+
+COUNT_ELEMENTS = 100000
+COUNT_CONSUMERS = 3
+
+
+def _iter_process(qq, result):
+    count = 0
+    total = 0
+    for value in qq:
+        count += 1
+        total += value
+    result.put((count, total))
+
+
+def _iter_buckets_process(qq, result):
+    count = 0
+    total = 0
+    for bucket in qq.iter_buckets():
+        count += len(bucket)
+        total += sum(bucket)
+    result.put((count, total))
+
+
+def _joinable_process(qjq, result):
+    count = 0
+    for _ in qjq:
+        count += 1
+        qjq.task_done()
+    result.put((count, 0))
+
+
+def _run(qq, target, end):
+    result = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=target, args=(qq, result)) for _ in range(COUNT_CONSUMERS)]
+    for p in processes:
+        p.start()
+
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    end(qq)
+
+    results = [result.get() for _ in processes]
+    for p in processes:
+        p.join()
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def test_end_per_consumer():
+    qq = QQueue(consumers=COUNT_CONSUMERS)
+    assert _run(qq, _iter_process, lambda q: q.end()) == (COUNT_ELEMENTS, sum(range(COUNT_ELEMENTS)))
+
+
+def test_end_broadcast():
+    qq = QQueue()
+    assert _run(qq, _iter_buckets_process, lambda q: q.put_end()) == (COUNT_ELEMENTS, sum(range(COUNT_ELEMENTS)))
+    qq.close()
+
+
+def test_end_with_prefetch():
+    qq = QQueue(consumers=COUNT_CONSUMERS, serializer="pickle", prefetch=2, maxbytes=1024 * 1024, latency_sample=0.5)
+    assert _run(qq, _iter_process, lambda q: q.end()) == (COUNT_ELEMENTS, sum(range(COUNT_ELEMENTS)))
+
+
+def test_end_joinable():
+    qjq = QJoinableQueue(consumers=COUNT_CONSUMERS)
+
+    def end(q):
+        q.join()
+        q.put_end()
+
+    assert _run(qjq, _joinable_process, end)[0] == COUNT_ELEMENTS
+    qjq.close()
+
+
+def test_end_in_same_process():
+    qq = QQueue(size_bucket_list=10)
+    qq.put_many(list(range(25)))
+    qq.put_end()
+
+    assert qq.get() == 0
+    assert next(qq.iter_buckets()) == list(range(1, 11))
+    assert qq.get_many(100) == list(range(11, 25))
+    for _ in range(2):
+        try:
+            qq.get()
+            assert False, "get after the end-of-stream must raise EndOfStream"
+        except EndOfStream:
+            pass
+    assert list(qq) == []
+    qq.close()
+
+
+if __name__ == "__main__":
+    test_end_per_consumer()
+    test_end_broadcast()
+    test_end_with_prefetch()
+    test_end_joinable()
+    test_end_in_same_process()
+    print("OK")
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+from quick_queue.quick_queue import QQueue
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Get batches of a fixed number of values from qqueue (last batch can be smaller)
+"""
+iterable = range(1, 10001)
+batch_size = 256
+
+
+def _process(qq, result):
+    batches = list()
+    while True:
+        try:
+            batch = qq.get_many(batch_size, timeout=5.0)
+            print("len: {} | first: {} | last: {}".format(len(batch), batch[0], batch[-1]))
+            batches.append(batch)
+        except queue.Empty:
+            # Also the end-of-stream (EndOfStream is a queue.Empty)
+            break
+    result.put(batches)
+
+
+def test_get_many_batches():
+    qq = QQueue(consumers=1)
+    result = multiprocessing.Queue()
+
+    p = multiprocessing.Process(target=_process, args=(qq, result))
+    p.start()
+
+    qq.put_iterable(iterable)
+
+    qq.end()
+
+    batches = result.get()
+    p.join()
+
+    # Batches join data of several buckets: all of them are full except the last one
+    assert all(len(batch) == batch_size for batch in batches[:-1])
+    assert 0 < len(batches[-1]) <= batch_size
+    assert [value for batch in batches for value in batch] == list(iterable)
+
+
+def test_get_many_max_items():
+    qq = QQueue()
+    qq.put_bucket(list(range(10)))
+    qq.put_bucket(list(range(10, 20)))
+
+    assert qq.get_many(3) == [0, 1, 2]
+    # Data of the rest of first bucket and of the second bucket
+    assert qq.get_many(12) == list(range(3, 15))
+    # Less than max_items when timeout expires
+    assert qq.get_many(100, timeout=0.2) == list(range(15, 20))
+
+    try:
+        qq.get_many(0)
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+    qq.close()
+
+
+def test_get_many_empty():
+    qq = QQueue()
+    start = time.monotonic()
+    try:
+        qq.get_many(batch_size, timeout=0.2)
+        assert False, "queue.Empty expected"
+    except queue.Empty:
+        pass
+    assert time.monotonic() - start >= 0.2
+    qq.close()
+
+
+if __name__ == "__main__":
+    test_get_many_batches()
+    test_get_many_max_items()
+    test_get_many_empty()
+    print("OK")
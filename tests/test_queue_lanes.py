@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Producers and consumers with several lanes: all data are got once, each consumer stops when it got the end-of-stream of
+all lanes and the order is preserved in each lane.
+"""
+
+COUNT_ELEMENTS = 100000
+COUNT_PRODUCERS = 2
+COUNT_CONSUMERS = 4
+COUNT_LANES = 3
+
+
+def _producer(qq, start):
+    qq.put_iterable(range(start, start + COUNT_ELEMENTS))
+    qq.put_remain()
+
+
+def _consumer(qq, result):
+    count = 0
+    total = 0
+    for value in qq:
+        count += 1
+        total += value
+    result.put((count, total))
+
+
+def _run(qq, end, ctx=multiprocessing):
+    result = ctx.Queue()
+    consumers = [ctx.Process(target=_consumer, args=(qq, result)) for _ in range(COUNT_CONSUMERS)]
+    producers = [ctx.Process(target=_producer, args=(qq, i * COUNT_ELEMENTS)) for i in range(COUNT_PRODUCERS)]
+    for p in consumers + producers:
+        p.start()
+    for p in producers:
+        p.join()
+    end(qq)
+
+    results = [result.get() for _ in consumers]
+    for p in consumers:
+        p.join()
+    return sum(r[0] for r in results), sum(r[1] for r in results)
+
+
+def test_lanes_end_per_consumer():
+    qq = QQueue(maxsize=10, size_bucket_list=100, consumers=COUNT_CONSUMERS, lanes=COUNT_LANES)
+    total = COUNT_PRODUCERS * COUNT_ELEMENTS
+    assert _run(qq, lambda q: q.end()) == (total, sum(range(total)))
+
+
+def test_lanes_end_broadcast_spawn():
+    ctx = multiprocessing.get_context("spawn")
+    qq = QQueue(maxsize=10, lanes=COUNT_LANES, ctx=ctx)
+    total = COUNT_PRODUCERS * COUNT_ELEMENTS
+    assert _run(qq, lambda q: q.put_end(), ctx) == (total, sum(range(total)))
+    qq.close()
+
+
+def test_lanes_contended_consumers():
+    # Many consumers per lane
+    qq = QQueue(maxsize=4, size_bucket_list=10, consumers=4 * COUNT_CONSUMERS, lanes=2)
+    result = multiprocessing.Queue()
+    consumers = [multiprocessing.Process(target=_consumer, args=(qq, result)) for _ in range(4 * COUNT_CONSUMERS)]
+    for p in consumers:
+        p.start()
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    qq.end()
+    results = [result.get() for _ in consumers]
+    for p in consumers:
+        p.join()
+    assert (sum(r[0] for r in results), sum(r[1] for r in results)) == (COUNT_ELEMENTS, sum(range(COUNT_ELEMENTS)))
+
+
+def test_lanes_locked_lane_does_not_spin():
+    qq = QQueue(size_bucket_list=10, lanes=2)
+    qq.put_bucket(list(range(10)))
+    # The first bucket of a process is put in its home lane
+    lane = qq.lanes.queues[qq.lanes.home_lane()]
+    while lane.empty():
+        time.sleep(0.01)
+
+    # Other consumer is reading the lane with data (it has the lock of readers): get waits, it does not spin
+    lane._rlock.acquire()
+    try:
+        start_cpu = time.process_time()
+        start = time.monotonic()
+        try:
+            qq.get_bucket(timeout=0.5)
+            assert False, "get_bucket of a locked lane must raise queue.Empty"
+        except queue.Empty:
+            pass
+        assert time.monotonic() - start >= 0.5
+        assert time.process_time() - start_cpu < 0.25
+    finally:
+        lane._rlock.release()
+    assert qq.get_bucket(timeout=1) == list(range(10))
+    qq.close()
+
+
+def test_lanes_order_and_size():
+    qq = QQueue(size_bucket_list=10, lanes=COUNT_LANES)
+    qq.put_iterable(range(1000))
+    qq.put_remain()
+    by_lane = dict()
+    count = 0
+    while count < 1000:
+        bucket = qq.get_bucket(timeout=1)
+        by_lane.setdefault(qq.lanes.last, []).append(bucket)
+        count += len(bucket)
+    assert len(by_lane) == COUNT_LANES
+    assert sorted(v for buckets in by_lane.values() for bucket in buckets for v in bucket) == list(range(1000))
+    # Buckets of each lane keep their order
+    for buckets in by_lane.values():
+        assert buckets == sorted(buckets)
+    assert qq.qsize() == 0
+
+    qjq = QJoinableQueue(size_bucket_list=10, lanes=2)
+    qjq.put_iterable(range(100))
+    qjq.put_remain()
+    assert sorted(qjq.get_many(100, timeout=1)) == list(range(100))
+    qjq.task_done(100)
+    qjq.join()
+    qjq.close()
+
+    try:
+        QQueue(lanes=2, transport="shm")
+        assert False, "lanes with transport='shm' must raise ValueError"
+    except ValueError:
+        pass
+    qq.close()
+
+
+if __name__ == "__main__":
+    test_lanes_end_per_consumer()
+    test_lanes_end_broadcast_spawn()
+    test_lanes_contended_consumers()
+    test_lanes_locked_lane_does_not_spin()
+    test_lanes_order_and_size()
+    print("OK")
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Linger thread (linger_ms): a bucket list not full is put in queue when its oldest data waits linger time although there
+are not more calls to put, and close stops the linger thread.
+"""
+
+LINGER_MS = 50
+SIZE_BUCKET_LIST = 10
+MAX_WAIT = 2.0
+
+
+def _consumer(qq, result):
+    result.put(qq.get_bucket(timeout=MAX_WAIT * 5))
+
+
+def test_linger_puts_bucket_list_not_full():
+    qq = QQueue(size_bucket_list=SIZE_BUCKET_LIST, linger_ms=LINGER_MS)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_consumer, args=(qq, result))
+    p.start()
+
+    start = time.monotonic()
+    values = ["A", "B", "C"]
+    for value in values:
+        qq.put(value)
+    # Not more puts and not put_remain: only the linger thread can put the bucket list
+    bucket = result.get(timeout=MAX_WAIT * 5)
+    elapsed = time.monotonic() - start
+    p.join()
+
+    assert bucket == values
+    assert LINGER_MS / 1000.0 <= elapsed < MAX_WAIT
+    qq.close()
+
+
+def test_close_stops_linger_thread():
+    qq = QQueue(size_bucket_list=SIZE_BUCKET_LIST, linger_ms=LINGER_MS)
+    qq.put("A")
+    linger_thread = qq.linger_thread
+    assert linger_thread is not None and linger_thread.is_alive()
+
+    qq.close()
+    linger_thread.join(MAX_WAIT)
+    assert not linger_thread.is_alive()
+
+
+if __name__ == "__main__":
+    test_linger_puts_bucket_list_not_full()
+    test_close_stops_linger_thread()
+    print("OK")
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import time
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Prefetch of buckets (prefetch): get, get_bucket and get_many keep the order of data with a prefetch thread, close stops
+the prefetch thread (and puts back in queue the buckets prefetched and not got, then other consumers get them and join
+of QJoinableQueue does not hang) and a process forked by a consumer (also by a consumer started with spawn) has not the
+prefetch thread of its parent.
+"""
+
+COUNT_ELEMENTS = 100000
+PREFETCH = 4
+
+
+def _get_process(qq, result):
+    result.put([qq.get() for _ in range(COUNT_ELEMENTS)])
+
+
+def _get_bucket_process(qq, result):
+    values = list()
+    while len(values) < COUNT_ELEMENTS:
+        values.extend(qq.get_bucket())
+    result.put(values)
+
+
+def _get_many_process(qq, result):
+    values = list()
+    while len(values) < COUNT_ELEMENTS:
+        values.extend(qq.get_many(1000))
+    result.put(values)
+
+
+def _check_order(target):
+    qq = QQueue(prefetch=PREFETCH)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=target, args=(qq, result))
+    p.start()
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    assert result.get() == list(range(COUNT_ELEMENTS))
+    p.join()
+    qq.close()
+
+
+def test_get_order():
+    _check_order(_get_process)
+
+
+def test_get_bucket_order():
+    _check_order(_get_bucket_process)
+
+
+def test_get_many_order():
+    _check_order(_get_many_process)
+
+
+def test_close_stops_prefetch_thread():
+    qq = QQueue(prefetch=PREFETCH, size_bucket_list=10)
+    qq.put_iterable(range(100))
+    assert qq.get(timeout=5) == 0
+    prefetch_thread = qq.prefetch_thread
+    assert prefetch_thread is not None and prefetch_thread.is_alive()
+
+    qq.close()
+    assert not prefetch_thread.is_alive()
+    assert qq.prefetch_thread is None
+
+
+def _get_one_bucket_and_close(qq, result):
+    bucket = qq.get_bucket(timeout=5)
+    if hasattr(qq, "task_done_bucket"):
+        qq.task_done_bucket()
+    # Wait until the prefetch thread has its buffer full (and one bucket more got while it waits to put it)
+    time.sleep(0.5)
+    qq.close()
+    result.put(bucket)
+
+
+def _check_close_puts_back_prefetched(qq):
+    qq.put_iterable(range(100))
+    qq.put_remain()
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_get_one_bucket_and_close, args=(qq, result))
+    p.start()
+    values = result.get(timeout=10)
+    p.join()
+
+    while len(values) < 100:
+        bucket = qq.get_bucket(timeout=5)
+        values.extend(bucket)
+        if hasattr(qq, "task_done_bucket"):
+            qq.task_done_bucket()
+    assert sorted(values) == list(range(100))
+
+
+def test_close_puts_back_prefetched():
+    qq = QQueue(prefetch=PREFETCH, size_bucket_list=10)
+    _check_close_puts_back_prefetched(qq)
+    qq.close()
+
+
+def test_close_puts_back_prefetched_joinable():
+    qq = QJoinableQueue(prefetch=PREFETCH, size_bucket_list=10)
+    _check_close_puts_back_prefetched(qq)
+    join = multiprocessing.Process(target=qq.join)
+    join.start()
+    join.join(10)
+    if join.is_alive():
+        join.terminate()
+    assert join.exitcode == 0, "join waits for data prefetched by a consumer closed"
+    qq.close()
+
+
+def _forked_get(qq, conn):
+    if qq.prefetch_thread is not None or qq.prefetch_buffer is not None:
+        # Thread and buffered buckets of the parent process
+        conn.send(("inherited", None))
+        return
+    try:
+        conn.send(("bucket", qq.get_bucket(timeout=5)))
+    except queue.Empty:
+        conn.send(("empty", None))
+
+
+def _fork_after_prefetch(qq, result):
+    # This process started the prefetch thread, then it forks a consumer that must start its own prefetch thread
+    result.put(("bucket", qq.get_bucket(timeout=5)))
+    # Wait until the prefetch thread only waits to put in its full buffer (it does not hold the lock of readers)
+    time.sleep(0.5)
+    # The forked consumer answers by a pipe (the feeder thread of result is not renewed after fork in a process
+    # started with spawn)
+    reader, writer = multiprocessing.Pipe(False)
+    p = multiprocessing.get_context("fork").Process(target=_forked_get, args=(qq, writer))
+    p.start()
+    result.put(reader.recv())
+    p.join()
+    qq.close()
+
+
+def _check_fork_after_prefetch(ctx):
+    qq = QQueue(prefetch=1, size_bucket_list=10, ctx=ctx)
+    result = ctx.Queue()
+    qq.put_iterable(range(1000))
+    p = ctx.Process(target=_fork_after_prefetch, args=(qq, result))
+    p.start()
+    results = [result.get(timeout=30) for _ in range(2)]
+    p.join()
+    assert [kind for kind, __ in results] == ["bucket", "bucket"]
+    qq.close()
+
+
+def test_fork_after_prefetch():
+    _check_fork_after_prefetch(multiprocessing.get_context("fork"))
+
+
+def test_spawn_fork_after_prefetch():
+    _check_fork_after_prefetch(multiprocessing.get_context("spawn"))
+
+
+if __name__ == "__main__":
+    test_get_order()
+    test_get_bucket_order()
+    test_get_many_order()
+    test_close_stops_prefetch_thread()
+    test_close_puts_back_prefetched()
+    test_close_puts_back_prefetched_joinable()
+    test_fork_after_prefetch()
+    test_spawn_fork_after_prefetch()
+    print("OK")
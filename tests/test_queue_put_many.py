@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+put_many and put_iterable slice data in bucket lists of the current size_bucket_list (size_bucket_list + 1 data, like
+put), the last slice not full remains in the bucket list of the process until put_remain and the order is kept.
+"""
+
+COUNT_ELEMENTS = 100000
+
+
+def _record_buckets(qq):
+    """
+    Replace put_bucket of qq to record the buckets (and the size_bucket_list when each one is put) without put them.
+    """
+    buckets = list()
+
+    def put_bucket(bucket, *args, **kwargs):
+        buckets.append((list(bucket), qq.size_bucket_list))
+
+    qq.put_bucket = put_bucket
+    return buckets
+
+
+def test_slices_of_size_bucket_list():
+    for name in ("put_many", "put_iterable"):
+        qq = QQueue(size_bucket_list=9)
+        buckets = _record_buckets(qq)
+        getattr(qq, name)(range(25))
+        if name == "put_many":
+            # The partial last slice remains for put_remain
+            assert [len(bucket) for bucket, __ in buckets] == [10, 10]
+            assert qq.bucket_list == list(range(20, 25))
+            qq.put_remain()
+        # put_iterable calls put_remain at the end of the iterable
+        assert [len(bucket) for bucket, __ in buckets] == [10, 10, 5]
+        assert [value for bucket, __ in buckets for value in bucket] == list(range(25))
+        qq.close()
+
+
+def test_slices_follow_current_size():
+    qq = QQueue(size_bucket_list=9)
+    buckets = _record_buckets(qq)
+    qq.put_many(range(7))
+    assert not buckets and len(qq.bucket_list) == 7
+
+    # The bucket list not full is completed with the new size_bucket_list, then the sequence is sliced with it
+    qq.size_bucket_list = 4
+    qq.put_many(tuple(range(7, 20)))
+    assert [len(bucket) for bucket, __ in buckets] == [8, 5, 5]
+    assert qq.bucket_list == [18, 19]
+    qq.put_remain()
+    assert [value for bucket, __ in buckets for value in bucket] == list(range(20))
+    qq.close()
+
+
+def test_slices_with_sensor():
+    for name in ("put_many", "put_iterable"):
+        qq = QQueue(maxsize=1000)
+        assert qq.enable_sensor
+        buckets = _record_buckets(qq)
+        getattr(qq, name)(list(range(COUNT_ELEMENTS)) if name == "put_many" else iter(range(COUNT_ELEMENTS)))
+        qq.put_remain()
+        # Each bucket (except the last one) has the size_bucket_list determinated by the sensor when it was put
+        for bucket, size_bucket_list in buckets[:-1]:
+            assert len(bucket) == size_bucket_list + 1
+        assert len(set(size for __, size in buckets)) > 1
+        assert [value for bucket, __ in buckets for value in bucket] == list(range(COUNT_ELEMENTS))
+        qq.close()
+
+
+def _get_all(qq, result):
+    result.put([value for value in qq])
+
+
+def test_order_between_processes():
+    qq = QQueue(consumers=1)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_get_all, args=(qq, result))
+    p.start()
+    qq.put_many(range(COUNT_ELEMENTS))
+    qq.put_iterable(iter(range(COUNT_ELEMENTS, 2 * COUNT_ELEMENTS)))
+    qq.end()
+    assert result.get() == list(range(2 * COUNT_ELEMENTS))
+    p.join()
+
+
+if __name__ == "__main__":
+    test_slices_of_size_bucket_list()
+    test_slices_follow_current_size()
+    test_slices_with_sensor()
+    test_order_between_processes()
+    print("OK")
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+
+try:
+    import queue
+except ImportError:
+    # python 3.x
+    import Queue as queue
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+from quick_queue.shm_ring import _HEADER, SharedMemoryRing
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Transport of buckets by a ring buffer in shared memory (transport='shm'): wrap-around of ring, buckets bigger than ring,
+qsize/empty/full and order between processes (fork and spawn) with QQueue and QJoinableQueue.
+"""
+
+COUNT_ELEMENTS = 100000
+
+
+def _write_offset(ring):
+    return _HEADER.unpack_from(ring._shm.buf, 0)[0]
+
+
+def _read_offset(ring):
+    return _HEADER.unpack_from(ring._shm.buf, 0)[1]
+
+
+def test_ring_wrap_around():
+    ring = SharedMemoryRing(1024)
+    expected = list()
+    got = list()
+    # Records of different sizes in a ring kept full: it wraps around many times with records in it
+    wraps = 0
+    for num in range(2000):
+        obj = bytes(num % 97) + bytes([num % 256])
+        while True:
+            try:
+                ring.put(obj, False)
+                break
+            except queue.Full:
+                got.append(ring.get(False))
+        expected.append(obj)
+        if ring.qsize() > 1 and _write_offset(ring) < _read_offset(ring):
+            wraps += 1
+    while ring.qsize():
+        got.append(ring.get(False))
+    assert got == expected
+    assert wraps > 0
+
+    try:
+        ring.get(False)
+        assert False, "get of an empty ring must raise queue.Empty"
+    except queue.Empty:
+        pass
+
+
+def test_bucket_bigger_than_ring():
+    qq = QQueue(transport="shm", shm_size=1024)
+    try:
+        qq.put_bucket([bytes(4096)])
+        assert False, "a bucket bigger than shm_size must raise ValueError"
+    except ValueError:
+        pass
+    # The queue is still usable
+    qq.put_bucket([1, 2, 3])
+    assert qq.get_bucket(timeout=1) == [1, 2, 3]
+    qq.close()
+
+
+def test_qsize_empty_full():
+    qq = QQueue(maxsize=3, size_bucket_list=10, transport="shm", shm_size=64 * 1024)
+    assert qq.empty() and not qq.full() and qq.qsize() == 0
+    for num in range(3):
+        qq.put_bucket([num])
+        assert qq.qsize() == num + 1
+    assert qq.full() and not qq.empty()
+    try:
+        qq.put_bucket([3], block=False)
+        assert False, "put_bucket in a full queue must raise queue.Full"
+    except queue.Full:
+        pass
+    try:
+        qq.put_bucket([3], timeout=0.05)
+        assert False, "put_bucket in a full queue must raise queue.Full"
+    except queue.Full:
+        pass
+    assert [qq.get_bucket(timeout=1) for _ in range(3)] == [[0], [1], [2]]
+    assert qq.empty() and not qq.full()
+    try:
+        qq.get_bucket(timeout=0.05)
+        assert False, "get_bucket of an empty queue must raise queue.Empty"
+    except queue.Empty:
+        pass
+    qq.close()
+
+
+def _producer(qq):
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    qq.put_remain()
+
+
+def _run_order(ctx):
+    qq = QQueue(maxsize=10, transport="shm", shm_size=256 * 1024, ctx=ctx)
+    p = ctx.Process(target=_producer, args=(qq,))
+    p.start()
+    assert qq.get_many(COUNT_ELEMENTS, timeout=30) == list(range(COUNT_ELEMENTS))
+    p.join()
+    qq.close()
+
+
+def test_order_fork():
+    _run_order(multiprocessing.get_context("fork"))
+
+
+def test_order_spawn():
+    _run_order(multiprocessing.get_context("spawn"))
+
+
+def _joinable_consumer(qjq, result):
+    count = 0
+    while count < COUNT_ELEMENTS:
+        bucket = qjq.get_bucket()
+        count += len(bucket)
+        qjq.task_done_bucket()
+    result.put(count)
+
+
+def test_joinable_shm():
+    qjq = QJoinableQueue(maxsize=10, transport="shm", shm_size=256 * 1024)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_joinable_consumer, args=(qjq, result))
+    p.start()
+    qjq.put_iterable(range(COUNT_ELEMENTS))
+    qjq.join()
+    assert result.get() == COUNT_ELEMENTS
+    p.join()
+    qjq.close()
+
+
+if __name__ == "__main__":
+    test_ring_wrap_around()
+    test_bucket_bigger_than_ring()
+    test_qsize_empty_full()
+    test_order_fork()
+    test_order_spawn()
+    test_joinable_shm()
+    print("OK")
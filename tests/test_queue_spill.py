@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from quick_queue.quick_queue import QQueue, QJoinableQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+A producer does not block when a slow consumer fills the queue: buckets are spilled to disk and put later in the same
+order, and segment files are deleted when all buckets are put.
+"""
+
+COUNT_ELEMENTS = 50000
+SLEEP_CONSUMER = 1.0
+
+
+def _slow_consumer(qq, result):
+    time.sleep(SLEEP_CONSUMER)
+    result.put(list(qq))
+
+
+def _run(ctx, spill_dir):
+    qq = QQueue(maxsize=2, size_bucket_list=10, consumers=1, spill_dir=spill_dir, spill_segment_bytes=4096,
+                ctx=ctx)
+    result = ctx.Queue()
+    p = ctx.Process(target=_slow_consumer, args=(qq, result))
+    p.start()
+
+    start = time.monotonic()
+    qq.put_iterable(range(COUNT_ELEMENTS))
+    qq.put_remain()
+    assert time.monotonic() - start < SLEEP_CONSUMER
+    stats = qq.stats()
+    assert stats["spilled_buckets"] > 0 and stats["spilled_bytes"] > 0
+    assert len(os.listdir(spill_dir)) > 1
+
+    qq.end()
+    assert result.get() == list(range(COUNT_ELEMENTS))
+    p.join()
+    assert os.listdir(spill_dir) == []
+
+
+def test_spill():
+    spill_dir = tempfile.mkdtemp()
+    try:
+        _run(multiprocessing.get_context(), spill_dir)
+        _run(multiprocessing.get_context("spawn"), spill_dir)
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+def test_spill_joinable():
+    spill_dir = tempfile.mkdtemp()
+    try:
+        qjq = QJoinableQueue(maxsize=1, size_bucket_list=10, spill_dir=spill_dir)
+        qjq.put_many(list(range(100)))
+        qjq.put_remain()
+        assert qjq.stats()["spilled_buckets"] == 9
+        assert qjq.get_many(100, timeout=1) == list(range(100))
+        qjq.task_done(100)
+        qjq.join()
+        assert qjq.stats()["spilled_buckets"] == 0
+        qjq.close()
+
+        for kwargs in ({"maxsize": 0}, {"maxbytes": 1024}):
+            try:
+                QQueue(spill_dir=spill_dir, **kwargs)
+                assert False, "spill_dir with {} must raise ValueError".format(kwargs)
+            except ValueError:
+                pass
+    finally:
+        shutil.rmtree(spill_dir)
+
+
+if __name__ == "__main__":
+    test_spill()
+    test_spill_joinable()
+    print("OK")
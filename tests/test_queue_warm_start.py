@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Processes started with spawn receive the queue pickled: they are initialized with the args of constructor (linger_ms,
+sensor, serializer...) and, with warm_start=True, their sensor starts from the size_bucket_list learned by the parent
+process (from the initial size_bucket_list with warm_start=False). With the qsize sensor, they also take the max size bucket
+list determinated by the parent process and the phase of the sensor (determinate_max).
+"""
+
+LINGER_MS = 50
+LEARNED_SIZE_BUCKET_LIST = 57
+INITIAL_SIZE_BUCKET_LIST = 10
+
+
+def _report(qq, result):
+    result.put({'linger': qq.linger,
+                'enable_sensor': qq.enable_sensor,
+                'throughput_sensor': type(qq.throughput_sensor).__name__,
+                'serializer': type(qq.serializer).__name__,
+                'size_bucket_list': qq.size_bucket_list,
+                'sensor_size_bucket_list': qq.throughput_sensor.size_bucket_list})
+
+
+def _spawn_report(warm_start):
+    ctx = multiprocessing.get_context("spawn")
+    qq = QQueue(maxsize=1000, linger_ms=LINGER_MS, sensor="throughput", serializer="marshal", warm_start=warm_start,
+                ctx=ctx)
+    assert qq.size_bucket_list == INITIAL_SIZE_BUCKET_LIST
+    # Size learned by the sensor of this process before the producer is started
+    qq.size_bucket_list = LEARNED_SIZE_BUCKET_LIST
+    qq.throughput_sensor.size_bucket_list = LEARNED_SIZE_BUCKET_LIST
+
+    result = ctx.Queue()
+    p = ctx.Process(target=_report, args=(qq, result))
+    p.start()
+    report = result.get(timeout=30)
+    p.join()
+    qq.close()
+
+    assert report['linger'] == LINGER_MS / 1000.0
+    assert report['enable_sensor']
+    assert report['throughput_sensor'] == "ThroughputSensor"
+    assert report['serializer'] == "MarshalSerializer"
+    return report
+
+
+def test_spawn_warm_start():
+    report = _spawn_report(True)
+    assert report['size_bucket_list'] == LEARNED_SIZE_BUCKET_LIST
+    assert report['sensor_size_bucket_list'] == LEARNED_SIZE_BUCKET_LIST
+
+
+def test_spawn_cold_start():
+    report = _spawn_report(False)
+    assert report['size_bucket_list'] == INITIAL_SIZE_BUCKET_LIST
+    assert report['sensor_size_bucket_list'] == INITIAL_SIZE_BUCKET_LIST
+
+
+def _report_qsize_sensor(qq, result):
+    result.put({'size_bucket_list': qq.size_bucket_list,
+                'max_size_bucket_list': qq.max_size_bucket_list,
+                'half_max_size_bucket_list': qq.half_max_size_bucket_list,
+                'determinate_max': qq.determinate_max})
+
+
+def _spawn_report_qsize_sensor(warm_start):
+    ctx = multiprocessing.get_context("spawn")
+    qq = QQueue(maxsize=1000, sensor="qsize", warm_start=warm_start, ctx=ctx)
+    initial_max_size_bucket_list = qq.max_size_bucket_list
+    # The sensor of this process adjusts: the size bucket list grows while qsize grows and, with the queue drained,
+    # it determinates the max size bucket list
+    for _ in range(2):
+        qq.put_many(list(range(qq.size_bucket_list + 1)))
+        while qq.qsize():
+            qq.get_bucket(timeout=5)
+    learned = {'size_bucket_list': qq.size_bucket_list,
+               'max_size_bucket_list': qq.max_size_bucket_list,
+               'half_max_size_bucket_list': qq.half_max_size_bucket_list,
+               'determinate_max': qq.determinate_max}
+    assert not learned['determinate_max']
+    assert learned['max_size_bucket_list'] < initial_max_size_bucket_list
+
+    result = ctx.Queue()
+    p = ctx.Process(target=_report_qsize_sensor, args=(qq, result))
+    p.start()
+    report = result.get(timeout=30)
+    p.join()
+    qq.close()
+    return learned, report
+
+
+def test_spawn_warm_start_qsize_sensor():
+    learned, report = _spawn_report_qsize_sensor(True)
+    assert report == learned
+
+
+def test_spawn_cold_start_qsize_sensor():
+    learned, report = _spawn_report_qsize_sensor(False)
+    assert report['size_bucket_list'] == INITIAL_SIZE_BUCKET_LIST
+    assert report['max_size_bucket_list'] > learned['max_size_bucket_list']
+    assert report['determinate_max']
+
+
+if __name__ == "__main__":
+    test_spawn_warm_start()
+    test_spawn_cold_start()
+    test_spawn_warm_start_qsize_sensor()
+    test_spawn_cold_start_qsize_sensor()
+    print("OK")
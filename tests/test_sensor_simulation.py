@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import pytest
+
+from quick_queue.simulation import simulate, optimal_throughput, step_trace, ramp_trace, bursty_trace
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Check with the deterministic simulation of sensors (throughput and qsize) that the size bucket list converges in traces
+with a step change, a ramp and bursts of producer rates (known failures of qsize sensor are marked with xfail).
+"""
+
+# Fixed sizes of bucket list to compare with the size chosen by the sensor
+FIXED_SIZES = (10, 100, 1000, 10000)
+
+
+def _window(samples, start, finish):
+    return [s for s in samples if start < s.time <= finish]
+
+
+def _mean_throughput(samples):
+    return sum(s.throughput for s in samples) / len(samples)
+
+
+def _assert_stable(samples, ratio=1.5):
+    sizes = [s.size_bucket_list for s in samples]
+    assert max(sizes) <= min(sizes) * ratio, "size bucket list not stable: {}".format(sizes)
+
+
+def _assert_near_optimal(samples, producer_rate, consumer_rate, fraction=0.9):
+    # Best throughput of a fixed size bucket list (it is never more than the rate of the slower side)
+    optimal = max(optimal_throughput(producer_rate, consumer_rate, size) for size in FIXED_SIZES)
+    assert optimal <= min(producer_rate, consumer_rate)
+    throughput = _mean_throughput(samples)
+    assert throughput >= optimal * fraction, "throughput {:.0f} < {:.0f}".format(throughput, optimal * fraction)
+
+
+def _check_step_trace(sensor, skip_before=()):
+    for before, after in [((100000, 200000), (400000, 200000)),
+                          ((200000, 100000), (200000, 50000))]:
+        samples = simulate(step_trace(20.0, before, after, 10.0), sensor=sensor)
+
+        _assert_stable(_window(samples, 6.0, 10.0))
+        if before not in skip_before:
+            _assert_near_optimal(_window(samples, 4.0, 10.0), *before)
+
+        _assert_stable(_window(samples, 16.0, 20.0))
+        _assert_near_optimal(_window(samples, 14.0, 20.0), *after)
+
+
+def _check_ramp_trace(sensor):
+    samples = simulate(ramp_trace(20.0, (50000, 200000), (400000, 200000)), sensor=sensor)
+
+    _assert_stable(_window(samples, 16.0, 20.0))
+    _assert_near_optimal(_window(samples, 16.0, 20.0), 400000, 200000)
+
+
+def _check_bursty_trace(sensor):
+    trace = bursty_trace(20.0, (50000, 200000), (500000, 200000))
+    samples = simulate(trace, sensor=sensor)
+
+    _assert_stable(_window(samples, 4.0, 20.0), ratio=4.0)
+
+    best_fixed = max(_mean_throughput(simulate(trace, size_bucket_list=size)) for size in FIXED_SIZES)
+    throughput = _mean_throughput(samples)
+    assert throughput >= best_fixed * 0.9, "throughput {:.0f} < {:.0f}".format(throughput, best_fixed * 0.9)
+
+
+def test_step_trace():
+    _check_step_trace("throughput")
+
+
+def test_ramp_trace():
+    _check_ramp_trace("throughput")
+
+
+def test_bursty_trace():
+    _check_bursty_trace("throughput")
+
+
+def test_qsize_step_trace():
+    # The slower producer is checked in test_qsize_step_trace_slow_producer (known failure)
+    _check_step_trace("qsize", skip_before=[(100000, 200000)])
+
+
+def test_qsize_ramp_trace():
+    _check_ramp_trace("qsize")
+
+
+def test_qsize_sensor_converges():
+    # With constant rates (empty queue, growing queue and full queue) the size bucket list does not grow without limit
+    for rates in [(100000, 200000), (200000, 100000), (400000, 200000)]:
+        samples = simulate(step_trace(20.0, rates, rates, 10.0), sensor="qsize")
+        _assert_stable(_window(samples, 5.0, 20.0))
+
+
+@pytest.mark.xfail(strict=True, reason="known failure: with a slower producer the queue is empty and the qsize sensor "
+                                       "keeps min_size_bucket_list (it sizes by qsize, not by throughput)")
+def test_qsize_step_trace_slow_producer():
+    samples = simulate(step_trace(10.0, (100000, 200000), (100000, 200000), 5.0), sensor="qsize")
+    _assert_near_optimal(_window(samples, 4.0, 10.0), 100000, 200000)
+
+
+@pytest.mark.xfail(strict=True, reason="known failure: the qsize sensor swings between min_size_bucket_list (empty "
+                                       "queue out of bursts) and the size of bursts")
+def test_qsize_bursty_trace():
+    _check_bursty_trace("qsize")
+
+
+def test_qsize_sensor_limits():
+    for trace in [step_trace(20.0, (100000, 200000), (400000, 200000), 10.0),
+                  ramp_trace(20.0, (50000, 200000), (400000, 200000)),
+                  bursty_trace(20.0, (50000, 200000), (500000, 200000))]:
+        samples = simulate(trace, sensor="qsize", min_size_bucket_list=10, max_size_bucket_list=1000)
+        assert all(10 <= s.size_bucket_list <= 1000 for s in samples)
+
+
+def test_deterministic():
+    trace = bursty_trace(10.0, (50000, 200000), (500000, 200000), seed=7)
+    for sensor in ("qsize", "throughput"):
+        assert simulate(trace, sensor=sensor) == simulate(trace, sensor=sensor)
+
+
+if __name__ == "__main__":
+    test_step_trace()
+    test_ramp_trace()
+    test_bursty_trace()
+    test_qsize_step_trace()
+    test_qsize_ramp_trace()
+    test_qsize_sensor_converges()
+    test_qsize_sensor_limits()
+    test_deterministic()
+    print("OK")
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import json
+import multiprocessing
+import pickle
+
+from quick_queue import serializers
+from quick_queue.quick_queue import QQueue
+from quick_queue.serializers import CompressedSerializer, get_serializer
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Serializers of buckets (serializer) and compression (compression, compression_min_bytes): round-trip between processes
+with each built-in serializer, a custom serializer and each compression, marshal rejects data that is not of Python core
+types and small buckets are not compressed.
+"""
+
+COUNT_ELEMENTS = 10000
+
+
+class JsonSerializer(object):
+    """
+    Custom serializer (defined at module level to be sent to processes).
+    """
+
+    def dumps(self, bucket):
+        return json.dumps(bucket).encode("utf-8")
+
+    def loads(self, data):
+        return json.loads(bytes(data).decode("utf-8"))
+
+
+class _NotCore(object):
+    pass
+
+
+class BrokenSerializer(object):
+    """
+    Custom serializer whose dumps fails with AttributeError.
+    """
+
+    def dumps(self, bucket):
+        raise AttributeError("broken dumps")
+
+    def loads(self, data):
+        return data
+
+
+def _values():
+    return [[num, str(num), {"num": num}] for num in range(COUNT_ELEMENTS)]
+
+
+def _consumer(qq, result):
+    result.put([value for value in qq])
+
+
+def _round_trip(**kwargs):
+    qq = QQueue(consumers=1, **kwargs)
+    result = multiprocessing.Queue()
+    p = multiprocessing.Process(target=_consumer, args=(qq, result))
+    p.start()
+    values = _values()
+    qq.put_iterable(values)
+    qq.end()
+    got = result.get()
+    p.join()
+    assert got == values
+
+
+def test_builtin_serializers():
+    for name in serializers.SERIALIZERS:
+        _round_trip(serializer=name)
+
+
+def test_custom_serializer():
+    _round_trip(serializer=JsonSerializer())
+
+
+def test_invalid_serializer():
+    for serializer in ("unknown", object()):
+        try:
+            QQueue(serializer=serializer)
+            assert False, "ValueError expected"
+        except ValueError:
+            pass
+
+
+def test_serializer_error_propagates():
+    for name in ("put", "put_many"):
+        qq = QQueue(size_bucket_list=5, serializer=BrokenSerializer())
+        try:
+            if name == "put":
+                for value in range(20):
+                    qq.put(value)
+            else:
+                qq.put_many(list(range(20)))
+            assert False, "AttributeError expected"
+        except AttributeError:
+            pass
+        # The error of the serializer is not taken as a queue without init (its args are kept)
+        assert qq.size_bucket_list == 5
+        qq.close()
+
+
+def test_marshal_rejects_not_core_types():
+    marshal_serializer = get_serializer("marshal")
+    try:
+        marshal_serializer.dumps([1, _NotCore()])
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+    qq = QQueue(serializer="marshal")
+    try:
+        qq.put_bucket([1, _NotCore()])
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+    # Queue is usable after the error
+    qq.put_bucket([1, 2])
+    assert qq.get_bucket(timeout=5) == [1, 2]
+    qq.close()
+
+
+def test_compression_round_trip():
+    for compression in serializers.COMPRESSIONS:
+        _round_trip(compression=compression, compression_min_bytes=1024)
+        _round_trip(serializer="marshal", compression=compression, compression_min_bytes=1024)
+
+
+def test_compression_min_bytes():
+    for compression in serializers.COMPRESSIONS:
+        serializer = CompressedSerializer(None, compression, min_bytes=1024)
+        small = [1, 2, 3]
+        data = serializer.dumps(small)
+        # Small buckets are not compressed (only a header byte is added)
+        assert data == b"\x00" + pickle.dumps(small)
+        assert serializer.loads(data) == small
+
+        big = ["A" * 100 + str(num) for num in range(100)]
+        data = serializer.dumps(big)
+        assert data[0] == 1
+        assert len(data) < len(pickle.dumps(big))
+        assert serializer.loads(data) == big
+
+
+def test_invalid_compression():
+    try:
+        QQueue(compression="unknown")
+        assert False, "ValueError expected"
+    except ValueError:
+        pass
+
+
+if __name__ == "__main__":
+    test_builtin_serializers()
+    test_custom_serializer()
+    test_invalid_serializer()
+    test_serializer_error_propagates()
+    test_marshal_rejects_not_core_types()
+    test_compression_round_trip()
+    test_compression_min_bytes()
+    test_invalid_compression()
+    print("OK")
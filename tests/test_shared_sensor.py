@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# @autor: Ramón Invarato Menéndez
+# @version 1.0
+import multiprocessing
+import os
+import time
+
+from quick_queue import quick_queue
+from quick_queue.quick_queue import QQueue
+
+"""
+Execute this script to see result in console (or run it with pytest)
+
+Shared sensor (shared_sensor=True): the first producer that puts a bucket list is the leader and the others take its
+size bucket list; the leadership is handed over when the leader closes the queue, when it does not put data for
+_SHARED_SENSOR_LEASE seconds (for example, the main process becomes leader and then only waits) and when it is killed
+(the leader renews its lease on each put, although its bucket list is not full yet).
+"""
+
+COUNT_PUTS = 50
+LEASE = 0.2
+
+ctx = multiprocessing.get_context("fork")
+
+
+def _put(qq, count=COUNT_PUTS):
+    for num in range(count):
+        qq.put(num)
+
+
+def _leader(qq):
+    return qq.shared_sensor[1]
+
+
+def _follower(qq, result):
+    _put(qq)
+    result.put((_leader(qq), qq.size_bucket_list == qq.shared_sensor[0]))
+
+
+def test_leader_election():
+    qq = QQueue(maxsize=1000, shared_sensor=True, ctx=ctx)
+    assert _leader(qq) == 0
+    _put(qq)
+    assert _leader(qq) == os.getpid()
+
+    result = ctx.Queue()
+    p = ctx.Process(target=_follower, args=(qq, result))
+    p.start()
+    leader, same_size = result.get(timeout=10)
+    p.join()
+    # The child process follows the size bucket list of the leader
+    assert leader == os.getpid()
+    assert same_size
+    qq.close()
+
+
+def _wait_and_put(qq, event, result):
+    event.wait(10)
+    _put(qq)
+    result.put(_leader(qq))
+    qq.close()
+
+
+def test_handover_on_close():
+    qq = QQueue(maxsize=1000, shared_sensor=True, ctx=ctx)
+    event = ctx.Event()
+    result = ctx.Queue()
+    p = ctx.Process(target=_wait_and_put, args=(qq, event, result))
+    p.start()
+
+    _put(qq)
+    assert _leader(qq) == os.getpid()
+    qq.close()
+    assert _leader(qq) == 0
+
+    event.set()
+    leader = result.get(timeout=10)
+    assert leader == p.pid
+    p.join()
+    assert _leader(qq) == 0
+
+
+def _put_for(qq, result, seconds):
+    finish = time.monotonic() + seconds
+    num = 0
+    while time.monotonic() < finish:
+        qq.put(num)
+        num += 1
+        time.sleep(0.005)
+    result.put((_leader(qq), qq.size_bucket_list == qq.shared_sensor[0]))
+    qq.close()
+
+
+def test_handover_idle_leader():
+    lease = quick_queue._SHARED_SENSOR_LEASE
+    quick_queue._SHARED_SENSOR_LEASE = LEASE
+    try:
+        qq = QQueue(maxsize=1000, shared_sensor=True, ctx=ctx)
+        # The main process becomes leader and then it only waits for the producer (it does not close the queue)
+        _put(qq)
+        assert _leader(qq) == os.getpid()
+
+        result = ctx.Queue()
+        p = ctx.Process(target=_put_for, args=(qq, result, LEASE * 3))
+        p.start()
+        leader, same_size = result.get(timeout=10)
+        p.join()
+        assert leader == p.pid
+        assert same_size
+        qq.close()
+    finally:
+        quick_queue._SHARED_SENSOR_LEASE = lease
+
+
+def _put_and_wait(qq, ready):
+    _put(qq)
+    ready.set()
+    time.sleep(60)
+
+
+def test_handover_killed_leader():
+    lease = quick_queue._SHARED_SENSOR_LEASE
+    quick_queue._SHARED_SENSOR_LEASE = LEASE
+    try:
+        qq = QQueue(maxsize=1000, shared_sensor=True, ctx=ctx)
+        ready = ctx.Event()
+        p = ctx.Process(target=_put_and_wait, args=(qq, ready))
+        p.start()
+        assert ready.wait(10)
+        assert _leader(qq) == p.pid
+        # The leader can not release the sensor
+        p.kill()
+        p.join()
+        assert _leader(qq) == p.pid
+
+        time.sleep(LEASE * 2)
+        _put(qq)
+        assert _leader(qq) == os.getpid()
+        qq.close()
+    finally:
+        quick_queue._SHARED_SENSOR_LEASE = lease
+
+
+def test_leader_renews_lease_on_put():
+    lease = quick_queue._SHARED_SENSOR_LEASE
+    quick_queue._SHARED_SENSOR_LEASE = LEASE
+    try:
+        qq = QQueue(maxsize=1000, shared_sensor=True, ctx=ctx)
+        _put(qq)
+        assert _leader(qq) == os.getpid()
+
+        # Slow puts: the bucket list takes more than the lease to be full, but the leader is alive
+        for num in range(qq.size_bucket_list - 1):
+            qq.put(num)
+            time.sleep(LEASE / 2)
+            assert int(time.monotonic() * 1000) - qq.shared_sensor[2] <= LEASE * 1000
+        assert _leader(qq) == os.getpid()
+        qq.close()
+    finally:
+        quick_queue._SHARED_SENSOR_LEASE = lease
+
+
+def _count_release_finalizers():
+    return sum(1 for finalizer in multiprocessing.util._finalizer_registry.values()
+               if finalizer._callback is quick_queue.QuickQueue._release_shared_sensor)
+
+
+def test_one_finalizer_for_several_takeovers():
+    qq = QQueue(maxsize=1000, shared_sensor=True, ctx=ctx)
+    count = _count_release_finalizers()
+    _put(qq)
+    finalizer = qq.shared_sensor_finalizer
+    assert finalizer is not None
+
+    for _ in range(3):
+        # The leader releases the sensor (as if its lease had expired) and takes it again
+        quick_queue.QuickQueue._release_shared_sensor(qq.shared_sensor, os.getpid())
+        _put(qq, qq.size_bucket_list * 2)
+        assert _leader(qq) == os.getpid()
+
+    assert qq.shared_sensor_finalizer is finalizer
+    assert _count_release_finalizers() == count + 1
+    qq.close()
+
+
+if __name__ == "__main__":
+    test_leader_election()
+    test_handover_on_close()
+    test_handover_idle_leader()
+    test_handover_killed_leader()
+    test_leader_renews_lease_on_put()
+    test_one_finalizer_for_several_takeovers()
+    print("OK")